@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: Croatian date parsing.
+
+Compares the previous per-scraper parsing (month dict built and regexes
+compiled on every call, case-insensitive scan for the deadline label) with
+the shared src/utils/hr_dates module, on listing dates and on full
+HRZZ-style call descriptions.
+
+    python benchmarks/bench_hr_dates.py --dates 50000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.utils import hr_dates
+
+GENITIVE = ["siječnja", "veljače", "ožujka", "travnja", "svibnja", "lipnja",
+            "srpnja", "kolovoza", "rujna", "listopada", "studenoga", "prosinca"]
+FILLER = "Hrvatska zaklada za znanost raspisuje natječaj za istraživačke projekte u svim znanstvenim područjima. "
+
+
+def legacy_parse_hr_date(date_text):
+    months = {name: index for index, name in enumerate(GENITIVE, 1)}
+    months["studenog"] = 11
+    normalized = " ".join(date_text.lower().split())
+    match = re.search(r"(\d{1,2})\.\s*([a-zčćđšž]+)\s*(\d{4})\.", normalized)
+    if not match:
+        return None
+    month = months.get(match.group(2))
+    if not month:
+        return None
+    time_match = re.search(r"(\d{1,2})[:\.](\d{2})", normalized)
+    hour = int(time_match.group(1)) if time_match else 0
+    minute = int(time_match.group(2)) if time_match else 0
+    try:
+        return datetime(int(match.group(3)), month, int(match.group(1)), hour, minute)
+    except ValueError:
+        return None
+
+
+def legacy_extract_deadline(text):
+    match = re.search(r"rok\s+za\s+prijavu[^:]*:\s*([^\.]+\.)", text, flags=re.IGNORECASE)
+    if not match:
+        return None
+    return legacy_parse_hr_date(match.group(1))
+
+
+def make_dates(count, distinct, rng):
+    pool = [f"{rng.randint(1, 28)}. {rng.choice(GENITIVE)} {rng.randint(2015, 2026)}." for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def make_texts(count, rng):
+    texts = []
+    for _ in range(count):
+        deadline = f"{rng.randint(1, 28)}. {rng.choice(GENITIVE)} {rng.randint(2015, 2026)}. do 16. sati"
+        texts.append((FILLER * 20)[:2200] + f" Rok za prijavu projektnih prijedloga: {deadline}. Kontakt: info@hrzz.hr")
+    return texts
+
+
+def timed(function, inputs):
+    start = time.perf_counter()
+    for value in inputs:
+        function(value)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dates", type=int, default=50000, help="listing dates to parse")
+    parser.add_argument("--distinct", type=int, default=2000, help="distinct date strings among them")
+    parser.add_argument("--texts", type=int, default=5000, help="call descriptions to scan for a deadline")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    dates = make_dates(args.dates, args.distinct, rng)
+    texts = make_texts(args.texts, rng)
+
+    rows = [
+        ("listing dates", "legacy", timed(legacy_parse_hr_date, dates), len(dates)),
+        ("listing dates", "hr_dates", timed(hr_dates.parse_hr_date, dates), len(dates)),
+        ("deadline in text", "legacy", timed(legacy_extract_deadline, texts), len(texts)),
+        ("deadline in text", "hr_dates", timed(hr_dates.find_deadline, texts), len(texts)),
+    ]
+    for workload, variant, elapsed, count in rows:
+        print(f"{workload:<17} {variant:<9} {elapsed * 1000:8.1f} ms  {count / elapsed:12,.0f} /s")
+
+    found_legacy = sum(1 for text in texts if legacy_extract_deadline(text))
+    found_new = sum(1 for text in texts if hr_dates.find_deadline(text))
+    print(f"Deadlines found: legacy {found_legacy}/{len(texts)}, hr_dates {found_new}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
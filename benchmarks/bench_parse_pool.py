@@ -0,0 +1,106 @@
+"""
+Benchmark: parsing listing pages in-thread vs in a process pool.
+
+Streams a corpus of HAMAG-BICRO listing pages through the scrape pipeline
+(parse -> normalize -> dedup, no network or database) with 0 (in-thread)
+and N parse worker processes.
+
+    python benchmarks/bench_parse_pool.py --pages 200 --workers 0,1,2,4
+    python benchmarks/bench_parse_pool.py --corpus path/to/saved/pages
+
+Without --corpus a synthetic corpus is generated: pages with the same
+markup as the live listing (cards, categories, Croatian dates) padded with
+navigation/footer boilerplate to a realistic size.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.scrapers.hamag_scraper import HAMAGBICROScraper
+from src.scrapers.pipeline import ScrapePipeline
+
+MONTHS = ["siječnja", "veljače", "ožujka", "travnja", "svibnja", "lipnja",
+          "srpnja", "kolovoza", "rujna", "listopada", "studenoga", "prosinca"]
+CATEGORIES = ["Otvoreni natječaji", "Potpore", "Financijski instrumenti", "Vijesti i najave"]
+
+CORPUS = []
+
+
+class CorpusScraper(HAMAGBICROScraper):
+    """HAMAG scraper fed from the in-memory corpus instead of the network"""
+
+    def iter_pages(self):
+        for body in CORPUS:
+            yield "html", body
+
+
+def make_page(page: int, cards: int) -> str:
+    articles = []
+    for i in range(cards):
+        n = page * cards + i
+        articles.append(
+            '<article class="news-v1"><div class="news-v1-content">'
+            f'<div class="ffb-categories-1-1"><span class="ff-term-90">Natječaji</span> '
+            f'<span class="ff-term-94">{CATEGORIES[n % len(CATEGORIES)]}</span></div>'
+            f'<h3 class="news-v1-heading-title"><a href="/natjecaji/poziv-{n}/">Javni poziv {n} za potpore poduzetnicima</a></h3>'
+            f'<p class="news-v1-excerpt">{"Sažetak poziva za mikro, mala i srednja poduzeća. " * 4}</p>'
+            f'<p class="ffb-date-5-1">{n % 28 + 1}. {MONTHS[n % 12]} {2020 + n % 6}.</p>'
+            '</div></article>'
+        )
+    menu = "".join(f'<li class="menu-item"><a href="/stranica-{i}/">Stranica {i}</a></li>' for i in range(300))
+    footer = "<p>HAMAG-BICRO, Ksaver 208, 10000 Zagreb. Sva prava pridržana.</p>" * 50
+    return (
+        f'<!DOCTYPE html><html lang="hr"><head><meta charset="utf-8"><title>Natječaji - stranica {page}</title></head>'
+        f'<body><header><nav><ul>{menu}</ul></nav></header><main><div class="post-wrapper">{"".join(articles)}</div>'
+        f'<section class="ff-pagination"><a data-page-id="{page}">{page}</a></section></main>'
+        f'<footer>{footer}</footer></body></html>'
+    )
+
+
+def load_corpus(args) -> list:
+    if args.corpus:
+        paths = sorted(Path(args.corpus).glob("*.html"))
+        return [path.read_text(encoding="utf-8") for path in paths]
+    return [make_page(page, args.cards) for page in range(args.pages)]
+
+
+def run(workers: int) -> tuple:
+    start = time.perf_counter()
+    count = sum(1 for _ in ScrapePipeline(CorpusScraper(), parse_workers=workers))
+    return time.perf_counter() - start, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=30, help="cards per synthetic page")
+    parser.add_argument("--corpus", help="directory with saved listing pages (*.html)")
+    parser.add_argument("--workers", default="0,1,2,4", help="comma-separated worker counts (0 = in-thread)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    CORPUS.extend(load_corpus(args))
+    size_mb = sum(len(body.encode("utf-8")) for body in CORPUS) / 1e6
+    print(f"Pages:    {len(CORPUS)} ({size_mb:.1f} MB)")
+    print(f"CPUs:     {os.cpu_count()}")
+
+    baseline = None
+    expected = None
+    for workers in [int(value) for value in args.workers.split(",")]:
+        elapsed, count = min(run(workers) for _ in range(args.repeat))
+        if expected is None:
+            expected = count
+        assert count == expected, f"{workers} workers parsed {count} natjecaji, expected {expected}"
+        baseline = baseline or elapsed
+        label = "in-thread" if workers == 0 else f"{workers} workers"
+        print(f"{label:<12} {elapsed * 1000:8.0f} ms  {len(CORPUS) / elapsed:7.1f} pages/s  "
+              f"{baseline / elapsed:4.1f}x  ({count} natjecaji)")
+
+
+if __name__ == "__main__":
+    main()
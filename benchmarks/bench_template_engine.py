@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: rendering search result cards.
+
+Compares the previous render_template (file read + str.replace per card,
+safe_text per field) with the compiled TemplateEngine.
+
+    python benchmarks/bench_template_engine.py --cards 1000
+"""
+import argparse
+import html
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "frontend"))
+
+from template_engine import TemplateEngine
+
+TEMPLATES_DIR = ROOT / "frontend" / "templates"
+TEMPLATE = "search_result_card.html"
+
+
+def legacy_render_template(template_name, context=None):
+    template_path = TEMPLATES_DIR / template_name
+    if not template_path.exists():
+        return ""
+    content = template_path.read_text(encoding="utf-8")
+    if context:
+        for key, value in context.items():
+            content = content.replace(f"{{{{{key}}}}}", str(value))
+    return content
+
+
+def legacy_safe_text(value):
+    if value is None:
+        return "N/A"
+    return html.escape(str(value))
+
+
+def make_cards(count):
+    return [
+        {
+            "naziv": f"Natječaj {i} za istraživanje & razvoj",
+            "kategorija": "Znanstveno istraživanje",
+            "podrucje": "ICT",
+            "opis": "Poziv za projekte <primijenjenih> istraživanja u području umjetne inteligencije. " * 3,
+            "iznos": f"{100000 + i:,} EUR",
+            "rok": "15.03.2030",
+            "url": f"https://example.com/natjecaj/{i}?a=1&b=2",
+        }
+        for i in range(count)
+    ]
+
+
+def bench_legacy(cards):
+    return "\n".join(
+        legacy_render_template(TEMPLATE, {key: legacy_safe_text(value) for key, value in card.items()})
+        for card in cards
+    )
+
+
+def bench_engine(cards, engine):
+    return engine.render_many(TEMPLATE, cards)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cards = make_cards(args.cards)
+
+    start = time.perf_counter()
+    engine = TemplateEngine(TEMPLATES_DIR)
+    compile_time = time.perf_counter() - start
+
+    legacy_time, legacy_html = best_of(args.repeat, bench_legacy, cards)
+    engine_time, engine_html = best_of(args.repeat, bench_engine, cards, engine)
+    assert legacy_html == engine_html, "engine output differs from the legacy renderer"
+
+    print(f"Cards:            {args.cards}")
+    print(f"Compile (all):    {compile_time * 1000:.2f} ms")
+    print(f"Legacy render:    {legacy_time * 1000:.2f} ms")
+    print(f"Compiled render:  {engine_time * 1000:.2f} ms")
+    print(f"Speedup:          {legacy_time / engine_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
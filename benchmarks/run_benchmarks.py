@@ -0,0 +1,371 @@
+"""
+Benchmark suite: API endpoints, crud queries, scraper upserts, parsers and
+the LLM path, against databases seeded with 1k / 100k / 1M natjecaji.
+
+Every database size runs in its own process with DATABASE_URL pointing at a
+seeded SQLite file in --data-dir (kept between runs, reseeded only when the
+size changes). Results are written as JSON keyed by commit so runs can be
+compared:
+
+    python benchmarks/run_benchmarks.py --sizes 1000,100000
+    python benchmarks/run_benchmarks.py --sizes 1000 --only api,upsert
+    python benchmarks/run_benchmarks.py --sizes 1000 --compare benchmarks/results/<commit>.json
+
+--compare prints the median ratio per benchmark and exits with status 1
+when any benchmark is slower than the baseline by more than --threshold.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+DEFAULT_DATA_DIR = ROOT / "benchmarks" / ".data"
+DEFAULT_RESULTS_DIR = ROOT / "benchmarks" / "results"
+FIXTURES_DIR = ROOT / "tests" / "fixtures"
+
+BENCHMARKS = []
+
+
+def benchmark(name: str, items: int = 1):
+    """
+    Register a benchmark. The decorated function receives the suite context
+    and returns the callable to time; `items` is the number of records one
+    call processes (for throughput).
+    """
+    def decorator(setup):
+        BENCHMARKS.append((name, items, setup))
+        return setup
+    return decorator
+
+
+def measure(function, repeat: int, min_time: float) -> dict:
+    """Time function: warm up, calibrate calls per round to ~min_time, take `repeat` rounds"""
+    function()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeat": len(rounds),
+        "min": min(rounds),
+        "median": statistics.median(rounds),
+        "mean": statistics.mean(rounds),
+        "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    }
+
+
+# ==================== SEEDING ====================
+
+def seed_database(size: int, seed: int = 0):
+    """Fill the configured database with `size` synthetic natjecaji, unless it already has them"""
+    from sqlalchemy import func, select
+    from src.database.database import engine, init_db
+    from src.database.models import Natjecaj
+    from src.utils.synthetic_data import populate_database
+
+    init_db()
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Natjecaj.__table__)).scalar() == size:
+            return
+    populate_database(size, seed=seed, engine=engine, reset=True)
+
+
+# ==================== BENCHMARKS ====================
+
+class Context:
+    def __init__(self, size: int):
+        from fastapi.testclient import TestClient
+        from src.api.main import app
+
+        self.size = size
+        self.client = TestClient(app)
+
+
+@benchmark("api.natjecaji", items=100)
+def bench_api_natjecaji(ctx):
+    return lambda: ctx.client.get("/api/natjecaji", params={"limit": 100})
+
+
+@benchmark("api.search", items=20)
+def bench_api_search(ctx):
+    return lambda: ctx.client.get("/api/search", params={"q": "inovacije", "limit": 20})
+
+
+@benchmark("api.statistics")
+def bench_api_statistics(ctx):
+    return lambda: ctx.client.get("/api/statistics")
+
+
+@benchmark("crud.search", items=20)
+def bench_crud_search(ctx):
+    from src.database.database import SessionLocal
+    from src.database import crud
+
+    def run():
+        db = SessionLocal()
+        try:
+            crud.search_natjecaji(db, search_term="digitalizaciju", kategorija="Inovacije", limit=20)
+        finally:
+            db.close()
+    return run
+
+
+UPSERT_BATCH = 100
+
+
+def _upsert_manager():
+    from src.scrapers.registry import ScraperRegistry, ScraperSpec
+    from src.scrapers.scraper_manager import ScraperManager
+
+    # No summary queueing or dedup - only the upsert itself is measured
+    from config.settings import settings
+    settings.summary_queue_enabled = False
+    return ScraperManager(ScraperRegistry([ScraperSpec("BENCH-UPSERT", "src.scrapers.hamag_scraper:HAMAGBICROScraper")]))
+
+
+def _upsert_batch(prefix: str, start: int) -> list:
+    return [{
+        "naziv": f"{prefix} natječaj {start + i}",
+        "url": f"https://example.com/bench/{prefix}/{start + i}",
+        "kategorija": "Inovacije",
+        "iznos_financiranja": float(1000 * (i + 1)),
+        "status": "closed",
+    } for i in range(UPSERT_BATCH)]
+
+
+@benchmark("upsert.insert", items=UPSERT_BATCH)
+def bench_upsert_insert(ctx):
+    manager = _upsert_manager()
+    counter = iter(range(0, 10 ** 9, UPSERT_BATCH))
+    return lambda: manager.save_to_database("BENCH-UPSERT", _upsert_batch("insert", next(counter)))
+
+
+@benchmark("upsert.unchanged", items=UPSERT_BATCH)
+def bench_upsert_unchanged(ctx):
+    manager = _upsert_manager()
+    batch = _upsert_batch("unchanged", 0)
+    manager.save_to_database("BENCH-UPSERT", batch)
+    return lambda: manager.save_to_database("BENCH-UPSERT", batch)
+
+
+def _fixture_pages(directory: str, pattern: str) -> list:
+    return [path.read_text(encoding="utf-8") for path in sorted((FIXTURES_DIR / directory).glob(pattern))]
+
+
+@benchmark("parser.hamag_listing", items=6)
+def bench_parser_hamag(ctx):
+    from src.scrapers.hamag_scraper import HAMAGBICROScraper
+
+    scraper = HAMAGBICROScraper()
+    pages = [("html", body) for body in _fixture_pages("hamag", "*.html")]
+    return lambda: [scraper.parse_page(page) for page in pages]
+
+
+@benchmark("parser.horizon_search", items=4)
+def bench_parser_horizon(ctx):
+    from src.scrapers.horizon_scraper import HorizonEuropeScraper
+
+    scraper = HorizonEuropeScraper()
+    pages = [json.loads(body) for body in _fixture_pages("horizon", "*.json")]
+    return lambda: [scraper.parse_page(page) for page in pages]
+
+
+class FakeChatCompletions(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions endpoint answering with a fixed tool call"""
+
+    arguments = json.dumps({
+        "sazetek": "Natječaj financira istraživačke projekte u području umjetne inteligencije.",
+        "kljucne_rijeci": ["umjetna inteligencija", "istraživanje"],
+        "relevantnost": "visoka",
+    }, ensure_ascii=False)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = json.dumps({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": "call_bench",
+                        "type": "function",
+                        "function": {"name": "spremi_sazetak", "arguments": self.arguments},
+                    }],
+                },
+            }],
+            "usage": {"prompt_tokens": 600, "completion_tokens": 120, "total_tokens": 720},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@benchmark("llm.generate_summary")
+def bench_llm(ctx):
+    from config.settings import settings
+    from src.llm import llm_service
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeChatCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    settings.openai_api_key = "bench"
+    service = llm_service.LLMService()
+    natjecaj = {
+        "id": None,
+        "naziv": "Istraživački projekti iz područja umjetne inteligencije",
+        "opis": "Hrvatska zaklada za znanost financira istraživačke projekte. " * 40,
+        "kategorija": "Znanstveno istraživanje",
+        "iznos_financiranja": 200000,
+        "rok_prijave": "2025-12-31",
+    }
+    if service.generate_summary(natjecaj)["model_koristen"] != service.model:
+        raise RuntimeError("LLMService rejected the fake server response")
+    return lambda: service.generate_summary(natjecaj)
+
+
+# ==================== RUNNER ====================
+
+def run_size(size: int, only: list, repeat: int, min_time: float) -> dict:
+    """Runs in the per-size worker process"""
+    seed_start = time.perf_counter()
+    seed_database(size)
+    results = {"_seed_seconds": round(time.perf_counter() - seed_start, 3)}
+    ctx = Context(size)
+    for name, items, setup in BENCHMARKS:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        timing = measure(setup(ctx), repeat, min_time)
+        timing["items_per_second"] = items / timing["median"] if timing["median"] else None
+        results[name] = timing
+        print(f"  {size:>9,} {name:<24} {timing['median'] * 1000:10.3f} ms  "
+              f"{timing['items_per_second']:12,.0f} items/s", file=sys.stderr)
+
+    from src.database.database import get_db_session
+    from src.database.models import Izdavatelj, Natjecaj
+    with get_db_session() as db:
+        izdavatelj = db.query(Izdavatelj).filter(Izdavatelj.naziv == "BENCH-UPSERT").first()
+        if izdavatelj:
+            db.query(Natjecaj).filter(Natjecaj.izdavatelj_id == izdavatelj.id).delete()
+            db.delete(izdavatelj)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    regressions = 0
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for size, results in current["results"].items():
+        for name, timing in results.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if name.startswith("_") or not previous:
+                continue
+            ratio = timing["median"] / previous["median"]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  SLOWER"
+                regressions += 1
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            print(f"  {int(size):>9,} {name:<24} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000", help="comma-separated database sizes (natjecaji)")
+    parser.add_argument("--only", default="", help="comma-separated benchmark name prefixes (api,crud,upsert,parser,llm)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    parser.add_argument("--output", help="result JSON (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline result JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before a regression is reported")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    only = [prefix for prefix in args.only.split(",") if prefix]
+
+    if args.worker is not None:
+        results = run_size(args.worker, only, args.repeat, args.min_time)
+        Path(args.worker_output).write_text(json.dumps(results), encoding="utf-8")
+        return
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": {},
+    }
+    for size in [int(value) for value in args.sizes.split(",")]:
+        # Settings and the engine are created at import time - one process per database
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{data_dir / f'bench_{size}.db'}", LOG_LEVEL="WARNING")
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+            worker_output = handle.name
+        try:
+            subprocess.run([
+                sys.executable, __file__, "--worker", str(size), "--worker-output", worker_output,
+                "--only", args.only, "--repeat", str(args.repeat), "--min-time", str(args.min_time)
+            ], env=env, check=True)
+            report["results"][str(size)] = json.loads(Path(worker_output).read_text(encoding="utf-8"))
+        finally:
+            os.unlink(worker_output)
+
+    output = Path(args.output) if args.output else DEFAULT_RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
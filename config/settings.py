@@ -8,27 +8,68 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./data/fidit.db"
+    db_auto_migrate: bool = False  # create missing tables on API startup instead of via database.py
+    db_max_connections: int = 40  # connection budget of all API workers together (PostgreSQL)
+    db_pool_size: int = 0  # connections per process; 0 = db_max_connections / api_workers
+    db_max_overflow: int = 5
     
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
-    api_reload: bool = True
+    api_reload: bool = False  # development only, ignored with api_workers > 1
+    api_workers: int = 1  # uvicorn worker processes
     
     # LLM APIs
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
+    llm_input_token_budget: int = 1200  # max tokens for the natjecaj description in a prompt
+    llm_telemetry_enabled: bool = True
+    llm_structured_output: bool = True  # JSON output via function calling
+    
+    # AI summary pre-generation queue
+    summary_queue_enabled: bool = True
+    summary_worker_concurrency: int = 2
+    summary_worker_rate_limit: float = 20.0  # LLM requests per minute
+    summary_queue_lease_seconds: int = 300
+    summary_queue_max_attempts: int = 3
     
     # Scraping
-    scraping_interval_hours: int = 24
+    scraping_interval_hours: int = 24  # default for sources without schedule_hours
+    scheduler_enabled: bool = False  # run the scrape scheduler inside the API process
+    scheduler_poll_seconds: float = 60.0
+    scheduler_jitter: float = 0.1  # +/- fraction of the interval
+    scheduler_min_interval_hours: float = 1.0
+    scheduler_max_interval_hours: float = 96.0
+    scheduler_deadline_window_days: int = 3  # poll more often when a deadline is this close
+    scrape_batch_size: int = 100  # natjecaji per database commit
+    scrape_batch_max_delay: float = 5.0  # max seconds a scraped natjecaj waits for its batch
+    scrape_queue_size: int = 64  # bound of each queue between pipeline stages
+    scrape_parse_workers: int = 0  # >0: parse pages in this many worker processes
+    scrape_close_missing: bool = True  # close open natjecaji a complete scrape no longer lists
+    scrape_run_lock_seconds: int = 900  # a run whose worker stops renewing its lock is failed after this
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     
     # Application
     debug: bool = True
     log_level: str = "INFO"
+    log_format: str = "json"  # "json" (one object per line) or "text"
+    log_async: bool = True  # format and write logs on a background thread
+    tracing_enabled: bool = True
+    trace_sample_rate: float = 0.1  # fraction of traces whose spans are all logged
+    trace_slow_ms: float = 500.0  # spans slower than this are always logged
+    metrics_enabled: bool = True  # /metrics endpoint and request/DB/scraper/LLM instrumentation
+    metrics_publish_seconds: float = 5.0  # with several API workers: how often each publishes its metrics
+    metrics_worker_ttl_seconds: int = 3600  # metrics of a worker that stopped publishing are dropped after this
+    shared_cache_enabled: bool = True  # dashboard fragments shared between API workers through the DB
+    
+    # Cross-source deduplication
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.6  # min Jaccard similarity of normalized titles
     
     # Frontend
     streamlit_server_port: int = 8501
     streamlit_server_address: str = "0.0.0.0"
+    dashboard_enabled: bool = True  # lightweight server-rendered dashboard at /dashboard
     
     class Config:
         env_file = ".env"
@@ -40,27 +81,42 @@ settings = Settings()
 
 
 # Data sources configuration
+# "scraper" is the "module:Class" path of the BaseScraper subclass; it is only
+# imported when an enabled source runs. rate_limit is in requests per second,
+# schedule_hours is how often the source should be scraped.
 DATA_SOURCES = {
     "national": [
         {
             "name": "HAMAG-BICRO",
             "url": "https://www.hamagbicro.hr/usluge/potpora-poduzetnistvu/",
             "type": "html",
-            "enabled": True
+            "scraper": "src.scrapers.hamag_scraper:HAMAGBICROScraper",
+            "enabled": True,
+            "concurrency": 1,
+            "rate_limit": 2.0,
+            "schedule_hours": 24
         },
         {
             "name": "HRZZ",
             "url": "https://hrzz.hr/natjecaji/",
-            "type": "html",
-            "enabled": True
+            "type": "dynamic",
+            "scraper": "src.scrapers.hrzz_scraper:HRZZScraper",
+            "enabled": True,
+            "concurrency": 1,
+            "rate_limit": 1.0,
+            "schedule_hours": 24
         }
     ],
     "international": [
         {
             "name": "Horizon Europe",
             "url": "https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/home",
-            "type": "dynamic",
-            "enabled": True
+            "type": "api",
+            "scraper": "src.scrapers.horizon_scraper:HorizonEuropeScraper",
+            "enabled": True,
+            "concurrency": 4,
+            "rate_limit": 5.0,
+            "schedule_hours": 12
         }
     ]
 }
@@ -5,15 +5,24 @@ from datetime import datetime
 from typing import Any
 
 from helpers import (
+    SEARCH_PAGE_SIZE,
+    PageFetch,
+    ScrapeProgressStream,
+    current_session_id,
     fetch_expiring_soon,
+    fetch_llm_metrics,
     fetch_natjecaji,
+    fetch_scrape_progress,
     fetch_scraping_logs,
     fetch_statistics,
+    fetch_summary_queue,
     format_iznos,
+    get_dataset_store,
     load_css,
     parse_rok,
     render_template,
-    safe_text,
+    render_templates,
+    rerun_when_dataset_changes,
     search_natjecaji,
     trigger_scraping,
 )
@@ -67,6 +76,9 @@ def main():
     with st.expander("EU AI Act obavijest", expanded=False):
         st.markdown(render_template("ai_notice.html"), unsafe_allow_html=True)
 
+    if page != "Administracija":
+        _stop_progress_stream()
+
     if page == "Početna":
         show_homepage(stats)
     elif page == "Pretraživanje":
@@ -76,6 +88,10 @@ def main():
     elif page == "Administracija":
         show_admin_page()
 
+    # The page was rendered from the cached snapshot - rerun once the
+    # background revalidation brings in new data, without waiting for it here
+    rerun_when_dataset_changes()
+
 
 def show_homepage(stats):
     """Show homepage with overview."""
@@ -98,6 +114,7 @@ def show_homepage(stats):
     expiring = fetch_expiring_soon(30)
 
     if expiring:
+        cards = []
         for nat in expiring[:6]:
             rok = parse_rok(nat.get("rok_prijave"))
             days_left = "N/A"
@@ -106,22 +123,16 @@ def show_homepage(stats):
                 days_left = f"{max((rok - datetime.now(rok.tzinfo)).days, 0)} dana"
                 rok_str = rok.strftime('%d.%m.%Y')
 
-            url = nat.get("url") or "#"
-            st.markdown(
-                render_template(
-                    "home_expiring_card.html",
-                    {
-                        "naziv": safe_text(nat.get("naziv", "Bez naziva")),
-                        "kategorija": safe_text(nat.get("kategorija", "N/A")),
-                        "podrucje": safe_text(nat.get("podrucje_istrazivanja", "N/A")),
-                        "iznos": safe_text(format_iznos(nat.get("iznos_financiranja"))),
-                        "rok": safe_text(rok_str),
-                        "days_left": safe_text(days_left),
-                        "url": safe_text(url),
-                    },
-                ),
-                unsafe_allow_html=True,
-            )
+            cards.append({
+                "naziv": nat.get("naziv", "Bez naziva"),
+                "kategorija": nat.get("kategorija", "N/A"),
+                "podrucje": nat.get("podrucje_istrazivanja", "N/A"),
+                "iznos": format_iznos(nat.get("iznos_financiranja")),
+                "rok": rok_str,
+                "days_left": days_left,
+                "url": nat.get("url") or "#",
+            })
+        st.markdown(render_templates("home_expiring_card.html", cards), unsafe_allow_html=True)
     else:
         st.info("Nema natječaja koji uskoro istječu.")
 
@@ -130,8 +141,10 @@ def show_search_page():
     """Show search and filtering page."""
     st.subheader("Pretraživanje natječaja")
 
-    if "search_results" not in st.session_state:
-        st.session_state.search_results = []
+    if "search_query" not in st.session_state:
+        st.session_state.search_query = None
+        st.session_state.search_page = 1
+        st.session_state.search_cache = {}
 
     with st.form("search_form", clear_on_submit=False):
         col1, col2, col3 = st.columns(3)
@@ -151,40 +164,61 @@ def show_search_page():
         submitted = st.form_submit_button("Pretraži", type="primary")
 
     if submitted:
-        kat = None if kategorija == "Sve" else kategorija
-        pod = None if podrucje == "Sve" else podrucje
-        st.session_state.search_results = search_natjecaji(
-            search_term=search_term if search_term else None,
-            kategorija=kat,
-            podrucje=pod,
-        )
+        st.session_state.search_query = {
+            "search_term": search_term if search_term else None,
+            "kategorija": None if kategorija == "Sve" else kategorija,
+            "podrucje": None if podrucje == "Sve" else podrucje,
+        }
+        st.session_state.search_page = 1
+        st.session_state.search_cache = {}
+
+    query = st.session_state.search_query
+    if query is None:
+        return
 
-    results = st.session_state.search_results
-    if results:
-        st.markdown("---")
-        st.subheader(f"Rezultati ({len(results)})")
-        for nat in results:
-            opis = nat.get('opis') or "Bez opisa"
-            short_opis = opis[:220] + ("..." if len(opis) > 220 else "")
-            rok = parse_rok(nat.get("rok_prijave"))
-            url = nat.get("url") or "#"
-            st.markdown(
-                render_template(
-                    "search_result_card.html",
-                    {
-                        "naziv": safe_text(nat.get("naziv", "Bez naziva")),
-                        "kategorija": safe_text(nat.get("kategorija", "N/A")),
-                        "podrucje": safe_text(nat.get("podrucje_istrazivanja", "N/A")),
-                        "opis": safe_text(short_opis),
-                        "iznos": safe_text(format_iznos(nat.get("iznos_financiranja"))),
-                        "rok": safe_text(rok.strftime('%d.%m.%Y') if rok else 'N/A'),
-                        "url": safe_text(url),
-                    },
-                ),
-                unsafe_allow_html=True,
-            )
-    elif submitted:
+    # Pages already fetched for this query are kept, so paging back costs no request
+    page = st.session_state.search_page
+    if page not in st.session_state.search_cache:
+        st.session_state.search_cache[page] = search_natjecaji(page=page, page_size=SEARCH_PAGE_SIZE, **query)
+    results, total = st.session_state.search_cache[page]
+
+    if not results:
         st.info("Nema rezultata za zadane kriterije.")
+        return
+
+    st.markdown("---")
+    st.subheader(f"Rezultati ({total})")
+
+    cards = []
+    for nat in results:
+        opis = nat.get('opis') or "Bez opisa"
+        short_opis = opis[:220] + ("..." if len(opis) > 220 else "")
+        rok = parse_rok(nat.get("rok_prijave"))
+        cards.append({
+            "naziv": nat.get("naziv", "Bez naziva"),
+            "kategorija": nat.get("kategorija", "N/A"),
+            "podrucje": nat.get("podrucje_istrazivanja", "N/A"),
+            "opis": short_opis,
+            "iznos": format_iznos(nat.get("iznos_financiranja")),
+            "rok": rok.strftime('%d.%m.%Y') if rok else 'N/A',
+            "url": nat.get("url") or "#",
+        })
+    # One markdown element for the whole page instead of one per card
+    st.markdown(render_templates("search_result_card.html", cards), unsafe_allow_html=True)
+
+    page_count = max((total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE, 1)
+    if page_count > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            st.button("← Prethodna", disabled=page <= 1, on_click=_set_search_page, args=(page - 1,))
+        with info_col:
+            st.markdown(f"Stranica {page} / {page_count}")
+        with next_col:
+            st.button("Sljedeća →", disabled=page >= page_count, on_click=_set_search_page, args=(page + 1,))
+
+
+def _set_search_page(page):
+    st.session_state.search_page = page
 
 
 def show_statistics_page(stats):
@@ -272,21 +306,105 @@ def show_admin_page():
     st.markdown("### Web scraping")
     st.write("Ručno pokrenite prikupljanje podataka s definiranih izvora.")
 
-    if st.button("Pokreni scraping", type="primary"):
-        with st.spinner("Prikupljanje podataka u tijeku..."):
-            success = trigger_scraping()
+    # While a run is followed over the SSE stream, render its latest snapshot
+    stream = st.session_state.get("scrape_progress_stream")
+    if stream is not None and stream.is_alive():
+        progress = stream.snapshot
+    else:
+        progress = fetch_scrape_progress()
+    running = bool(progress and progress.get("state") == "running")
+    if running and (stream is None or not stream.is_alive()):
+        st.session_state.scrape_progress_stream = ScrapeProgressStream(current_session_id(), progress).start()
+
+    # Started from a callback so the click is handled exactly once, not on every rerun
+    st.button("Pokreni scraping", type="primary", disabled=running, on_click=_start_scraping)
+    if st.session_state.pop("scrape_start_failed", False):
+        st.error("Greška pri pokretanju scrapinga. Provjerite API server.")
 
-            if success:
-                st.success("Scraping uspješno završen.")
-                st.cache_data.clear()
-                st.rerun()
-            else:
-                st.error("Greška pri scrapingu. Provjerite API server.")
+    if progress and progress.get("run_id"):
+        render_scrape_progress(progress)
+
+    # Reload the dataset once when a run we watched has just finished
+    if st.session_state.get("scrape_running") and not running:
+        get_dataset_store().refresh(force=True)
+    st.session_state.scrape_running = running
 
     st.markdown("---")
 
     st.markdown("### Povijest scrapinga")
-    logs = fetch_scraping_logs(limit=10)
+    logs_slot = st.empty()
+
+    st.markdown("### AI sažeci")
+    queue_slot = st.empty()
+    metrics_slot = st.empty()
+
+    renderers = {
+        "logs": (logs_slot, render_scraping_logs),
+        "queue": (queue_slot, render_summary_queue),
+        "metrics": (metrics_slot, render_llm_metrics),
+    }
+    # Progress reruns the page on every update - keep the last results until the run is over
+    if running and "admin_sections" in st.session_state:
+        results = list(st.session_state.admin_sections.items())
+    else:
+        st.session_state.admin_sections = {}
+        results = PageFetch(
+            logs=lambda: fetch_scraping_logs(limit=10),
+            queue=fetch_summary_queue,
+            metrics=lambda: fetch_llm_metrics(days=7),
+        ).as_completed()
+    for name, result in results:
+        st.session_state.admin_sections[name] = result
+        slot, render = renderers[name]
+        with slot.container():
+            render(result)
+
+
+def _stop_progress_stream():
+    stream = st.session_state.pop("scrape_progress_stream", None)
+    if stream is not None:
+        stream.stop()
+
+
+def _start_scraping():
+    if trigger_scraping() is None:
+        st.session_state.scrape_start_failed = True
+
+
+def render_scrape_progress(progress):
+    state_labels = {"running": "U tijeku", "finished": "Završeno", "failed": "Neuspjelo"}
+    source_labels = {"pending": "Čeka", "running": "U tijeku", "success": "Uspješno", "failed": "Neuspjelo"}
+
+    elapsed = progress.get("elapsed") or 0
+    st.markdown(
+        f"**Status:** {state_labels.get(progress.get('state'), progress.get('state'))} • "
+        f"**Pronađeno:** {progress.get('items_found', 0)} • "
+        f"**Trajanje:** {elapsed:.0f} s"
+    )
+
+    sources = progress.get("sources") or []
+    done = sum(1 for source in sources if source.get("status") in ("success", "failed"))
+    if sources:
+        st.progress(done / len(sources))
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Izvor": source["name"],
+                    "Status": source_labels.get(source.get("status"), source.get("status")),
+                    "Pronađeno": source.get("items_found", 0),
+                    "Dodano": source.get("added", 0),
+                    "Ažurirano": source.get("updated", 0),
+                    "Trajanje (s)": source.get("elapsed"),
+                    "Greška": source.get("error") or "",
+                }
+                for source in sources
+            ]),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+def render_scraping_logs(logs):
     if logs is not None:
         if logs:
             df_logs = pd.DataFrame(logs)
@@ -297,6 +415,29 @@ def show_admin_page():
         st.error("Greška pri dohvaćanju logova.")
 
 
+def render_summary_queue(queue):
+    if queue is None:
+        st.error("Greška pri dohvaćanju reda sažetaka.")
+        return
+    a, b, c, d = st.columns(4)
+    a.metric("Na čekanju", queue.get("pending", 0))
+    b.metric("U obradi", queue.get("leased", 0))
+    c.metric("Gotovo", queue.get("done", 0))
+    d.metric("Neuspjelo", queue.get("failed", 0))
+
+
+def render_llm_metrics(metrics):
+    if metrics is None:
+        st.error("Greška pri dohvaćanju LLM metrika.")
+        return
+    latency = metrics.get("latency_ms") or {}
+    a, b, c, d = st.columns(4)
+    a.metric("LLM pozivi (7 dana)", metrics.get("calls", 0))
+    b.metric("Fallback", metrics.get("fallbacks", 0))
+    c.metric("Latencija p95", f"{latency['p95']:.0f} ms" if latency.get("p95") is not None else "N/A")
+    d.metric("Procijenjeni trošak", f"${metrics.get('estimated_cost_usd', 0):.2f}")
+
+
 # ==================== RUN APP ====================
 
 if __name__ == "__main__":
@@ -1,14 +1,35 @@
-import html
-from datetime import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-API_URL = "http://localhost:8000/api"
+from template_engine import TemplateEngine
+
+API_URL = os.getenv("API_URL", "http://localhost:8000/api")
 BASE_DIR = Path(__file__).parent
 TEMPLATES_DIR = BASE_DIR / "templates"
+CACHE_DIR = Path(os.getenv("FRONTEND_CACHE_DIR", BASE_DIR / ".cache"))
+SEARCH_PAGE_SIZE = 20
+# Recompile templates when their files change (development only)
+TEMPLATE_AUTO_RELOAD = os.getenv("DEBUG", "false").lower() == "true"
+
+# One pooled session (keep-alive connections) shared by all Streamlit sessions
+_http = requests.Session()
+_http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Shared pool for concurrent API calls (sized to the connection pool above)
+_fetch_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fidit-fetch")
 
 
 def load_css() -> None:
@@ -17,21 +38,22 @@ def load_css() -> None:
         st.markdown(f"<style>{css_path.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
 
 
-def render_template(template_name: str, context: Optional[Dict[str, str]] = None) -> str:
-    template_path = TEMPLATES_DIR / template_name
-    if not template_path.exists():
-        return ""
+# All templates are compiled once per server process; values are HTML-escaped
+_templates = TemplateEngine(TEMPLATES_DIR, auto_reload=TEMPLATE_AUTO_RELOAD)
+
+
+def render_template(template_name: str, context: Optional[Dict[str, Any]] = None) -> str:
+    return _templates.render(template_name, context)
+
 
-    content = template_path.read_text(encoding="utf-8")
-    if context:
-        for key, value in context.items():
-            content = content.replace(f"{{{{{key}}}}}", str(value))
-    return content
+def render_templates(template_name: str, contexts: List[Dict[str, Any]]) -> str:
+    """Render one template for many contexts into a single HTML block"""
+    return _templates.render_many(template_name, contexts)
 
 
 def _safe_get(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = _http.get(url, params=params, timeout=15)
         if response.status_code == 200:
             return response.json()
     except requests.RequestException:
@@ -39,12 +61,14 @@ def _safe_get(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any
     return None
 
 
-def _safe_post(url: str) -> bool:
+def _safe_post(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
     try:
-        response = requests.post(url, timeout=30)
-        return response.status_code == 200
-    except requests.RequestException:
-        return False
+        response = _http.post(url, params=params, timeout=30)
+        if response.status_code == 200:
+            return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+    return None
 
 
 def parse_rok(rok_prijave: Optional[str]) -> Optional[datetime]:
@@ -63,42 +87,333 @@ def format_iznos(value: Any) -> str:
         return "N/A"
 
 
-def safe_text(value: Any) -> str:
-    if value is None:
-        return "N/A"
-    return html.escape(str(value))
+class DatasetStore:
+    """
+    Local copy of the /api/dataset snapshot.
+
+    Revalidated with If-None-Match, only rows changed since the last watermark
+    are downloaded, and the snapshot is persisted to disk for cold starts.
+    """
+
+    def __init__(self, cache_path: Path, min_revalidate_seconds: float = 2.0):
+        self.cache_path = cache_path
+        self.min_revalidate_seconds = min_revalidate_seconds
+        self.version: Optional[str] = None
+        self.watermark: Optional[str] = None
+        self.statistics: Dict[str, Any] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+        self._load_from_disk()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Revalidate against the API. Returns True if the dataset changed."""
+        with self._lock:
+            if not force and time.monotonic() - self._last_check < self.min_revalidate_seconds:
+                return False
+
+            params = {"since": self.watermark} if self.version and self.watermark else None
+            # Same form as the API's ETag: deltas are tagged with their watermark
+            etag = f"{self.version}-{self.watermark}" if params else self.version
+            headers = {"If-None-Match": f'"{etag}"'} if self.version else {}
+            try:
+                response = _http.get(f"{API_URL}/dataset", params=params, headers=headers, timeout=15)
+            except requests.RequestException:
+                return False
+            self._last_check = time.monotonic()
+
+            if response.status_code != 200:
+                return False
+
+            self._apply(response.json())
+            self._save_to_disk()
+            return True
+
+    def refresh_async(self) -> Future:
+        """Revalidate on the fetch pool; concurrent callers share one request"""
+        with self._lock:
+            if self._pending is None or self._pending.done():
+                self._pending = _fetch_pool.submit(self.refresh)
+            return self._pending
+
+    def pending_refresh(self) -> Optional[Future]:
+        return self._pending
+
+    def is_loaded(self) -> bool:
+        return self.version is not None
+
+    def natjecaji(self) -> List[Dict[str, Any]]:
+        return list(self.rows.values())
+
+    def _apply(self, payload: Dict[str, Any]) -> None:
+        columns = payload.get("columns", [])
+        # Build a new dict and swap it in - readers on other threads never see a half-applied delta
+        rows = {} if payload.get("full") else dict(self.rows)
+        for row in payload.get("rows", []):
+            item = dict(zip(columns, row))
+            rows[item["id"]] = item
+
+        current_ids = set(payload.get("ids", []))
+        self.rows = {natjecaj_id: item for natjecaj_id, item in rows.items() if natjecaj_id in current_ids}
+
+        self.version = payload.get("version")
+        self.watermark = payload.get("watermark")
+        self.statistics = payload.get("statistics") or {}
+
+    def _load_from_disk(self) -> None:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            self.version = data["version"]
+            self.watermark = data.get("watermark")
+            self.statistics = data.get("statistics") or {}
+            self.rows = {item["id"]: item for item in data.get("natjecaji", [])}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_to_disk(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps({
+                    "version": self.version,
+                    "watermark": self.watermark,
+                    "statistics": self.statistics,
+                    "natjecaji": self.natjecaji(),
+                }),
+                encoding="utf-8",
+            )
+            tmp_path.replace(self.cache_path)
+        except OSError:
+            pass
+
+
+@st.cache_resource
+def get_dataset_store() -> DatasetStore:
+    return DatasetStore(CACHE_DIR / "dataset.json")
+
+
+def load_dataset() -> Optional[DatasetStore]:
+    """
+    Dataset for rendering, or None if the API is unreachable and nothing is cached.
+
+    A cached snapshot is returned immediately (possibly stale) while it is
+    revalidated in the background; only a cold start waits for the API.
+    """
+    store = get_dataset_store()
+    if store.is_loaded():
+        store.refresh_async()
+    else:
+        store.refresh()
+    return store if store.is_loaded() else None
+
+
+class PageFetch:
+    """
+    Runs all API calls of a page concurrently on the shared pool.
+
+    Usage:
+        fetch = PageFetch(logs=lambda: fetch_scraping_logs(10), queue=fetch_summary_queue)
+        for name, result in fetch.as_completed():
+            ...render the section for name...
+    """
+
+    def __init__(self, **calls: Callable[[], Any]):
+        self._futures: Dict[Future, str] = {_fetch_pool.submit(call): name for name, call in calls.items()}
+
+    def as_completed(self, timeout: Optional[float] = 30.0) -> Iterator[Tuple[str, Any]]:
+        """Yield (name, result) in completion order; failed calls yield None"""
+        try:
+            for future in as_completed(self._futures, timeout=timeout):
+                yield self._futures[future], self._result(future)
+        except FutureTimeoutError:
+            for future, name in self._futures.items():
+                if not future.done():
+                    yield name, None
+
+    def get(self, name: str, timeout: Optional[float] = 30.0) -> Any:
+        for future, future_name in self._futures.items():
+            if future_name == name:
+                return self._result(future, timeout)
+        raise KeyError(name)
+
+    @staticmethod
+    def _result(future: Future, timeout: Optional[float] = None) -> Any:
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+
+def current_session_id() -> Optional[str]:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def request_session_rerun(session_id: Optional[str]) -> None:
+    """
+    Rerun a Streamlit session from a background thread.
+
+    st.rerun() only works on the script thread, so this asks the session's
+    AppSession on the server event loop instead. Streamlit has no public API
+    for it; if the internals are missing the session simply is not rerun.
+    """
+    if session_id is None:
+        return
+    try:
+        from streamlit import runtime
+
+        if not runtime.exists():
+            return
+        session_info = runtime.get_instance()._session_mgr.get_active_session_info(session_id)
+        if session_info is not None:
+            session = session_info.session
+            session._event_loop.call_soon_threadsafe(session.request_rerun, None)
+    except Exception:
+        pass
+
+
+def rerun_when_dataset_changes() -> None:
+    """Rerun this session once the background revalidation brings in new data"""
+    pending = get_dataset_store().pending_refresh()
+    # One callback per revalidation - a finished future calls back immediately
+    if pending is None or st.session_state.get("watched_dataset_refresh") is pending:
+        return
+    st.session_state.watched_dataset_refresh = pending
+    session_id = current_session_id()
+
+    def _on_done(future: Future) -> None:
+        try:
+            changed = future.result()
+        except Exception:
+            return
+        if changed:
+            request_session_rerun(session_id)
+
+    pending.add_done_callback(_on_done)
+
+
+class ScrapeProgressStream:
+    """
+    Follows /api/scrape/progress/stream on a background thread.
+
+    Keeps the latest snapshot for the admin page and reruns the session that
+    opened it on every new version, so the page neither polls the API nor
+    sleeps on the script thread while a run is in progress.
+    """
+
+    def __init__(self, session_id: Optional[str], snapshot: Optional[Dict[str, Any]] = None):
+        self.session_id = session_id
+        self.snapshot = snapshot
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="fidit-scrape-progress", daemon=True)
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.snapshot.get("version") if self.snapshot else None
+
+    def start(self) -> "ScrapeProgressStream":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self) -> None:
+        try:
+            # Read timeout above the server's 15 s keep-alive comments
+            with _http.get(f"{API_URL}/scrape/progress/stream", stream=True, timeout=(5, 60)) as response:
+                if response.status_code != 200:
+                    return
+                for snapshot in self._events(response):
+                    if self._stop.is_set():
+                        return
+                    if snapshot.get("version") != self.version:
+                        self.snapshot = snapshot
+                        request_session_rerun(self.session_id)
+                    if snapshot.get("state") != "running":
+                        return
+        except (requests.RequestException, ValueError):
+            pass
+        finally:
+            # Let the page fall back to /scrape/progress (or show the finished run)
+            if not self._stop.is_set():
+                self._stop.set()
+                request_session_rerun(self.session_id)
+
+    def _events(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Parse "data:" payloads of server-sent events; keep-alive comments are skipped"""
+        data: List[str] = []
+        # chunk_size=None yields chunks as they arrive instead of filling a buffer
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if self._stop.is_set():
+                return
+            if line:
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                continue
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+
+
+def _is_active(nat: Dict[str, Any], now: datetime) -> bool:
+    rok = parse_rok(nat.get("rok_prijave"))
+    return nat.get("status") == "active" and rok is not None and rok.replace(tzinfo=None) >= now
 
 
-@st.cache_data(ttl=300)
 def fetch_statistics() -> Optional[Dict[str, Any]]:
-    data = _safe_get(f"{API_URL}/statistics")
-    if isinstance(data, dict):
-        return data
-    return None
+    store = load_dataset()
+    if store is None:
+        return None
+
+    now = datetime.utcnow()
+    stats = dict(store.statistics)
+    stats["expiring_soon"] = len(_expiring(store.natjecaji(), now, 30))
+    return stats
 
 
-@st.cache_data(ttl=300)
 def fetch_natjecaji(active_only: bool = False) -> List[Dict[str, Any]]:
-    data = _safe_get(f"{API_URL}/natjecaji", params={"active_only": active_only})
-    if isinstance(data, list):
-        return data
-    return []
+    store = load_dataset()
+    if store is None:
+        return []
+
+    natjecaji = store.natjecaji()
+    if active_only:
+        now = datetime.utcnow()
+        natjecaji = [nat for nat in natjecaji if _is_active(nat, now)]
+    return natjecaji
+
+
+def _expiring(natjecaji: List[Dict[str, Any]], now: datetime, days: int) -> List[Dict[str, Any]]:
+    until = now + timedelta(days=days)
+    expiring = [
+        nat for nat in natjecaji
+        if _is_active(nat, now) and parse_rok(nat["rok_prijave"]).replace(tzinfo=None) <= until
+    ]
+    return sorted(expiring, key=lambda nat: nat["rok_prijave"])
 
 
-@st.cache_data(ttl=300)
 def fetch_expiring_soon(days: int = 30) -> List[Dict[str, Any]]:
-    data = _safe_get(f"{API_URL}/natjecaji/expiring/soon", params={"days": days})
-    if isinstance(data, list):
-        return data
-    return []
+    store = load_dataset()
+    if store is None:
+        return []
+    return _expiring(store.natjecaji(), datetime.utcnow(), days)
 
 
 def search_natjecaji(
     search_term: Optional[str] = None,
     kategorija: Optional[str] = None,
     podrucje: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    params: Dict[str, str] = {}
+    page: int = 1,
+    page_size: int = SEARCH_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """One page of search results and the total number of matches"""
+    params: Dict[str, Any] = {"skip": (page - 1) * page_size, "limit": page_size}
     if search_term:
         params["q"] = search_term
     if kategorija:
@@ -106,14 +421,32 @@ def search_natjecaji(
     if podrucje:
         params["podrucje"] = podrucje
 
-    data = _safe_get(f"{API_URL}/search", params=params)
-    if isinstance(data, list):
-        return data
-    return []
+    try:
+        response = _http.get(f"{API_URL}/search", params=params, timeout=15)
+    except requests.RequestException:
+        return [], 0
+    if response.status_code != 200:
+        return [], 0
 
+    data = response.json()
+    if not isinstance(data, list):
+        return [], 0
+    return data, int(response.headers.get("X-Total-Count", len(data)))
 
-def trigger_scraping() -> bool:
-    return _safe_post(f"{API_URL}/scrape")
+
+def trigger_scraping() -> Optional[Dict[str, Any]]:
+    """Start scraping in the background on the API; returns the initial progress"""
+    data = _safe_post(f"{API_URL}/scrape", params={"background": "true"})
+    if isinstance(data, dict):
+        return data.get("progress")
+    return None
+
+
+def fetch_scrape_progress() -> Optional[Dict[str, Any]]:
+    data = _safe_get(f"{API_URL}/scrape/progress")
+    if isinstance(data, dict):
+        return data
+    return None
 
 
 def fetch_scraping_logs(limit: int = 10) -> Optional[List[Dict[str, Any]]]:
@@ -121,3 +454,17 @@ def fetch_scraping_logs(limit: int = 10) -> Optional[List[Dict[str, Any]]]:
     if isinstance(data, list):
         return data
     return None
+
+
+def fetch_summary_queue() -> Optional[Dict[str, Any]]:
+    data = _safe_get(f"{API_URL}/summaries/queue")
+    if isinstance(data, dict):
+        return data
+    return None
+
+
+def fetch_llm_metrics(days: int = 7) -> Optional[Dict[str, Any]]:
+    data = _safe_get(f"{API_URL}/llm/metrics", params={"days": days})
+    if isinstance(data, dict):
+        return data
+    return None
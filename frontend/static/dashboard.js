@@ -0,0 +1,84 @@
+// Charts for the server-rendered dashboard. Data comes from /api/dataset
+// (the browser revalidates it with the ETag), aggregation happens here.
+(function () {
+  "use strict";
+
+  var container = document.getElementById("charts");
+  if (!container) {
+    return;
+  }
+
+  function countBy(rows, key) {
+    var counts = {};
+    rows.forEach(function (row) {
+      var value = row[key] || "N/A";
+      counts[value] = (counts[value] || 0) + 1;
+    });
+    return Object.keys(counts)
+      .map(function (label) { return [label, counts[label]]; })
+      .sort(function (a, b) { return b[1] - a[1]; });
+  }
+
+  function fundingBuckets(rows) {
+    var limits = [[50000, "< 50.000 EUR"], [200000, "50.000 - 200.000 EUR"],
+                  [1000000, "200.000 - 1.000.000 EUR"], [Infinity, "> 1.000.000 EUR"]];
+    var counts = limits.map(function (limit) { return [limit[1], 0]; });
+    rows.forEach(function (row) {
+      if (row.iznos_financiranja == null) {
+        return;
+      }
+      for (var i = 0; i < limits.length; i++) {
+        if (row.iznos_financiranja < limits[i][0]) {
+          counts[i][1] += 1;
+          break;
+        }
+      }
+    });
+    return counts;
+  }
+
+  function barChart(title, items) {
+    var section = document.createElement("section");
+    section.className = "dashboard-chart";
+    var heading = document.createElement("h3");
+    heading.textContent = title;
+    section.appendChild(heading);
+
+    var max = Math.max.apply(null, items.map(function (item) { return item[1]; }).concat([1]));
+    items.forEach(function (item) {
+      var bar = document.createElement("div");
+      bar.className = "dashboard-bar";
+      var label = document.createElement("span");
+      label.className = "dashboard-bar-label";
+      label.textContent = item[0];
+      label.title = item[0];
+      var fill = document.createElement("span");
+      fill.className = "dashboard-bar-fill";
+      fill.style.width = Math.max(item[1] / max * 60, 0.5) + "%";
+      var value = document.createElement("span");
+      value.textContent = item[1];
+      bar.appendChild(label);
+      bar.appendChild(fill);
+      bar.appendChild(value);
+      section.appendChild(bar);
+    });
+    return section;
+  }
+
+  fetch(container.getAttribute("data-source"), { cache: "no-cache" })
+    .then(function (response) { return response.json(); })
+    .then(function (dataset) {
+      var rows = dataset.rows.map(function (row) {
+        var item = {};
+        dataset.columns.forEach(function (column, i) { item[column] = row[i]; });
+        return item;
+      });
+      container.textContent = "";
+      container.appendChild(barChart("Distribucija po kategorijama", countBy(rows, "kategorija")));
+      container.appendChild(barChart("Po područjima istraživanja", countBy(rows, "podrucje_istrazivanja")));
+      container.appendChild(barChart("Raspodjela financiranja", fundingBuckets(rows)));
+    })
+    .catch(function () {
+      container.textContent = "Greška pri dohvaćanju podataka za grafove.";
+    });
+})();
@@ -0,0 +1,129 @@
+import html
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# {{field}} is HTML-escaped, {{field|raw}} is inserted as-is
+FIELD_RE = re.compile(r"\{\{\s*(\w+)\s*(\|\s*raw\s*)?\}\}")
+
+
+class CompiledTemplate:
+    """
+    Template compiled into a %-format string plus the ordered list of fields.
+
+    Rendering is a single `fmt % values` - no regex or str.replace per call.
+    """
+
+    def __init__(self, name: str, source: str, mtime: float = 0.0, none_value: str = "N/A"):
+        self.name = name
+        self.mtime = mtime
+        self.none_value = none_value
+
+        pieces: List[str] = []
+        fields: List[Tuple[str, bool]] = []
+        position = 0
+        for match in FIELD_RE.finditer(source):
+            pieces.append(source[position:match.start()].replace("%", "%%"))
+            pieces.append("%s")
+            fields.append((match.group(1), bool(match.group(2))))
+            position = match.end()
+        pieces.append(source[position:].replace("%", "%%"))
+
+        self.fmt = "".join(pieces)
+        self.fields = tuple(fields)
+        self.field_names = tuple(name for name, _ in fields)
+
+    def render(self, context: Optional[Dict[str, Any]] = None) -> str:
+        if not self.fields:
+            return self.fmt % ()
+        context = context or {}
+        none_value = self.none_value
+        values = []
+        for name, raw in self.fields:
+            value = context.get(name)
+            if value is None:
+                values.append(none_value)
+            else:
+                values.append(str(value) if raw else html.escape(str(value)))
+        return self.fmt % tuple(values)
+
+    def render_many(self, contexts: Iterable[Dict[str, Any]], separator: str = "\n") -> str:
+        return separator.join(self.render(context) for context in contexts)
+
+
+class TemplateEngine:
+    """
+    Loads and compiles every *.html template in a directory once.
+
+    With auto_reload (debug) a template is recompiled when its file changes;
+    files are checked at most once per reload_interval seconds.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path,
+        auto_reload: bool = False,
+        reload_interval: float = 1.0,
+        none_value: str = "N/A"
+    ):
+        self.templates_dir = Path(templates_dir)
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self.none_value = none_value
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.load_all()
+
+    def load_all(self) -> None:
+        templates = {}
+        for path in sorted(self.templates_dir.glob("*.html")):
+            templates[path.name] = self._compile(path)
+        self._templates = templates
+
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        if self.auto_reload:
+            self._check_for_changes()
+        return self._templates.get(name)
+
+    def render(self, name: str, context: Optional[Dict[str, Any]] = None) -> str:
+        template = self.get(name)
+        return template.render(context) if template else ""
+
+    def render_many(self, name: str, contexts: Iterable[Dict[str, Any]], separator: str = "\n") -> str:
+        template = self.get(name)
+        return template.render_many(contexts, separator) if template else ""
+
+    def names(self) -> List[str]:
+        return list(self._templates)
+
+    def _compile(self, path: Path) -> CompiledTemplate:
+        return CompiledTemplate(
+            path.name,
+            path.read_text(encoding="utf-8"),
+            mtime=path.stat().st_mtime,
+            none_value=self.none_value
+        )
+
+    def _check_for_changes(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+
+            templates = dict(self._templates)
+            current = {path.name: path for path in self.templates_dir.glob("*.html")}
+            for name, path in current.items():
+                try:
+                    if name not in templates or path.stat().st_mtime != templates[name].mtime:
+                        templates[name] = self._compile(path)
+                except OSError:
+                    continue
+            for name in [name for name in templates if name not in current]:
+                del templates[name]
+            self._templates = templates
@@ -61,6 +61,12 @@ BACKEND_PID=$!
 echo "   Backend PID: $BACKEND_PID"
 sleep 3
 
+# Start AI summary queue worker
+echo "  Starting AI summary worker..."
+python src/llm/summary_worker.py &
+WORKER_PID=$!
+echo "   Worker PID: $WORKER_PID"
+
 # Start frontend
 echo "▶️  Starting Streamlit frontend..."
 streamlit run frontend/app.py &
@@ -84,6 +90,7 @@ cleanup() {
     echo ""
     echo " Stopping services..."
     kill $BACKEND_PID 2>/dev/null
+    kill $WORKER_PID 2>/dev/null
     kill $FRONTEND_PID 2>/dev/null
     echo "  Services stopped"
     exit 0
@@ -0,0 +1,356 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+import hashlib
+import html
+import threading
+import time
+import sys
+import os
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import FileResponse, HTMLResponse
+from loguru import logger
+from sqlalchemy.orm import Session
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FRONTEND_DIR = os.path.join(ROOT_DIR, "frontend")
+
+sys.path.append(ROOT_DIR)
+sys.path.append(FRONTEND_DIR)
+
+from config.settings import settings
+from src.database.database import get_db, get_db_session
+from src.database import crud
+from template_engine import TemplateEngine
+
+PAGE_SIZE = 20
+KATEGORIJE = ["Znanstveno istraživanje", "Inovacije", "Potpora poduzetništvu"]
+PODRUCJA = ["ICT", "Medicina", "Društvene znanosti", "Multidisciplinarno"]
+NAV = [("", "Početna"), ("/search", "Pretraživanje"), ("/statistics", "Statistika")]
+STATIC_FILES = {
+    "styles.css": os.path.join(FRONTEND_DIR, "styles.css"),
+    "dashboard.css": os.path.join(FRONTEND_DIR, "static", "dashboard.css"),
+    "dashboard.js": os.path.join(FRONTEND_DIR, "static", "dashboard.js"),
+}
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+templates = TemplateEngine(os.path.join(FRONTEND_DIR, "templates"))
+
+
+class FragmentCache:
+    """
+    Small LRU cache of rendered HTML fragments.
+
+    Keys include the dataset version, so a fragment is reused until the
+    data changes and stale entries simply age out.
+
+    With `shared=True` rendered fragments are also stored in the
+    cache_entries table, so with several API workers a fragment is
+    rendered once instead of once per worker.
+    """
+
+    def __init__(self, max_entries: int = 256, shared: bool = False, shared_ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_writes = 0
+
+    def get_or_render(self, key: Tuple, render: Callable[[], str]) -> str:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        fragment = None
+        if self.shared:
+            shared_key = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+            fragment = self._shared_get(shared_key)
+        if fragment is None:
+            fragment = render()
+            if self.shared:
+                self._shared_set(shared_key, fragment)
+
+        with self._lock:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _shared_get(self, key: str) -> Optional[str]:
+        try:
+            with get_db_session() as db:
+                return crud.get_cache_entry(db, key)
+        except Exception as e:
+            # The shared cache is an optimization - render locally if the DB is unavailable
+            logger.warning(f"Shared cache read failed: {e}")
+            return None
+
+    def _shared_set(self, key: str, fragment: str):
+        try:
+            with get_db_session() as db:
+                crud.set_cache_entry(db, key, fragment, self.shared_ttl_seconds)
+                self._shared_writes += 1
+                if self._shared_writes % 100 == 0:
+                    crud.delete_expired_cache_entries(db)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {e}")
+
+
+fragments = FragmentCache(shared=settings.shared_cache_enabled)
+
+# Every page checks the version - reuse it briefly across requests
+VERSION_TTL_SECONDS = 2.0
+_version_cache: Dict = {"expires": 0.0, "value": None}
+_version_lock = threading.Lock()
+
+
+def _dataset_version(db: Session) -> Dict:
+    with _version_lock:
+        if _version_cache["value"] is not None and time.monotonic() < _version_cache["expires"]:
+            return _version_cache["value"]
+    value = crud.get_dataset_version(db)
+    with _version_lock:
+        _version_cache.update(value=value, expires=time.monotonic() + VERSION_TTL_SECONDS)
+    return value
+
+
+def _tag(version: Dict) -> str:
+    """Cache key for rendered pages - "expiring soon" also changes with the date"""
+    return f'{version["version"]}-{datetime.utcnow():%Y%m%d}'
+
+
+def _format_iznos(value) -> str:
+    try:
+        return f"{float(value):,.0f} EUR"
+    except (TypeError, ValueError):
+        return "N/A"
+
+
+def _format_rok(rok: Optional[datetime]) -> str:
+    return rok.strftime('%d.%m.%Y') if rok else 'N/A'
+
+
+def _page(
+    response_headers: Dict,
+    if_none_match: Optional[str],
+    etag: str,
+    render: Callable[[], str]
+) -> Response:
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=response_headers)
+    return HTMLResponse(render(), headers=response_headers)
+
+
+def _layout(title: str, active: str, stats: Dict, content: str, scripts: str = "") -> str:
+    nav = "".join(
+        f'<a href="/dashboard{path}" class="{"active" if path == active else ""}">{label}</a>'
+        for path, label in NAV
+    )
+    return templates.render("dashboard_layout.html", {
+        "title": title,
+        "static_url": "/dashboard/static",
+        "header": templates.render("header.html", {
+            "title": "FIDIT AI Assistant",
+            "subtitle": "Jednostavan pregled javnih natječaja uz AI podršku.",
+        }),
+        "nav": nav,
+        "stats_line": (
+            f"Ukupno: {stats.get('total_natjecaji', 0)} | "
+            f"Aktivni: {stats.get('active_natjecaji', 0)} | "
+            f"Ističu uskoro: {stats.get('expiring_soon', 0)}"
+        ),
+        "content": content,
+        "ai_notice": templates.render("ai_notice.html"),
+        "scripts": scripts,
+    })
+
+
+def _statistics(db: Session, version: Dict) -> Dict:
+    def render_count() -> str:
+        return str(len(crud.get_expiring_soon_natjecaji(db, days=30)))
+
+    expiring = fragments.get_or_render(("expiring_count", _tag(version)), render_count)
+    return {**crud.get_statistics(db), "expiring_soon": int(expiring)}
+
+
+def _metrics(stats: Dict) -> str:
+    items = [
+        ("Ukupno natječaja", stats.get("total_natjecaji", 0)),
+        ("Aktivni", stats.get("active_natjecaji", 0)),
+        ("Ističu uskoro", stats.get("expiring_soon", 0)),
+        ("Izdavatelji", stats.get("total_izdavatelji", 0)),
+    ]
+    cards = templates.render_many("dashboard_metric.html", [{"label": label, "value": value} for label, value in items])
+    return f'<div class="dashboard-metrics">{cards}</div>'
+
+
+def _headers(etag: str) -> Dict:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+@router.get("", response_class=HTMLResponse)
+def dashboard_home(
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Server-rendered overview page"""
+    version = _dataset_version(db)
+    etag = f'"home-{_tag(version)}"'
+
+    def render_content() -> str:
+        stats = _statistics(db, version)
+        now = datetime.utcnow()
+        cards = []
+        for nat in crud.get_expiring_soon_natjecaji(db, days=30)[:6]:
+            days_left = max((nat.rok_prijave - now).days, 0) if nat.rok_prijave else None
+            cards.append({
+                "naziv": nat.naziv,
+                "kategorija": nat.kategorija,
+                "podrucje": nat.podrucje_istrazivanja,
+                "iznos": _format_iznos(nat.iznos_financiranja),
+                "rok": _format_rok(nat.rok_prijave),
+                "days_left": f"{days_left} dana" if days_left is not None else None,
+                "url": nat.url or "#",
+            })
+        expiring = (
+            templates.render_many("home_expiring_card.html", cards)
+            if cards else '<p class="muted">Nema natječaja koji uskoro istječu.</p>'
+        )
+        content = (
+            "<h2>Pregled</h2>" + _metrics(stats)
+            + "<h2>Natječaji koji uskoro istječu</h2>" + expiring
+        )
+        return _layout("Početna", "", stats, content)
+
+    return _page(
+        _headers(etag), if_none_match, etag,
+        lambda: fragments.get_or_render(("home", _tag(version)), render_content)
+    )
+
+
+@router.get("/search", response_class=HTMLResponse)
+def dashboard_search(
+    q: Optional[str] = None,
+    kategorija: Optional[str] = None,
+    podrucje: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Server-rendered, paginated search page"""
+    version = _dataset_version(db)
+    params = {"q": q or "", "kategorija": kategorija or "", "podrucje": podrucje or ""}
+    key = ("search", _tag(version), params["q"], params["kategorija"], params["podrucje"], page)
+    etag = '"search-%s"' % hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+
+    def render_content() -> str:
+        stats = _statistics(db, version)
+        filters = dict(
+            search_term=q or None,
+            kategorija=kategorija or None,
+            podrucje=podrucje or None
+        )
+        results = crud.search_natjecaji(db, skip=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE, **filters)
+        total = crud.count_search_natjecaji(db, **filters)
+
+        cards = []
+        for nat in results:
+            opis = nat.opis or "Bez opisa"
+            cards.append({
+                "naziv": nat.naziv,
+                "kategorija": nat.kategorija,
+                "podrucje": nat.podrucje_istrazivanja,
+                "opis": opis[:220] + ("..." if len(opis) > 220 else ""),
+                "iznos": _format_iznos(nat.iznos_financiranja),
+                "rok": _format_rok(nat.rok_prijave),
+                "url": nat.url or "#",
+            })
+
+        content = "<h2>Pretraživanje natječaja</h2>" + _search_form(params)
+        if cards:
+            content += f"<h3>Rezultati ({total})</h3>"
+            content += templates.render_many("search_result_card.html", cards)
+            content += _pagination(params, page, total)
+        elif any(params.values()):
+            content += '<p class="muted">Nema rezultata za zadane kriterije.</p>'
+        return _layout("Pretraživanje", "/search", stats, content)
+
+    return _page(_headers(etag), if_none_match, etag, lambda: fragments.get_or_render(key, render_content))
+
+
+@router.get("/statistics", response_class=HTMLResponse)
+def dashboard_statistics(
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Statistics page - charts are drawn in the browser from /api/dataset"""
+    version = _dataset_version(db)
+    etag = f'"statistics-{_tag(version)}"'
+
+    def render_content() -> str:
+        stats = _statistics(db, version)
+        content = (
+            "<h2>Statistika</h2>" + _metrics(stats)
+            + '<div id="charts" data-source="/api/dataset"><p class="muted">Učitavanje...</p></div>'
+        )
+        scripts = '<script src="/dashboard/static/dashboard.js" defer></script>'
+        return _layout("Statistika", "/statistics", stats, content, scripts)
+
+    return _page(
+        _headers(etag), if_none_match, etag,
+        lambda: fragments.get_or_render(("statistics", _tag(version)), render_content)
+    )
+
+
+@router.get("/static/{name}")
+def dashboard_static(name: str):
+    """Dashboard CSS/JS"""
+    path = STATIC_FILES.get(name)
+    if path is None or not os.path.exists(path):
+        return Response(status_code=404)
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=3600"})
+
+
+def _options(values, selected: str) -> str:
+    options = ['<option value="">Sve</option>']
+    for value in values:
+        attr = " selected" if value == selected else ""
+        options.append(f'<option value="{html.escape(value)}"{attr}>{html.escape(value)}</option>')
+    return "".join(options)
+
+
+def _search_form(params: Dict[str, str]) -> str:
+    return (
+        '<form class="dashboard-form" method="get" action="/dashboard/search">'
+        f'<input type="text" name="q" value="{html.escape(params["q"])}" '
+        'placeholder="npr. inovacije, AI, istraživanje">'
+        f'<select name="kategorija">{_options(KATEGORIJE, params["kategorija"])}</select>'
+        f'<select name="podrucje">{_options(PODRUCJA, params["podrucje"])}</select>'
+        '<button type="submit">Pretraži</button>'
+        '</form>'
+    )
+
+
+def _pagination(params: Dict[str, str], page: int, total: int) -> str:
+    page_count = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    if page_count <= 1:
+        return ""
+
+    def link(target: int, label: str) -> str:
+        query = urlencode({**{k: v for k, v in params.items() if v}, "page": target})
+        return f'<a href="/dashboard/search?{html.escape(query)}">{label}</a>'
+
+    previous = link(page - 1, "← Prethodna") if page > 1 else "<span></span>"
+    following = link(page + 1, "Sljedeća →") if page < page_count else "<span></span>"
+    return (
+        f'<div class="dashboard-pagination">{previous}'
+        f'<span>Stranica {page} / {page_count}</span>{following}</div>'
+    )
@@ -1,25 +1,64 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Header, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from loguru import logger
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
+import time
 import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.database.database import get_db, init_db
+from src.database.database import get_db, init_db, missing_tables
 from src.database import crud
 from src.database.models import Natjecaj, Izdavatelj, AISazetek
 from pydantic import BaseModel
-from src.llm.llm_service import LLMService
-from src.scrapers.scraper_manager import ScraperManager
+from src.llm.llm_service import llm_available
+from src.api import dashboard, metrics, tracing
+from src.api.services import services
+from config.settings import settings
+from src.utils.tracing import configure_logging
+
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check the database schema and run the scheduler while the worker is up"""
+    # Creating the schema is a migration step (python src/database/database.py), not a per-worker one
+    if settings.db_auto_migrate:
+        init_db()
+    else:
+        missing = missing_tables()
+        if missing:
+            logger.warning(f"Database tables missing: {', '.join(missing)} - run `python src/database/database.py`")
+    if settings.scheduler_enabled:
+        # Every worker runs the loop; the scheduler lock lets only one of them start scrapes
+        services.scrape_scheduler.start()
+    if settings.metrics_enabled and metrics.shared_metrics is not None:
+        metrics.shared_metrics.start()
+    yield
+    if services.is_created("scrape_scheduler"):
+        # Stop the scrape scheduler and release its lock
+        services.scrape_scheduler.stop()
+    if services.is_created("scraper_manager"):
+        services.scraper_manager.close()
+    if settings.metrics_enabled and metrics.shared_metrics is not None:
+        metrics.shared_metrics.stop()
+
 
 # Initialize FastAPI
 app = FastAPI(
     title="FIDIT AI Assistant API",
     description="API for managing scientific funding opportunities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,11 +68,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Request-ID"],
 )
 
-# Initialize services
-llm_service = LLMService()
-scraper_manager = ScraperManager()
+if settings.dashboard_enabled:
+    app.include_router(dashboard.router)
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if settings.tracing_enabled:
+    app.add_middleware(tracing.RequestTracingMiddleware)
 
 
 # ==================== PYDANTIC SCHEMAS ====================
@@ -63,13 +109,6 @@ class StatisticsResponse(BaseModel):
 
 # ==================== API ENDPOINTS ====================
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    init_db()
-    print("Database initialized")
-
-
 @app.get("/")
 def read_root():
     """Root endpoint"""
@@ -108,6 +147,95 @@ def get_natjecaji(
     return result
 
 
+@app.get("/api/duplicates")
+def get_duplicates(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    """Get natječaji linked as duplicates of a canonical record"""
+    links = crud.get_duplicate_links(db, skip=skip, limit=limit)
+    return [
+        {
+            "natjecaj_id": link.natjecaj_id,
+            "canonical_id": link.canonical_id,
+            "similarity": link.similarity,
+            "method": link.method
+        }
+        for link in links
+    ]
+
+
+@app.get("/api/natjecaji/{natjecaj_id}/duplicates")
+def get_natjecaj_duplicates(natjecaj_id: int, db: Session = Depends(get_db)):
+    """Get the canonical record and duplicates of a natječaj"""
+    if not crud.get_natjecaj_by_id(db, natjecaj_id):
+        raise HTTPException(status_code=404, detail="Natječaj not found")
+    return crud.get_duplicates_of(db, natjecaj_id)
+
+
+@app.get("/api/changes")
+def get_changes(
+    since: int = Query(0, ge=0, description="Return events with id greater than this cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    event_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Feed of natjecaj change events detected by scraping.
+    
+    Consumers keep `next_since` and pass it back as `since` to receive only
+    new events.
+    """
+    events = crud.get_change_events(db, since=since, limit=limit, event_type=event_type)
+    return {
+        "events": [
+            {
+                "id": event.id,
+                "natjecaj_id": event.natjecaj_id,
+                "izvor": event.izvor,
+                "event_type": event.event_type,
+                "changes": json.loads(event.changes) if event.changes else {},
+                "content_hash": event.content_hash,
+                "created_at": event.created_at
+            }
+            for event in events
+        ],
+        "next_since": events[-1].id if events else since,
+        "has_more": len(events) == limit
+    }
+
+
+@app.get("/api/dataset")
+def get_dataset(
+    response: Response,
+    since: Optional[datetime] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Versioned dataset snapshot for client-side caching.
+    
+    Returns 304 when If-None-Match matches the current version (checked with
+    one query; statistics are only computed for a 200). With `since` (the
+    watermark of a previous snapshot) only changed rows are returned and the
+    ETag includes the watermark; `ids` lists all current IDs so clients can
+    drop deleted rows.
+    """
+    version = crud.get_dataset_version(db)
+    etag = crud.dataset_etag(version["version"], since)
+    
+    if if_none_match and if_none_match.strip() == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return {
+        "version": version["version"],
+        "watermark": version["watermark"],
+        "full": since is None,
+        "statistics": crud.get_statistics(db),
+        "columns": crud.DATASET_COLUMNS,
+        "rows": crud.get_dataset_rows(db, since=since),
+        "ids": crud.get_all_natjecaj_ids(db),
+    }
+
+
 @app.get("/api/natjecaji/{natjecaj_id}")
 def get_natjecaj(natjecaj_id: int, db: Session = Depends(get_db)):
     """Get single natjecaj by ID"""
@@ -131,22 +259,27 @@ def get_expiring_soon(days: int = 30, db: Session = Depends(get_db)):
 
 @app.get("/api/search")
 def search_natjecaji(
+    response: Response,
     q: Optional[str] = None,
     kategorija: Optional[str] = None,
     podrucje: Optional[str] = None,
     min_iznos: Optional[float] = None,
     max_iznos: Optional[float] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    """Advanced search for natječaji"""
-    results = crud.search_natjecaji(
-        db,
+    """Advanced search for natječaji (paginate with skip/limit, total in X-Total-Count)"""
+    filters = dict(
         search_term=q,
         kategorija=kategorija,
         podrucje=podrucje,
         min_iznos=min_iznos,
         max_iznos=max_iznos
     )
+    results = crud.search_natjecaji(db, skip=skip, limit=limit, **filters)
+    if limit is not None:
+        response.headers["X-Total-Count"] = str(crud.count_search_natjecaji(db, **filters))
     return results
 
 
@@ -184,6 +317,7 @@ def generate_summary(natjecaj_id: int, db: Session = Depends(get_db)):
     
     # Generate new summary
     natjecaj_data = {
+        'id': natjecaj.id,
         'naziv': natjecaj.naziv,
         'opis': natjecaj.opis,
         'kategorija': natjecaj.kategorija,
@@ -192,7 +326,7 @@ def generate_summary(natjecaj_id: int, db: Session = Depends(get_db)):
         'rok_prijave': natjecaj.rok_prijave
     }
     
-    summary_data = llm_service.generate_summary(natjecaj_data)
+    summary_data = services.llm_service.generate_summary(natjecaj_data)
     
     if summary_data:
         # Save to database
@@ -201,6 +335,7 @@ def generate_summary(natjecaj_id: int, db: Session = Depends(get_db)):
             natjecaj_id=natjecaj_id,
             **summary_data
         )
+        crud.complete_summary_jobs_for_natjecaj(db, natjecaj_id)
         
         return {
             "message": "Summary generated successfully",
@@ -211,11 +346,41 @@ def generate_summary(natjecaj_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Failed to generate summary")
 
 
+@app.get("/api/summaries/queue")
+def get_summary_queue(db: Session = Depends(get_db)):
+    """Get AI summary pre-generation queue status"""
+    return crud.get_summary_queue_statistics(db)
+
+
+@app.get("/api/llm/metrics")
+def get_llm_metrics(days: int = Query(7, ge=1, le=365), db: Session = Depends(get_db)):
+    """Get LLM latency percentiles, daily token totals and estimated cost"""
+    return crud.get_llm_metrics(db, days=days)
+
+
 @app.post("/api/scrape")
-def trigger_scraping(source: Optional[str] = None):
-    """Trigger web scraping manually"""
+def trigger_scraping(source: Optional[str] = None, background: bool = False):
+    """
+    Trigger web scraping manually.
+    
+    With background=true all scrapers run in a background thread and the call
+    returns immediately; follow the run through /api/scrape/progress.
+    """
+    scraper_manager = services.scraper_manager
     try:
-        if source:
+        if background and not source:
+            try:
+                run_id = scraper_manager.start_background_run()
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            return {
+                "message": "Scraping started",
+                "run_id": run_id,
+                "progress": scraper_manager.progress.snapshot()
+            }
+        elif scraper_manager.progress.is_running():
+            raise HTTPException(status_code=409, detail="Scraping is already running")
+        elif source:
             # Run single scraper
             results = scraper_manager.run_single_scraper(source)
             return {
@@ -229,10 +394,69 @@ def trigger_scraping(source: Optional[str] = None):
                 "message": "Scraping completed for all sources",
                 "statistics": stats
             }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/scrape/sources")
+def get_scrape_sources():
+    """List configured data sources with their concurrency, rate limit and schedule"""
+    registry = services.scraper_manager.registry
+    return [
+        {**spec.to_dict(), "loaded": registry.is_loaded(spec.name)}
+        for spec in registry.specs.values()
+    ]
+
+
+@app.get("/api/scrape/schedule")
+def get_scrape_schedule():
+    """Next planned run and adaptive interval of every source"""
+    return services.scrape_scheduler.status()
+
+
+@app.get("/api/scrape/progress")
+def get_scrape_progress():
+    """Get per-source progress of the current (or last) scraping run"""
+    return services.scraper_manager.progress.snapshot()
+
+
+async def _scrape_progress_events(heartbeat_seconds: float = 15.0, poll_seconds: float = 0.5):
+    """
+    Server-sent events with a progress snapshot on every change, until the run ends.
+
+    Waits with asyncio.sleep between polls, so an open stream does not hold
+    a threadpool thread for the whole run; only the snapshot itself (a DB
+    read when another worker runs the scrape) borrows one briefly.
+    """
+    progress = services.scraper_manager.progress
+    version = -1
+    last_event = time.monotonic()
+    while True:
+        snapshot = await run_in_threadpool(progress.snapshot)
+        if snapshot["version"] != version:
+            version = snapshot["version"]
+            last_event = time.monotonic()
+            yield f"id: {version}\nevent: progress\ndata: {json.dumps(snapshot)}\n\n"
+            if snapshot["state"] != "running":
+                break
+        elif time.monotonic() - last_event >= heartbeat_seconds:
+            last_event = time.monotonic()
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(poll_seconds)
+
+
+@app.get("/api/scrape/progress/stream")
+def stream_scrape_progress():
+    """Stream scraping progress as server-sent events (text/event-stream)"""
+    return StreamingResponse(
+        _scrape_progress_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/izdavatelji")
 def get_izdavatelji(db: Session = Depends(get_db)):
     """Get all izdavatelji"""
@@ -253,7 +477,7 @@ def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "services": {
             "database": "operational",
-            "llm": "operational" if llm_service.enabled else "disabled",
+            "llm": "operational" if llm_available() else "disabled",
             "scrapers": "operational"
         }
     }
@@ -261,11 +485,12 @@ def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    from config.settings import settings
     
+    # Several workers need the app as an import string; reload is for development only
     uvicorn.run(
-        "main:app",
+        "src.api.main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.api_reload
+        workers=settings.api_workers,
+        reload=settings.api_reload and settings.api_workers == 1
     )
@@ -0,0 +1,138 @@
+from typing import Optional
+from loguru import logger
+import json
+import socket
+import threading
+import time
+import sys
+import os
+
+from fastapi import APIRouter, Response
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.settings import settings
+from src.database.database import get_db_session
+from src.database import crud
+from src.utils.metrics import HTTP_REQUEST_DURATION, export_metrics, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template.
+
+    The route is read from the scope after routing ("/api/natjecaji/{natjecaj_id}",
+    not the concrete path) so label cardinality stays bounded; unmatched
+    paths are grouped as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status)
+            )
+
+
+class SharedMetrics:
+    """
+    Metrics of all API workers, summed through the database.
+
+    Prometheus reaches a random worker on every scrape, so per-process
+    values would jump backwards. Each worker publishes its export_metrics()
+    to metrics_snapshots every `publish_interval` seconds and right before
+    answering /metrics; the answer sums the snapshots of all workers that
+    published within `worker_ttl` seconds, so every worker returns the same
+    totals. A stopped worker deletes its snapshot, and snapshots of workers
+    that died without stopping are deleted once older than `worker_ttl` -
+    the totals then drop, which Prometheus treats as a counter reset.
+    """
+
+    def __init__(self, publish_interval: float, worker_ttl: float):
+        self.publish_interval = publish_interval
+        self.worker_ttl = worker_ttl
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def worker_id() -> str:
+        return f"{socket.gethostname()}-{os.getpid()}"
+
+    def publish(self):
+        with get_db_session() as db:
+            crud.save_metrics_snapshot(db, self.worker_id(), json.dumps(export_metrics()))
+            crud.delete_expired_metrics_snapshots(db, self.worker_ttl)
+
+    def render(self) -> str:
+        try:
+            self.publish()
+            with get_db_session() as db:
+                exports = [json.loads(snapshot) for snapshot in crud.get_metrics_snapshots(db, self.worker_ttl)]
+        except Exception as e:
+            logger.warning(f"Could not merge metrics of API workers: {e}")
+            return render_metrics()
+        return render_metrics(exports)
+
+    def start(self):
+        """Publish this worker's metrics periodically until stop()"""
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="metrics-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop publishing and remove this worker's snapshot from the totals"""
+        if self._stop is None:
+            return
+        self._stop.set()
+        # A publish in progress would otherwise write the snapshot back
+        self._thread.join()
+        self._stop = self._thread = None
+        try:
+            with get_db_session() as db:
+                crud.delete_metrics_snapshot(db, self.worker_id())
+        except Exception as e:
+            logger.warning(f"Could not remove worker metrics: {e}")
+
+    def _run(self, stop: threading.Event):
+        while not stop.wait(self.publish_interval):
+            try:
+                self.publish()
+            except Exception as e:
+                logger.warning(f"Could not publish worker metrics: {e}")
+
+
+# Only several workers need merging - a single worker answers from its own registry
+shared_metrics = SharedMetrics(
+    settings.metrics_publish_seconds,
+    settings.metrics_worker_ttl_seconds
+) if settings.api_workers > 1 else None
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    body = shared_metrics.render() if shared_metrics is not None else render_metrics()
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,70 @@
+from typing import Callable, Dict
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _create_llm_service(container):
+    from src.llm.llm_service import LLMService
+    return LLMService()
+
+
+def _create_scraper_manager(container):
+    from src.scrapers.progress import SharedScrapeProgress
+    from src.scrapers.scraper_manager import ScraperManager
+    return ScraperManager(progress=SharedScrapeProgress())
+
+
+def _create_scrape_scheduler(container):
+    from src.scrapers.scheduler import ScrapeScheduler
+    return ScrapeScheduler(container.scraper_manager)
+
+
+class ServiceContainer:
+    """
+    Application services, created (and their modules imported) on first use.
+
+    Importing the API only loads what every request needs; the LLM client,
+    scraper manager and scheduler - with openai, numpy, requests and bs4
+    behind them - are built by the first endpoint that uses them.
+    """
+
+    FACTORIES: Dict[str, Callable] = {
+        "llm_service": _create_llm_service,
+        "scraper_manager": _create_scraper_manager,
+        "scrape_scheduler": _create_scrape_scheduler,
+    }
+
+    def __init__(self):
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str):
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self.FACTORIES[name](self)
+                    self._instances[name] = instance
+        return instance
+
+    def is_created(self, name: str) -> bool:
+        return name in self._instances
+
+    @property
+    def llm_service(self):
+        return self.get("llm_service")
+
+    @property
+    def scraper_manager(self):
+        return self.get("scraper_manager")
+
+    @property
+    def scrape_scheduler(self):
+        return self.get("scrape_scheduler")
+
+
+services = ServiceContainer()
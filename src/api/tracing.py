@@ -0,0 +1,53 @@
+import re
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.tracing import span
+
+REQUEST_ID_HEADER = b"x-request-id"
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestTracingMiddleware:
+    """
+    ASGI middleware running every request as the root span of a trace.
+
+    The trace id is the request id: taken from an incoming X-Request-ID
+    header when it looks sane, otherwise generated, and returned in the
+    X-Request-ID response header. crud calls and SQL statements made while
+    handling the request become its child spans.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_RE.match(candidate):
+                    request_id = candidate
+                break
+
+        with span("http.request", trace_id=request_id, method=scope["method"], path=scope["path"]) as request_span:
+            async def send_with_request_id(message):
+                if message["type"] == "http.response.start":
+                    request_span.set(status=message["status"])
+                    headers = list(message.get("headers", ()))
+                    headers.append((REQUEST_ID_HEADER, request_span.trace_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    request_span.set(route=route.path)
@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func, select
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime, timedelta
+import hashlib
+import math
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.database.models import Natjecaj, Izdavatelj, AISazetek, ScrapingLog
+from src.database.models import Natjecaj, Izdavatelj, AISazetek, ScrapingLog, SummaryQueueItem, LLMCallLog, ChangeEvent, DuplicateLink, SchedulerLock, ScrapeRun, CacheEntry, MetricsSnapshot
+from src.utils.tracing import trace_functions
 
 
 # ==================== IZDAVATELJI ====================
@@ -85,7 +89,7 @@ def get_expiring_soon_natjecaji(db: Session, days: int = 30) -> List[Natjecaj]:
     ).order_by(Natjecaj.rok_prijave).all()
 
 
-def search_natjecaji(
+def _search_query(
     db: Session,
     search_term: str = None,
     kategorija: str = None,
@@ -95,8 +99,8 @@ def search_natjecaji(
     max_iznos: float = None,
     rok_od: datetime = None,
     rok_do: datetime = None
-) -> List[Natjecaj]:
-    """Advanced search for natjecaji"""
+):
+    """Build filtered natjecaj query shared by search and its count"""
     query = db.query(Natjecaj)
     
     if search_term:
@@ -128,7 +132,36 @@ def search_natjecaji(
     if rok_do:
         query = query.filter(Natjecaj.rok_prijave <= rok_do)
     
-    return query.order_by(desc(Natjecaj.rok_prijave)).all()
+    return query
+
+
+def search_natjecaji(
+    db: Session,
+    search_term: str = None,
+    kategorija: str = None,
+    podrucje: str = None,
+    izdavatelj_id: int = None,
+    min_iznos: float = None,
+    max_iznos: float = None,
+    rok_od: datetime = None,
+    rok_do: datetime = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> List[Natjecaj]:
+    """Advanced search for natjecaji"""
+    query = _search_query(
+        db, search_term, kategorija, podrucje, izdavatelj_id,
+        min_iznos, max_iznos, rok_od, rok_do
+    )
+    query = query.order_by(desc(Natjecaj.rok_prijave), desc(Natjecaj.id)).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def count_search_natjecaji(db: Session, **filters) -> int:
+    """Count natjecaji matching search filters (same filters as search_natjecaji)"""
+    return _search_query(db, **filters).order_by(None).count()
 
 
 def update_natjecaj(db: Session, natjecaj_id: int, **kwargs) -> Optional[Natjecaj]:
@@ -169,6 +202,171 @@ def get_ai_sazetek_by_natjecaj(db: Session, natjecaj_id: int) -> Optional[AISaze
     return db.query(AISazetek).filter(AISazetek.natjecaj_id == natjecaj_id).first()
 
 
+def upsert_ai_sazetek(db: Session, natjecaj_id: int, sazetek: str, **kwargs) -> AISazetek:
+    """Create AI summary or replace the existing one for natjecaj"""
+    ai_sazetek = get_ai_sazetek_by_natjecaj(db, natjecaj_id)
+    if not ai_sazetek:
+        return create_ai_sazetek(db, natjecaj_id=natjecaj_id, sazetek=sazetek, **kwargs)
+    
+    ai_sazetek.sazetek = sazetek
+    for key, value in kwargs.items():
+        setattr(ai_sazetek, key, value)
+    ai_sazetek.created_at = datetime.utcnow()
+    db.commit()
+    db.refresh(ai_sazetek)
+    return ai_sazetek
+
+
+# ==================== RED ČEKANJA SAŽETAKA ====================
+
+def enqueue_summaries(db: Session, natjecaj_ids: List[int]) -> int:
+    """Queue natjecaji for summary (re)generation, returns number of queued jobs"""
+    if not natjecaj_ids:
+        return 0
+    
+    ids = set(natjecaj_ids)
+    existing = {
+        item.natjecaj_id: item
+        for item in db.query(SummaryQueueItem).filter(SummaryQueueItem.natjecaj_id.in_(ids)).all()
+    }
+    
+    for natjecaj_id in ids:
+        item = existing.get(natjecaj_id)
+        if item is None:
+            db.add(SummaryQueueItem(natjecaj_id=natjecaj_id, status="pending"))
+        elif item.status != "leased":
+            # Leased jobs are left alone - the worker already holds them
+            item.status = "pending"
+            item.attempts = 0
+            item.error_message = None
+    
+    db.commit()
+    return len(ids)
+
+
+def lease_summary_jobs(db: Session, worker_id: str, limit: int = 10, lease_seconds: int = 300) -> List[SummaryQueueItem]:
+    """Lease pending (or expired) summary jobs for a worker"""
+    now = datetime.utcnow()
+    jobs = db.query(SummaryQueueItem).filter(
+        or_(
+            SummaryQueueItem.status == "pending",
+            and_(
+                SummaryQueueItem.status == "leased",
+                SummaryQueueItem.lease_expires_at < now
+            )
+        )
+    ).order_by(SummaryQueueItem.created_at).limit(limit).with_for_update(skip_locked=True).all()
+    
+    for job in jobs:
+        job.status = "leased"
+        job.leased_by = worker_id
+        job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+        job.attempts = (job.attempts or 0) + 1
+    
+    db.commit()
+    return jobs
+
+
+def ack_summary_job(db: Session, job_id: int) -> None:
+    """Mark leased summary job as done"""
+    job = db.query(SummaryQueueItem).filter(SummaryQueueItem.id == job_id).first()
+    if job:
+        job.status = "done"
+        job.leased_by = None
+        job.lease_expires_at = None
+        job.error_message = None
+        db.commit()
+
+
+def fail_summary_job(db: Session, job_id: int, error_message: str, max_attempts: int = 3) -> None:
+    """Release failed summary job for retry, or mark it failed after max_attempts"""
+    job = db.query(SummaryQueueItem).filter(SummaryQueueItem.id == job_id).first()
+    if job:
+        job.status = "failed" if (job.attempts or 0) >= max_attempts else "pending"
+        job.leased_by = None
+        job.lease_expires_at = None
+        job.error_message = error_message
+        db.commit()
+
+
+def complete_summary_jobs_for_natjecaj(db: Session, natjecaj_id: int) -> None:
+    """Mark queued job done when summary was generated outside the worker"""
+    db.query(SummaryQueueItem).filter(
+        SummaryQueueItem.natjecaj_id == natjecaj_id,
+        SummaryQueueItem.status != "leased"
+    ).update({"status": "done"}, synchronize_session=False)
+    db.commit()
+
+
+def get_summary_queue_statistics(db: Session) -> dict:
+    """Get number of summary jobs per status"""
+    rows = db.query(SummaryQueueItem.status, func.count(SummaryQueueItem.id)).group_by(SummaryQueueItem.status).all()
+    stats = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+    stats.update({status: count for status, count in rows})
+    return stats
+
+
+# ==================== PROMJENE NATJEČAJA ====================
+
+def create_change_events(db: Session, events: List[dict]) -> int:
+    """Store change events detected by scraping"""
+    db.add_all([ChangeEvent(**event) for event in events])
+    db.commit()
+    return len(events)
+
+
+def get_change_events(
+    db: Session,
+    since: int = 0,
+    limit: int = 100,
+    event_type: str = None
+) -> List[ChangeEvent]:
+    """Get change events with id greater than `since` (cursor), oldest first"""
+    query = db.query(ChangeEvent).filter(ChangeEvent.id > since)
+    if event_type:
+        query = query.filter(ChangeEvent.event_type == event_type)
+    return query.order_by(ChangeEvent.id).limit(limit).all()
+
+
+# ==================== DUPLIKATI ====================
+
+def get_dedup_records(db: Session) -> List[dict]:
+    """Get id, naziv and izdavatelj of all natjecaji for the dedup engine"""
+    rows = db.query(Natjecaj.id, Natjecaj.naziv, Natjecaj.izdavatelj_id).all()
+    return [{"id": row[0], "naziv": row[1], "izdavatelj_id": row[2]} for row in rows]
+
+
+def replace_duplicate_links(db: Session, links: List[dict]) -> int:
+    """Replace all duplicate links with a freshly computed set"""
+    db.query(DuplicateLink).delete()
+    db.add_all([DuplicateLink(**link) for link in links])
+    db.commit()
+    return len(links)
+
+
+def get_duplicate_links(db: Session, skip: int = 0, limit: int = 100) -> List[DuplicateLink]:
+    """Get duplicate links grouped by canonical record"""
+    return db.query(DuplicateLink).order_by(
+        DuplicateLink.canonical_id, DuplicateLink.natjecaj_id
+    ).offset(skip).limit(limit).all()
+
+
+def get_duplicates_of(db: Session, natjecaj_id: int) -> dict:
+    """Get canonical id and all duplicate ids of the group a natjecaj belongs to"""
+    link = db.query(DuplicateLink).filter(DuplicateLink.natjecaj_id == natjecaj_id).first()
+    canonical_id = link.canonical_id if link else natjecaj_id
+    duplicates = db.query(DuplicateLink).filter(
+        DuplicateLink.canonical_id == canonical_id
+    ).order_by(DuplicateLink.natjecaj_id).all()
+    return {
+        "canonical_id": canonical_id,
+        "duplicates": [
+            {"natjecaj_id": d.natjecaj_id, "similarity": d.similarity, "method": d.method}
+            for d in duplicates
+        ]
+    }
+
+
 # ==================== SCRAPING LOGS ====================
 
 def create_scraping_log(db: Session, **kwargs) -> ScrapingLog:
@@ -180,9 +378,313 @@ def create_scraping_log(db: Session, **kwargs) -> ScrapingLog:
     return log
 
 
-def get_recent_scraping_logs(db: Session, limit: int = 10) -> List[ScrapingLog]:
-    """Get recent scraping logs"""
-    return db.query(ScrapingLog).order_by(desc(ScrapingLog.created_at)).limit(limit).all()
+def get_recent_scraping_logs(db: Session, limit: int = 10, izvor: Optional[str] = None) -> List[ScrapingLog]:
+    """Get recent scraping logs, optionally for one source"""
+    query = db.query(ScrapingLog)
+    if izvor:
+        query = query.filter(ScrapingLog.izvor == izvor)
+    return query.order_by(desc(ScrapingLog.created_at), desc(ScrapingLog.id)).limit(limit).all()
+
+
+def get_nearest_deadline(db: Session, izdavatelj_naziv: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Earliest upcoming rok_prijave of the active natjecaji of an izdavatelj"""
+    now = now or datetime.utcnow()
+    return db.query(func.min(Natjecaj.rok_prijave)).join(Izdavatelj).filter(
+        Izdavatelj.naziv == izdavatelj_naziv,
+        Natjecaj.status == "active",
+        Natjecaj.rok_prijave >= now
+    ).scalar()
+
+
+# ==================== SCHEDULER LOCK ====================
+
+def acquire_scheduler_lock(db: Session, name: str, holder: str, ttl_seconds: float) -> bool:
+    """
+    Take or renew a named lock row.
+
+    Succeeds if the lock is free, expired or already held by `holder`. The
+    conditional UPDATE is atomic, so only one replica can win an expired lock.
+    """
+    now = datetime.utcnow()
+    values = {"holder": holder, "expires_at": now + timedelta(seconds=ttl_seconds), "updated_at": now}
+    updated = db.query(SchedulerLock).filter(
+        SchedulerLock.name == name,
+        or_(SchedulerLock.holder == holder, SchedulerLock.holder.is_(None), SchedulerLock.expires_at < now)
+    ).update(values, synchronize_session=False)
+    if updated:
+        db.commit()
+        return True
+
+    if db.query(SchedulerLock.name).filter(SchedulerLock.name == name).first():
+        db.rollback()
+        return False
+
+    try:
+        db.add(SchedulerLock(name=name, **values))
+        db.commit()
+        return True
+    except IntegrityError:
+        # Another replica created the row first
+        db.rollback()
+        return False
+
+
+def release_scheduler_lock(db: Session, name: str, holder: str) -> bool:
+    """Release a lock held by `holder`"""
+    released = db.query(SchedulerLock).filter(
+        SchedulerLock.name == name,
+        SchedulerLock.holder == holder
+    ).update({"holder": None, "expires_at": None}, synchronize_session=False)
+    db.commit()
+    return bool(released)
+
+
+def get_scheduler_lock(db: Session, name: str) -> Optional[SchedulerLock]:
+    return db.query(SchedulerLock).filter(SchedulerLock.name == name).first()
+
+
+# ==================== SCRAPE RUNS ====================
+
+def save_scrape_run(db: Session, snapshot: dict, snapshot_json: str):
+    """Insert or update the shared progress row of a scraping run"""
+    run = db.query(ScrapeRun).filter(ScrapeRun.run_id == snapshot["run_id"]).first()
+    if run is None:
+        run = ScrapeRun(run_id=snapshot["run_id"], started_at=datetime.fromisoformat(snapshot["started_at"]))
+        db.add(run)
+    run.state = snapshot["state"]
+    run.version = snapshot["version"]
+    run.snapshot = snapshot_json
+    run.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def get_latest_scrape_run(db: Session) -> Optional[ScrapeRun]:
+    return db.query(ScrapeRun).order_by(desc(ScrapeRun.started_at)).first()
+
+
+# ==================== DIJELJENI CACHE ====================
+
+def get_cache_entry(db: Session, key: str) -> Optional[str]:
+    """Cached value, or None if missing or expired"""
+    entry = db.query(CacheEntry.value).filter(
+        CacheEntry.key == key,
+        CacheEntry.expires_at > datetime.utcnow()
+    ).first()
+    return entry.value if entry else None
+
+
+def set_cache_entry(db: Session, key: str, value: str, ttl_seconds: float):
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+    try:
+        db.merge(CacheEntry(key=key, value=value, expires_at=expires_at))
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same key first - its value is just as good
+        db.rollback()
+
+
+def delete_expired_cache_entries(db: Session) -> int:
+    deleted = db.query(CacheEntry).filter(CacheEntry.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+# ==================== METRIKE WORKERA ====================
+
+def save_metrics_snapshot(db: Session, worker: str, snapshot_json: str):
+    """Insert or replace a worker's exported metrics"""
+    db.merge(MetricsSnapshot(worker=worker, snapshot=snapshot_json, updated_at=datetime.utcnow()))
+    db.commit()
+
+
+def get_metrics_snapshots(db: Session, max_age_seconds: float) -> List[str]:
+    """Exported metrics (JSON) of workers that published within max_age_seconds"""
+    since = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    rows = db.query(MetricsSnapshot.snapshot).filter(MetricsSnapshot.updated_at >= since).all()
+    return [row.snapshot for row in rows]
+
+
+def delete_metrics_snapshot(db: Session, worker: str):
+    db.query(MetricsSnapshot).filter(MetricsSnapshot.worker == worker).delete(synchronize_session=False)
+    db.commit()
+
+
+def delete_expired_metrics_snapshots(db: Session, max_age_seconds: float) -> int:
+    """Remove snapshots of workers that stopped publishing (crashed or killed)"""
+    since = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    deleted = db.query(MetricsSnapshot).filter(MetricsSnapshot.updated_at < since).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+# ==================== LLM TELEMETRIJA ====================
+
+def create_llm_call_log(db: Session, **kwargs) -> LLMCallLog:
+    """Create LLM call telemetry entry"""
+    log = LLMCallLog(**kwargs)
+    db.add(log)
+    db.commit()
+    return log
+
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(percent / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def get_llm_metrics(db: Session, days: int = 7) -> dict:
+    """Get LLM latency percentiles, token usage and cost for the last N days"""
+    since = datetime.utcnow() - timedelta(days=days)
+    in_period = LLMCallLog.created_at >= since
+    
+    totals = db.query(
+        func.count(LLMCallLog.id),
+        func.coalesce(func.sum(LLMCallLog.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.completion_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.total_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.retries), 0),
+        func.coalesce(func.sum(LLMCallLog.estimated_cost), 0.0),
+    ).filter(in_period).one()
+    
+    by_status = dict(
+        db.query(LLMCallLog.status, func.count(LLMCallLog.id))
+        .filter(in_period)
+        .group_by(LLMCallLog.status)
+        .all()
+    )
+    
+    by_model = dict(
+        db.query(LLMCallLog.model, func.count(LLMCallLog.id))
+        .filter(in_period)
+        .group_by(LLMCallLog.model)
+        .all()
+    )
+    
+    # Latency of real LLM calls only - local fallbacks would skew the percentiles
+    latencies = sorted(
+        row[0] for row in db.query(LLMCallLog.latency).filter(
+            in_period,
+            LLMCallLog.fallback == False,  # noqa: E712
+            LLMCallLog.latency.isnot(None)
+        ).all()
+    )
+    
+    day = func.date(LLMCallLog.created_at)
+    daily = db.query(
+        day,
+        func.count(LLMCallLog.id),
+        func.coalesce(func.sum(LLMCallLog.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.completion_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.total_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.estimated_cost), 0.0),
+    ).filter(in_period).group_by(day).order_by(day).all()
+    
+    def to_ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+    
+    return {
+        "period_days": days,
+        "calls": totals[0],
+        "successful": by_status.get("success", 0),
+        "failed": by_status.get("failed", 0),
+        "fallbacks": by_status.get("fallback", 0),
+        "retries": totals[4],
+        "latency_ms": {
+            "p50": to_ms(_percentile(latencies, 50)),
+            "p95": to_ms(_percentile(latencies, 95)),
+            "p99": to_ms(_percentile(latencies, 99)),
+            "avg": to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        },
+        "tokens": {
+            "prompt": totals[1],
+            "completion": totals[2],
+            "total": totals[3],
+        },
+        "estimated_cost_usd": round(totals[5], 4),
+        "models": by_model,
+        "daily": [
+            {
+                "date": str(row[0]),
+                "calls": row[1],
+                "prompt_tokens": row[2],
+                "completion_tokens": row[3],
+                "total_tokens": row[4],
+                "estimated_cost_usd": round(row[5], 4),
+            }
+            for row in daily
+        ],
+    }
+
+
+# ==================== DATASET SNAPSHOT ====================
+
+DATASET_COLUMNS = [
+    "id", "naziv", "izdavatelj_naziv", "kategorija", "podrucje_istrazivanja",
+    "iznos_financiranja", "rok_prijave", "url", "status", "updated_at"
+]
+
+
+def get_dataset_version(db: Session) -> dict:
+    """
+    Get dataset version in one query (no statistics - revalidation stays cheap).
+
+    Changes whenever a natjecaj is added, deleted or updated, an izdavatelj is
+    added, deleted or renamed, or an AI summary is added, deleted or replaced
+    (upsert_ai_sazetek resets created_at).
+    """
+    values = db.query(
+        func.count(Natjecaj.id),
+        func.max(Natjecaj.id),
+        func.max(Natjecaj.updated_at),
+        select(func.count(Izdavatelj.id)).scalar_subquery(),
+        select(func.max(Izdavatelj.updated_at)).scalar_subquery(),
+        select(func.count(AISazetek.id)).scalar_subquery(),
+        select(func.max(AISazetek.id)).scalar_subquery(),
+        select(func.max(AISazetek.created_at)).scalar_subquery(),
+    ).one()
+    
+    fingerprint = "|".join(str(v) for v in values)
+    return {
+        "version": hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16],
+        "watermark": values[2],
+    }
+
+
+def dataset_etag(version: str, since: Optional[datetime] = None) -> str:
+    """ETag of a dataset response - full snapshots and deltas since a watermark differ"""
+    if since is None:
+        return f'"{version}"'
+    return f'"{version}-{since.isoformat()}"'
+
+
+def get_dataset_rows(db: Session, since: datetime = None) -> List[list]:
+    """Get natjecaji as compact rows (DATASET_COLUMNS order), optionally only rows changed since a watermark"""
+    query = db.query(
+        Natjecaj.id,
+        Natjecaj.naziv,
+        Izdavatelj.naziv,
+        Natjecaj.kategorija,
+        Natjecaj.podrucje_istrazivanja,
+        Natjecaj.iznos_financiranja,
+        Natjecaj.rok_prijave,
+        Natjecaj.url,
+        Natjecaj.status,
+        Natjecaj.updated_at
+    ).outerjoin(Izdavatelj, Natjecaj.izdavatelj_id == Izdavatelj.id)
+    
+    if since:
+        # >= so rows written in the same instant as the watermark are not missed
+        query = query.filter(Natjecaj.updated_at >= since)
+    
+    return [list(row) for row in query.order_by(Natjecaj.id).all()]
+
+
+def get_all_natjecaj_ids(db: Session) -> List[int]:
+    """Get IDs of all natjecaji"""
+    return [row[0] for row in db.query(Natjecaj.id).order_by(Natjecaj.id).all()]
 
 
 # ==================== STATISTIKE ====================
@@ -195,3 +697,7 @@ def get_statistics(db: Session) -> dict:
         "total_izdavatelji": db.query(Izdavatelj).count(),
         "total_ai_sazetci": db.query(AISazetek).count(),
     }
+
+
+# Every crud call made within a request or scrape run is recorded as a child span
+trace_functions(globals(), "crud")
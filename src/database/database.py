@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from loguru import logger
 from contextlib import contextmanager
+from typing import List
 import os
 import sys
 
@@ -10,6 +12,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from config.settings import settings
 from src.database.models import Base
+from src.utils.metrics import instrument_engine
+from src.utils.tracing import trace_engine
+
+
+def pool_size() -> int:
+    """
+    Pooled connections per process. Every API worker has its own pool, so
+    DB_MAX_CONNECTIONS is split between workers (pool + overflow each).
+    """
+    if settings.db_pool_size > 0:
+        return settings.db_pool_size
+    per_worker = settings.db_max_connections // max(1, settings.api_workers)
+    return max(1, per_worker - settings.db_max_overflow)
 
 
 # Create engine
@@ -20,20 +35,41 @@ if settings.database_url.startswith("sqlite"):
         poolclass=StaticPool
     )
 else:
-    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    engine = create_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        pool_size=pool_size(),
+        max_overflow=settings.db_max_overflow
+    )
+
+if settings.metrics_enabled:
+    instrument_engine(engine)
+if settings.tracing_enabled:
+    trace_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def init_db():
-    """Initialize database - create all tables"""
+    """
+    Initialize database - create all tables.
+
+    This is the schema migration step: run it once per deployment
+    (`python src/database/database.py`); API workers only check the schema.
+    """
     # Create data directory if it doesn't exist
     os.makedirs("data", exist_ok=True)
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
-    print("  Database initialized successfully!")
+    logger.info("Database initialized successfully")
+
+
+def missing_tables() -> List[str]:
+    """Model tables not present in the database (one catalog query)"""
+    existing = set(inspect(engine).get_table_names())
+    return sorted(name for name in Base.metadata.tables if name not in existing)
 
 
 def get_db() -> Session:
@@ -62,7 +98,7 @@ def get_db_session():
 def drop_all_tables():
     """Drop all tables - CAUTION: Use only for development"""
     Base.metadata.drop_all(bind=engine)
-    print("  All tables dropped!")
+    logger.warning("All tables dropped")
 
 
 if __name__ == "__main__":
@@ -103,3 +103,108 @@ class ScrapingLog(Base):
     error_message = Column(Text)
     execution_time = Column(Float)  # u sekundama
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SummaryQueueItem(Base):
+    """Model za red čekanja za generiranje AI sažetaka"""
+    __tablename__ = "ai_sazetci_queue"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    natjecaj_id = Column(Integer, ForeignKey("natjecaji.id"), nullable=False, unique=True, index=True)
+    status = Column(String(50), default="pending", index=True)  # "pending", "leased", "done", "failed"
+    attempts = Column(Integer, default=0)
+    
+    # Lease - job is owned by a worker until lease_expires_at
+    leased_by = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    
+    error_message = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LLMCallLog(Base):
+    """Model za telemetriju LLM poziva (tokeni, latencija, trošak)"""
+    __tablename__ = "llm_call_logs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    natjecaj_id = Column(Integer, ForeignKey("natjecaji.id"), nullable=True)
+    model = Column(String(100))
+    status = Column(String(50))  # "success", "failed", "fallback"
+    
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    latency = Column(Float)  # u sekundama
+    retries = Column(Integer, default=0)
+    fallback = Column(Boolean, default=False)
+    estimated_cost = Column(Float, default=0.0)  # u USD
+    
+    error_message = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ChangeEvent(Base):
+    """Model za promjene natječaja otkrivene scrapingom (novi, pomaknut rok, promjena iznosa, zatvoren)"""
+    __tablename__ = "natjecaj_promjene"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign key - events are kept after a natjecaj is deleted
+    natjecaj_id = Column(Integer, nullable=False, index=True)
+    izvor = Column(String(200))
+    event_type = Column(String(50), index=True)  # "created", "deadline_changed", "amount_changed", "closed", "reopened", "updated"
+    changes = Column(Text)  # JSON {"polje": {"old": ..., "new": ...}}
+    content_hash = Column(String(64))  # hash scrapanog sadržaja nakon promjene
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class DuplicateLink(Base):
+    """Model za poveznice duplikata natječaja (isti natječaj s više izvora) na kanonski zapis"""
+    __tablename__ = "natjecaj_duplikati"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    natjecaj_id = Column(Integer, nullable=False, unique=True, index=True)
+    canonical_id = Column(Integer, nullable=False, index=True)
+    similarity = Column(Float)  # Jaccard sličnost normaliziranih naslova
+    method = Column(String(50))  # "minhash", "call_code"
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SchedulerLock(Base):
+    """Model za lock retke - samo replika koja drži lock pokreće zakazani scraping"""
+    __tablename__ = "scheduler_locks"
+    
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(200))  # id replike koja trenutno drži lock
+    expires_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ScrapeRun(Base):
+    """Model za stanje scraping pokretanja - vide ga svi API workeri, ne samo onaj koji ga izvodi"""
+    __tablename__ = "scrape_runs"
+    
+    run_id = Column(String(32), primary_key=True)
+    state = Column(String(20))  # "running", "finished", "failed"
+    version = Column(Integer, default=0)
+    snapshot = Column(Text)  # JSON ScrapeProgress.snapshot()
+    started_at = Column(DateTime, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CacheEntry(Base):
+    """Model za dijeljeni cache (renderirani fragmenti dashboarda) između API workera"""
+    __tablename__ = "cache_entries"
+    
+    key = Column(String(64), primary_key=True)  # sha1 ključa
+    value = Column(Text)
+    expires_at = Column(DateTime, index=True)
+
+
+class MetricsSnapshot(Base):
+    """Model za metrike pojedinog API workera - /metrics ih zbraja za sve workere"""
+    __tablename__ = "metrics_snapshots"
+    
+    worker = Column(String(200), primary_key=True)  # hostname-pid
+    snapshot = Column(Text)  # JSON export_metrics()
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,222 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import heapq
+import math
+import re
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.llm.prompt_builder import split_sentences, drop_boilerplate, is_key_sentence
+
+
+# Matched against lowercased text
+WORD_RE = re.compile(r"[a-zčćđšž]{3,}")
+
+CROATIAN_STOPWORDS = frozenset("""
+a ako ali bi bih bila bile bili bilo bio biti bude budu će ćemo ćete ći ću da
+dakle do duž ga gdje god i iako ih ili im iz ja je jedan jedna jedno jer jesu
+još ju kada kako kao koja koje koji kojih kojima kojoj kojom koju kroz li
+me mene meni mi mu na nad nakon nam nama nas naš naša naše našeg ne nego neka
+neki nekog neko nema nije ni niti njega njegov njegova njegovo njemu
+njezin njih njihov njihova njihovo njim njima njoj nju no o od odnosno oko
+on ona one oni ono ova ove ovi ovo ovog ovim ovoj ovom ovu pa po pod pored
+prema pri prije sa sam samo se sebe sebi si smo ste su sve svi svih svoj
+svoja svoje svojim svoju što ta tada taj tako također te tebe tebi ti to
+toga tome tu tvoj u uz vam vama vas vaš već vi za zbog zato že
+and are for from has have into not of on or our that the their this to with
+will you your
+""".split())
+
+# Generic funding vocabulary - present in almost every natjecaj, useless as keywords
+DOMAIN_STOPWORDS = frozenset("""
+natječaj natječaja natječaju natječaji natječaje poziv poziva prijava prijave
+prijavu projekt projekta projekti projekata projekte sredstva sredstava
+financiranje financiranja eur godine godina dana više
+""".split())
+
+STOPWORDS = CROATIAN_STOPWORDS | DOMAIN_STOPWORDS
+
+# Term prefixes signalling relevance for FIDIT (informatics and digital technologies)
+HIGH_RELEVANCE_PREFIXES = (
+    "informati", "digital", "računal", "softver", "umjetn", "inteligencij",
+    "podatk", "podatak", "kibernet", "ict", "algorit", "robot", "mrež",
+    "programir", "software", "data", "artificial", "cyber", "comput",
+)
+MEDIUM_RELEVANCE_PREFIXES = (
+    "znanstv", "istraživ", "inovacij", "inovativ", "tehnolog", "razvoj",
+    "research", "innovation", "doktor", "postdok", "sveučiliš",
+)
+HIGH_RELEVANCE_RE = re.compile(r"\b(?:" + "|".join(HIGH_RELEVANCE_PREFIXES) + ")")
+MEDIUM_RELEVANCE_RE = re.compile(r"\b(?:" + "|".join(MEDIUM_RELEVANCE_PREFIXES) + ")")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    if not text:
+        return []
+    return [word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+class ExtractiveSummarizer:
+    """
+    CPU-only extractive summarizer (TF-IDF sentence scoring) for natječaji.
+
+    Produces the same fields as LLMService summaries so the result can be
+    stored as an AISazetek directly.
+    """
+
+    def __init__(self, max_sentences: int = 2, max_keywords: int = 5, max_summary_chars: int = 400):
+        self.max_sentences = max_sentences
+        self.max_keywords = max_keywords
+        self.max_summary_chars = max_summary_chars
+        # (idf per term, idf of unseen terms) from fit(), replaced as one tuple
+        self._idf: Tuple[Dict[str, float], float] = ({}, 1.0)
+
+    def fit(self, documents: List[str]) -> "ExtractiveSummarizer":
+        """Compute inverse document frequencies over a corpus of descriptions"""
+        doc_freq: Counter = Counter()
+        for document in documents:
+            doc_freq.update(set(tokenize(document)))
+        self._idf = self._compute_idf(doc_freq, len(documents))
+        return self
+
+    @staticmethod
+    def _compute_idf(doc_freq: Counter, n_docs: int) -> Tuple[Dict[str, float], float]:
+        n_docs = max(n_docs, 1)
+        idf = {
+            term: math.log((1 + n_docs) / (1 + freq)) + 1.0
+            for term, freq in doc_freq.items()
+        }
+        return idf, math.log(1 + n_docs) + 1.0
+
+    def summarize(self, natjecaj_data: Dict) -> Dict:
+        """Generate extractive summary, keywords and relevance for a natjecaj"""
+        return self._summarize_prepared(natjecaj_data, self._prepare(natjecaj_data))
+
+    def summarize_batch(self, natjecaji_list: List[Dict]) -> List[Dict]:
+        """
+        Summarize every natjecaj with IDF computed over the batch.
+
+        The batch IDF is only used for this call - the instance is shared
+        between threads, so its fitted IDF is left untouched.
+        """
+        prepared = [self._prepare(n) for n in natjecaji_list]
+
+        # Same as fit(), but reusing the already tokenized sentences
+        doc_freq: Counter = Counter()
+        for _, sentence_tokens, title_tokens in prepared:
+            terms = set(title_tokens)
+            for tokens in sentence_tokens:
+                terms.update(tokens)
+            doc_freq.update(terms)
+        idf = self._compute_idf(doc_freq, len(prepared))
+
+        return [self._summarize_prepared(n, p, idf) for n, p in zip(natjecaji_list, prepared)]
+
+    def _prepare(self, natjecaj_data: Dict) -> Tuple[List[str], List[List[str]], List[str]]:
+        """Split description into sentences and tokenize them"""
+        sentences = drop_boilerplate(split_sentences(natjecaj_data.get('opis') or ''))
+        sentence_tokens = [tokenize(s) for s in sentences]
+        title_tokens = tokenize(natjecaj_data.get('naziv') or '')
+        return sentences, sentence_tokens, title_tokens
+
+    def _summarize_prepared(self, natjecaj_data: Dict, prepared: Tuple,
+                            idf: Optional[Tuple[Dict[str, float], float]] = None) -> Dict:
+        naziv = natjecaj_data.get('naziv') or 'Natječaj'
+        kategorija = natjecaj_data.get('kategorija') or 'N/A'
+        podrucje = natjecaj_data.get('podrucje_istrazivanja') or ''
+        sentences, sentence_tokens, title_tokens = prepared
+
+        term_weights = self._term_weights(title_tokens, sentence_tokens, idf or self._idf)
+
+        sazetek = self._select_sentences(sentences, sentence_tokens, term_weights)
+        if not sazetek:
+            sazetek = f"Natječaj '{naziv}' u kategoriji {kategorija}."
+        sazetek += " Za detaljne informacije molimo provjerite službenu dokumentaciju."
+
+        keywords = heapq.nlargest(self.max_keywords, term_weights, key=term_weights.get)
+        if not keywords and kategorija != 'N/A':
+            keywords = [kategorija]
+
+        return {
+            'sazetek': sazetek,
+            'kljucne_rijeci': ", ".join(keywords),
+            'preporuka_relevantnosti': self._estimate_relevance(term_weights, podrucje, kategorija),
+            'model_koristen': 'extractive',
+            'temperatura': 0.0,
+            'token_count': 0,
+            'ai_generated': False,
+            'disclaimer_shown': True
+        }
+
+    def _term_weights(self, title_tokens: List[str], sentence_tokens: List[List[str]],
+                      idf: Tuple[Dict[str, float], float]) -> Dict[str, float]:
+        """TF-IDF weight per term, title terms count double"""
+        tf: Counter = Counter()
+        for tokens in sentence_tokens:
+            tf.update(tokens)
+        for token in title_tokens:
+            tf[token] += 2
+
+        idf_table, default_idf = idf
+        return {term: count * idf_table.get(term, default_idf) for term, count in tf.items()}
+
+    def _select_sentences(self, sentences: List[str], sentence_tokens: List[List[str]],
+                          term_weights: Dict[str, float]) -> str:
+        """Pick the highest scoring sentences, keeping original order"""
+        if not sentences:
+            return ""
+
+        scores = []
+        for idx, tokens in enumerate(sentence_tokens):
+            if not tokens:
+                scores.append(0.0)
+                continue
+            score = sum(term_weights[t] for t in tokens) / math.sqrt(len(tokens))
+            if is_key_sentence(sentences[idx]):
+                score *= 1.5
+            # Lead sentences usually state what the call is about
+            if idx == 0:
+                score *= 1.2
+            scores.append(score)
+
+        ranked = sorted(range(len(sentences)), key=lambda i: -scores[i])[:self.max_sentences]
+
+        summary = ""
+        for idx in sorted(ranked):
+            candidate = (summary + " " + sentences[idx]).strip()
+            if summary and len(candidate) > self.max_summary_chars:
+                break
+            summary = candidate
+
+        if len(summary) > self.max_summary_chars:
+            summary = summary[:self.max_summary_chars].rsplit(" ", 1)[0] + "..."
+        return summary
+
+    def _estimate_relevance(self, term_weights: Dict[str, float], podrucje: str, kategorija: str) -> str:
+        """Heuristic relevance for FIDIT researchers: visoka/srednja/niska"""
+        if podrucje.upper() == "ICT":
+            return "visoka"
+
+        terms = " ".join(term_weights)
+        high = len(HIGH_RELEVANCE_RE.findall(terms))
+        medium = len(MEDIUM_RELEVANCE_RE.findall(terms))
+
+        if high >= 2:
+            return "visoka"
+        if high or medium >= 2 or kategorija == "Znanstveno istraživanje":
+            return "srednja"
+        return "niska"
+
+
+_default_summarizer: Optional[ExtractiveSummarizer] = None
+
+
+def get_extractive_summarizer() -> ExtractiveSummarizer:
+    """Get shared summarizer instance"""
+    global _default_summarizer
+    if _default_summarizer is None:
+        _default_summarizer = ExtractiveSummarizer()
+    return _default_summarizer
@@ -1,89 +1,266 @@
 from typing import Optional, Dict
+from loguru import logger
+import importlib.util
+import threading
+import time
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from config.settings import settings
+from src.llm.prompt_builder import TokenCounter, build_prompt
+from src.llm.extractive_summarizer import get_extractive_summarizer
+from src.llm.response_parser import (
+    SUMMARY_JSON_SCHEMA,
+    ResponseParseError,
+    parse_summary_response
+)
+from src.database.database import get_db_session
+from src.database.crud import create_llm_call_log
+from src.utils.metrics import LLM_CALL_DURATION
+from src.utils.tracing import traced
 
-# Try to import OpenAI, handle if not available
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("  OpenAI library not available. AI summaries will be disabled.")
+
+# USD per 1K tokens (prompt, completion), matched by longest model name prefix
+MODEL_PRICING = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+_telemetry_lock = threading.Lock()
+
+
+def llm_available() -> bool:
+    """Whether LLMService would be enabled, without importing openai"""
+    return bool(settings.openai_api_key) and importlib.util.find_spec("openai") is not None
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether an API error is transient: connection problems, timeouts, rate limits and 5xx responses"""
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+        # APITimeoutError is a subclass of APIConnectionError
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate call cost in USD from token counts"""
+    matches = [name for name in MODEL_PRICING if model and model.startswith(name)]
+    if not matches:
+        return 0.0
+    prompt_price, completion_price = MODEL_PRICING[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000.0
 
 
 class LLMService:
     """Service for generating AI summaries of natječaji using LLMs"""
     
-    def __init__(self, model: str = "gpt-4", temperature: float = 0.7):
+    def __init__(self, model: str = "gpt-4", temperature: float = 0.7, input_token_budget: int = None,
+                 max_retries: int = 2):
         self.model = model
         self.temperature = temperature
+        self.input_token_budget = input_token_budget or settings.llm_input_token_budget
+        self.token_counter = TokenCounter(model)
+        self.last_prompt_tokens = 0
+        self.max_retries = max_retries
+        self.retry_backoff = 1.0  # seconds, doubled on every retry
+        self.telemetry_enabled = settings.llm_telemetry_enabled
+        self.structured_output = settings.llm_structured_output
         
-        if OPENAI_AVAILABLE and settings.openai_api_key:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+        # openai is imported only when a key is configured - it is slow to import
+        OpenAI = None
+        if settings.openai_api_key:
+            try:
+                from openai import OpenAI
+            except ImportError:
+                logger.warning("OpenAI library not available. AI summaries will be disabled.")
+
+        if OpenAI is not None:
+            # Retries are done here so they can be counted in telemetry
+            self.client = OpenAI(api_key=settings.openai_api_key, max_retries=0)
             self.enabled = True
         else:
             self.client = None
             self.enabled = False
-            print("  LLM Service disabled - no API key configured")
+            logger.info("LLM Service disabled - no API key configured")
     
+    @traced("llm.generate_summary")
     def generate_summary(self, natjecaj_data: Dict) -> Optional[Dict]:
         """
         Generate AI summary for a natjecaj
         
+        Every call is recorded in llm_call_logs (tokens, latency, retries, fallback).
+        
         Returns:
             Dict with 'sazetek', 'kljucne_rijeci', 'preporuka_relevantnosti'
             or None if generation failed
         """
-        if not self.enabled:
-            return self._generate_fallback_summary(natjecaj_data)
+        start_time = time.perf_counter()
         
-        try:
-            # Prepare prompt
-            prompt = self._build_prompt(natjecaj_data)
-            
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=500
+        if not self.enabled:
+            result = self._generate_fallback_summary(natjecaj_data)
+            self._record_call(
+                natjecaj_data,
+                model=result['model_koristen'],
+                status="fallback",
+                latency=time.perf_counter() - start_time,
+                fallback=True
             )
-            
-            # Extract response
-            summary_text = response.choices[0].message.content.strip()
-            
-            # Parse structured response
-            result = self._parse_response(summary_text)
-            
-            # Add metadata
-            result['model_koristen'] = self.model
-            result['temperatura'] = self.temperature
-            result['token_count'] = response.usage.total_tokens
-            result['ai_generated'] = True
-            result['disclaimer_shown'] = True
-            
             return result
-            
+        
+        # Prepare prompt (description is fitted into the input token budget)
+        prompt = self._build_prompt(natjecaj_data)
+        prompt_tokens = self.last_prompt_tokens + self.token_counter.count(self._get_system_prompt())
+        
+        retries = 0
+        last_error = None
+        usage = {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        messages = [
+            {
+                "role": "system",
+                "content": self._get_system_prompt()
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Call OpenAI API
+                summary_text = self._complete(messages, usage)
+                
+                try:
+                    result = self._parse_response(summary_text)
+                except ResponseParseError as parse_error:
+                    # Single repair retry - show the model its output and the validation error
+                    retries += 1
+                    repair_messages = messages + [
+                        {"role": "assistant", "content": summary_text},
+                        {"role": "user", "content": self._get_repair_prompt(parse_error)}
+                    ]
+                    result = self._parse_response(self._complete(repair_messages, usage))
+                
+                # Add metadata
+                result['model_koristen'] = self.model
+                result['temperatura'] = self.temperature
+                result['token_count'] = usage['total_tokens']
+                result['ai_generated'] = True
+                result['disclaimer_shown'] = True
+                
+                self._record_call(
+                    natjecaj_data,
+                    model=self.model,
+                    status="success",
+                    latency=time.perf_counter() - start_time,
+                    retries=retries,
+                    **usage
+                )
+                
+                return result
+                
+            except ResponseParseError as e:
+                # Repair failed as well - another full attempt would most likely fail the same way
+                last_error = e
+                break
+            except Exception as e:
+                last_error = e
+                if not is_retryable_error(e):
+                    # Authentication, bad request (e.g. context length), permission... - fall back now
+                    break
+                if attempt < self.max_retries:
+                    retries += 1
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+        
+        logger.bind(natjecaj_id=natjecaj_data.get('id')).warning(f"Error generating AI summary: {last_error}")
+        result = self._generate_fallback_summary(natjecaj_data)
+        self._record_call(
+            natjecaj_data,
+            model=self.model,
+            status="failed",
+            prompt_tokens=usage['prompt_tokens'] or prompt_tokens,
+            completion_tokens=usage['completion_tokens'],
+            latency=time.perf_counter() - start_time,
+            retries=retries,
+            fallback=True,
+            error_message=str(last_error)
+        )
+        return result
+    
+    def _complete(self, messages: list, usage: Dict) -> str:
+        """Call the chat completions API, returns response text and adds token usage"""
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": 500
+        }
+        if self.structured_output:
+            # Function calling makes the model return arguments matching the JSON schema
+            request["tools"] = [{
+                "type": "function",
+                "function": {
+                    "name": "spremi_sazetak",
+                    "description": "Spremi strukturirani sažetak natječaja",
+                    "parameters": SUMMARY_JSON_SCHEMA
+                }
+            }]
+            request["tool_choice"] = {"type": "function", "function": {"name": "spremi_sazetak"}}
+        
+        response = self.client.chat.completions.create(**request)
+        
+        if response.usage:
+            usage['prompt_tokens'] += response.usage.prompt_tokens
+            usage['completion_tokens'] += response.usage.completion_tokens
+            usage['total_tokens'] += response.usage.total_tokens
+        
+        message = response.choices[0].message
+        if message.tool_calls:
+            return message.tool_calls[0].function.arguments
+        return (message.content or "").strip()
+    
+    def _record_call(self, natjecaj_data: Dict, model: str, status: str, prompt_tokens: int = 0,
+                     completion_tokens: int = 0, total_tokens: int = None, latency: float = None,
+                     retries: int = 0, fallback: bool = False, error_message: str = None):
+        """Store LLM call telemetry, never failing the summary itself"""
+        if latency is not None:
+            LLM_CALL_DURATION.observe(latency, model, status)
+        if not self.telemetry_enabled:
+            return
+        
+        if total_tokens is None:
+            total_tokens = prompt_tokens + completion_tokens
+        
+        try:
+            # SQLite shares one connection between threads - serialize writes
+            with _telemetry_lock, get_db_session() as db:
+                create_llm_call_log(
+                    db,
+                    natjecaj_id=natjecaj_data.get('id'),
+                    model=model,
+                    status=status,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=total_tokens,
+                    latency=latency,
+                    retries=retries,
+                    fallback=fallback,
+                    estimated_cost=estimate_cost(model, prompt_tokens, completion_tokens),
+                    error_message=error_message
+                )
         except Exception as e:
-            print(f" Error generating AI summary: {e}")
-            return self._generate_fallback_summary(natjecaj_data)
+            logger.warning(f"Error recording LLM telemetry: {e}")
     
     def _get_system_prompt(self) -> str:
         """System prompt for AI"""
-        return """Ti si AI asistent specijaliziran za analizu natječaja i izvora financiranja za znanstvena istraživanja.
+        intro = """Ti si AI asistent specijaliziran za analizu natječaja i izvora financiranja za znanstvena istraživanja.
 Tvoj zadatak je generirati KRATAK, INFORMATIVAN i OBJEKTIVAN sažetak natječaja.
 
 VAŽNO - EU AI Act Compliance:
@@ -91,82 +268,61 @@ VAŽNO - EU AI Act Compliance:
 - Sažetak je samo informativne prirode
 - Korisnik mora provjeriti službene dokumente
 - Ne smije zamijeniti službenu natječajnu dokumentaciju
-
+"""
+        if self.structured_output:
+            return intro + """
+Format odgovora: isključivo JSON objekt bez dodatnog teksta:
+{"sazetek": "[2-3 rečenice koje objašnjavaju suštinu natječaja]",
+ "kljucne_rijeci": ["3-5 ključnih riječi"],
+ "relevantnost": "visoka|srednja|niska - procjena za FIDIT znanstvenike"}
+"""
+        return intro + """
 Format odgovora:
 SAŽETAK: [2-3 rečenice koje objašnjavaju suštinu natječaja]
 KLJUČNE RIJEČI: [3-5 ključnih riječi odvojenih zarezom]
 RELEVANTNOST: [visoka/srednja/niska - procjena za FIDIT znanstvenike]
 """
     
+    def _get_repair_prompt(self, error: Exception) -> str:
+        """Prompt asking the model to fix an invalid response"""
+        if self.structured_output:
+            return (f"Odgovor nije valjan ({error}). Vrati isključivo ispravljeni JSON objekt "
+                    f"s poljima sazetek, kljucne_rijeci i relevantnost.")
+        return (f"Odgovor nije valjan ({error}). Vrati odgovor točno u zadanom formatu "
+                f"(SAŽETAK:, KLJUČNE RIJEČI:, RELEVANTNOST:).")
+    
     def _build_prompt(self, natjecaj_data: Dict) -> str:
-        """Build prompt from natjecaj data"""
-        naziv = natjecaj_data.get('naziv', 'N/A')
-        opis = natjecaj_data.get('opis', 'Nema opisa')
-        kategorija = natjecaj_data.get('kategorija', 'N/A')
-        podrucje = natjecaj_data.get('podrucje_istrazivanja', 'N/A')
-        iznos = natjecaj_data.get('iznos_financiranja', 'N/A')
-        rok = natjecaj_data.get('rok_prijave', 'N/A')
-        
-        prompt = f"""Analiziraj sljedeći natječaj i generiraj sažetak:
-
-NAZIV: {naziv}
-KATEGORIJA: {kategorija}
-PODRUČJE: {podrucje}
-IZNOS FINANCIRANJA: {iznos} EUR
-ROK PRIJAVE: {rok}
-
-OPIS:
-{opis}
-
-Generiraj strukturiran odgovor prema zadanom formatu."""
-        
+        """Build prompt from natjecaj data, keeping the description within the token budget"""
+        prompt, self.last_prompt_tokens = build_prompt(
+            natjecaj_data,
+            self.token_counter,
+            self.input_token_budget
+        )
         return prompt
     
     def _parse_response(self, response_text: str) -> Dict:
-        """Parse structured response from AI"""
-        result = {
-            'sazetek': '',
-            'kljucne_rijeci': '',
-            'preporuka_relevantnosti': 'srednja'
-        }
-        
-        lines = response_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('SAŽETAK:'):
-                result['sazetek'] = line.replace('SAŽETAK:', '').strip()
-            elif line.startswith('KLJUČNE RIJEČI:'):
-                result['kljucne_rijeci'] = line.replace('KLJUČNE RIJEČI:', '').strip()
-            elif line.startswith('RELEVANTNOST:'):
-                relevantnost = line.replace('RELEVANTNOST:', '').strip().lower()
-                if relevantnost in ['visoka', 'srednja', 'niska']:
-                    result['preporuka_relevantnosti'] = relevantnost
-        
-        # Fallback if parsing failed
-        if not result['sazetek']:
-            result['sazetek'] = response_text
+        """
+        Parse structured response from AI
         
-        return result
+        Raises:
+            ResponseParseError: if the response is not a valid summary
+        """
+        return parse_summary_response(response_text, structured=self.structured_output)
     
     def _generate_fallback_summary(self, natjecaj_data: Dict) -> Dict:
-        """Generate simple fallback summary when AI is not available"""
-        naziv = natjecaj_data.get('naziv', 'Natječaj')
-        kategorija = natjecaj_data.get('kategorija', 'N/A')
-        
-        return {
-            'sazetek': f"Natječaj '{naziv}' u kategoriji {kategorija}. Za detaljne informacije molimo provjerite službenu dokumentaciju.",
-            'kljucne_rijeci': kategorija,
-            'preporuka_relevantnosti': 'srednja',
-            'model_koristen': 'fallback',
-            'temperatura': 0.0,
-            'token_count': 0,
-            'ai_generated': False,
-            'disclaimer_shown': True
-        }
+        """Generate local extractive summary when AI is not available"""
+        return get_extractive_summarizer().summarize(natjecaj_data)
     
     def batch_generate_summaries(self, natjecaji_list: list) -> list:
         """Generate summaries for multiple natječaji"""
+        if not self.enabled:
+            # Extractive batch mode - IDF is fitted over the whole batch
+            summaries = get_extractive_summarizer().summarize_batch(natjecaji_list)
+            return [
+                {'natjecaj_id': natjecaj.get('id'), 'summary': summary}
+                for natjecaj, summary in zip(natjecaji_list, summaries)
+            ]
+        
         results = []
         
         for natjecaj in natjecaji_list:
@@ -0,0 +1,176 @@
+from typing import List, Tuple
+import re
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+
+# Average characters per token for Croatian text with cl100k-style tokenizers
+CHARS_PER_TOKEN = 3.2
+
+# Split on sentence punctuation followed by a capital letter, so "15. ožujka" stays intact
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+(?=[A-ZČĆĐŠŽ\"„(])|\n+")
+
+# Sentences mentioning deadlines, amounts or eligibility are always worth keeping
+# (matched against lowercased text)
+KEY_SENTENCE_RE = re.compile(
+    r"€|\b(?:rok|prijav|do\s+\d{1,2}\.|deadline|iznos|eur\b|kn\b|milijun|"
+    r"budžet|sredstv|prihvatljiv|uvjet|korisni)"
+)
+
+# Navigation, cookie banners and sharing widgets picked up by the scrapers - whole
+# words and phrases only, so "podijeliti" or "shareholders" are not boilerplate
+BOILERPLATE_RE = re.compile(
+    r"\b(?:kolačić[a-zčćđšž]*|cookies?|pročitajte\s+više|saznajte\s+više|podijeli(?:te)?|"
+    r"share|newsletter[a-zčćđšž]*|pretplatite\s+se|sva\s+prava\s+pridržana|all\s+rights\s+reserved|"
+    r"klikni(?:te)?\s+ovdje|facebook|twitter|linkedin)\b"
+)
+
+
+class TokenCounter:
+    """
+    Counts tokens for a given model, using tiktoken when it can be loaded
+    and a character heuristic otherwise. tiktoken and the encoding are only
+    loaded on the first count.
+    """
+
+    def __init__(self, model: str = "gpt-4"):
+        self.model = model
+        self._loaded = False
+        self._cached_encoding = None
+
+    @property
+    def _encoding(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                import tiktoken
+            except ImportError:
+                return None
+            try:
+                self._cached_encoding = tiktoken.encoding_for_model(self.model)
+            except Exception:
+                # Unknown model or encoding files not downloadable (offline)
+                try:
+                    self._cached_encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    self._cached_encoding = None
+        return self._cached_encoding
+
+    def count(self, text: str) -> int:
+        """Count tokens in text"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return int(len(text) / CHARS_PER_TOKEN) + 1
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncate text to at most max_tokens tokens"""
+        if max_tokens <= 0 or not text:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[:max_tokens])
+        return text[:int(max_tokens * CHARS_PER_TOKEN)]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split description text into sentences"""
+    if not text:
+        return []
+    return [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s and s.strip()]
+
+
+def is_boilerplate(sentence: str) -> bool:
+    """Check if sentence is navigation/cookie/sharing boilerplate (key sentences never are)"""
+    lowered = sentence.lower()
+    return bool(BOILERPLATE_RE.search(lowered)) and not KEY_SENTENCE_RE.search(lowered)
+
+
+def drop_boilerplate(sentences: List[str]) -> List[str]:
+    """Remove boilerplate sentences"""
+    if not BOILERPLATE_RE.search(" ".join(sentences).lower()):
+        return sentences
+    return [s for s in sentences if not is_boilerplate(s)]
+
+
+def is_key_sentence(sentence: str) -> bool:
+    """Check if sentence mentions a deadline, amount or eligibility"""
+    return bool(KEY_SENTENCE_RE.search(sentence.lower()))
+
+
+def extract_within_budget(text: str, max_tokens: int, counter: TokenCounter) -> Tuple[str, int]:
+    """
+    Reduce description to fit into max_tokens.
+
+    Boilerplate is dropped, key sentences (deadline, amount, eligibility) are
+    kept first, remaining sentences fill the rest of the budget. Original
+    sentence order is preserved.
+
+    Returns:
+        Tuple of (extracted text, token count)
+    """
+    if not text:
+        return "", 0
+
+    total = counter.count(text)
+    if total <= max_tokens:
+        return text, total
+
+    sentences = drop_boilerplate(split_sentences(text))
+    costs = [counter.count(s) + 1 for s in sentences]
+
+    key_idx = [i for i, s in enumerate(sentences) if is_key_sentence(s)]
+    other_idx = [i for i, s in enumerate(sentences) if not is_key_sentence(s)]
+
+    selected = set()
+    used = 0
+    for i in key_idx + other_idx:
+        if used + costs[i] <= max_tokens:
+            selected.add(i)
+            used += costs[i]
+
+    extracted = " ".join(sentences[i] for i in sorted(selected))
+
+    # A single sentence larger than the budget - hard truncate
+    if not extracted and sentences:
+        extracted = counter.truncate(sentences[0], max_tokens)
+
+    return extracted, counter.count(extracted)
+
+
+def build_prompt(natjecaj_data: dict, counter: TokenCounter, max_opis_tokens: int) -> Tuple[str, int]:
+    """
+    Build summary prompt from natjecaj data with the description fitted
+    into max_opis_tokens.
+
+    Returns:
+        Tuple of (prompt, prompt token count)
+    """
+    naziv = natjecaj_data.get('naziv') or 'N/A'
+    opis = natjecaj_data.get('opis') or 'Nema opisa'
+    kategorija = natjecaj_data.get('kategorija') or 'N/A'
+    podrucje = natjecaj_data.get('podrucje_istrazivanja') or 'N/A'
+    iznos = natjecaj_data.get('iznos_financiranja') or 'N/A'
+    rok = natjecaj_data.get('rok_prijave') or 'N/A'
+
+    opis, _ = extract_within_budget(opis, max_opis_tokens, counter)
+
+    prompt = f"""Analiziraj sljedeći natječaj i generiraj sažetak:
+
+NAZIV: {naziv}
+KATEGORIJA: {kategorija}
+PODRUČJE: {podrucje}
+IZNOS FINANCIRANJA: {iznos} EUR
+ROK PRIJAVE: {rok}
+
+OPIS:
+{opis}
+
+Generiraj strukturiran odgovor prema zadanom formatu."""
+
+    return prompt, counter.count(prompt)
@@ -0,0 +1,196 @@
+from typing import Dict, List, Optional
+import json
+import re
+
+
+RELEVANCE_VALUES = ("visoka", "srednja", "niska")
+
+# Models sometimes answer in English despite the Croatian prompt
+RELEVANCE_ALIASES = {
+    "high": "visoka",
+    "medium": "srednja",
+    "low": "niska",
+}
+
+# JSON schema for the structured summary - used as the function calling schema
+SUMMARY_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sazetek": {
+            "type": "string",
+            "description": "2-3 rečenice koje objašnjavaju suštinu natječaja"
+        },
+        "kljucne_rijeci": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "3-5 ključnih riječi"
+        },
+        "relevantnost": {
+            "type": "string",
+            "enum": list(RELEVANCE_VALUES),
+            "description": "Procjena relevantnosti za FIDIT znanstvenike"
+        }
+    },
+    "required": ["sazetek", "kljucne_rijeci", "relevantnost"]
+}
+
+CODE_FENCE_RE = re.compile(r"```(?:json)?", re.IGNORECASE)
+
+LABEL_RE = re.compile(
+    r"^\s*\**\s*(SAŽETAK|SAZETAK|KLJUČNE RIJEČI|KLJUCNE RIJECI|RELEVANTNOST)\s*\**\s*:\s*(.*)$",
+    re.IGNORECASE
+)
+
+
+class ResponseParseError(ValueError):
+    """Raised when an LLM response cannot be turned into a valid summary"""
+    pass
+
+
+def _close_truncated_json(fragment: str) -> str:
+    """Close strings, arrays and objects left open by a truncated response (max_tokens cut-off)"""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+
+    for char in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    repaired = fragment
+    if escaped:
+        repaired = repaired[:-1]
+    if in_string:
+        repaired += '"'
+
+    # A trailing separator, or a key without a value, cannot be closed - drop it
+    repaired = re.sub(r"[,:]\s*$", "", repaired)
+    if stack and stack[-1] == "}":
+        repaired = re.sub(r'([{,])\s*"[^"]*"\s*$', r"\1", repaired)
+        repaired = re.sub(r",\s*$", "", repaired)
+
+    return repaired + "".join(reversed(stack))
+
+
+def extract_json_object(text: str) -> Dict:
+    """
+    Extract the first JSON object from model output.
+
+    Tolerates code fences, text around the object and output cut off by
+    the token limit (missing closing quotes/brackets).
+    """
+    if not text:
+        raise ResponseParseError("Empty response")
+
+    cleaned = CODE_FENCE_RE.sub("", text)
+    start = cleaned.find("{")
+    if start < 0:
+        raise ResponseParseError("No JSON object in response")
+
+    decoder = json.JSONDecoder()
+    try:
+        obj, _ = decoder.raw_decode(cleaned[start:])
+    except json.JSONDecodeError:
+        try:
+            obj = json.loads(_close_truncated_json(cleaned[start:].rstrip()))
+        except json.JSONDecodeError as e:
+            raise ResponseParseError(f"Invalid JSON: {e}") from e
+
+    if not isinstance(obj, dict):
+        raise ResponseParseError("JSON response is not an object")
+    return obj
+
+
+def _normalize_relevance(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower()
+    value = RELEVANCE_ALIASES.get(value, value)
+    return value if value in RELEVANCE_VALUES else None
+
+
+def validate_summary(obj: Dict) -> Dict:
+    """Validate parsed JSON against SUMMARY_JSON_SCHEMA and map it to AISazetek fields"""
+    sazetek = obj.get("sazetek")
+    if not isinstance(sazetek, str) or not sazetek.strip():
+        raise ResponseParseError("Field 'sazetek' is missing or empty")
+
+    kljucne_rijeci = obj.get("kljucne_rijeci", [])
+    if isinstance(kljucne_rijeci, str):
+        kljucne_rijeci = kljucne_rijeci.split(",")
+    if not isinstance(kljucne_rijeci, list):
+        raise ResponseParseError("Field 'kljucne_rijeci' must be a list")
+    kljucne_rijeci = [str(k).strip() for k in kljucne_rijeci if str(k).strip()]
+
+    relevantnost = _normalize_relevance(obj.get("relevantnost"))
+    if relevantnost is None:
+        raise ResponseParseError(f"Field 'relevantnost' must be one of {', '.join(RELEVANCE_VALUES)}")
+
+    return {
+        'sazetek': " ".join(sazetek.split()),
+        'kljucne_rijeci': ", ".join(kljucne_rijeci)[:500],
+        'preporuka_relevantnosti': relevantnost
+    }
+
+
+def parse_labeled_response(text: str) -> Dict:
+    """
+    Parse the labeled text format (SAŽETAK: / KLJUČNE RIJEČI: / RELEVANTNOST:).
+
+    Values may span several lines - everything up to the next label belongs
+    to the current field.
+    """
+    fields: Dict[str, List[str]] = {}
+    current = None
+
+    for line in (text or "").splitlines():
+        match = LABEL_RE.match(line)
+        if match:
+            label = match.group(1).upper()
+            current = "sazetek" if label.startswith("SA") else "kljucne_rijeci" if label.startswith("KLJ") else "relevantnost"
+            fields[current] = [match.group(2).strip()]
+        elif current and line.strip():
+            fields[current].append(line.strip())
+
+    sazetek = " ".join(fields.get("sazetek", [])).strip()
+    if not sazetek:
+        raise ResponseParseError("No 'SAŽETAK:' section in response")
+
+    return {
+        'sazetek': sazetek,
+        'kljucne_rijeci': " ".join(fields.get("kljucne_rijeci", [])).strip()[:500],
+        'preporuka_relevantnosti': _normalize_relevance(" ".join(fields.get("relevantnost", [])).strip(" .*")) or 'srednja'
+    }
+
+
+def parse_summary_response(text: str, structured: bool = True) -> Dict:
+    """
+    Parse LLM response into AISazetek fields.
+
+    In structured mode the JSON object is preferred and the labeled format is
+    accepted as a fallback (models occasionally ignore the JSON instruction).
+
+    Raises:
+        ResponseParseError: if neither format yields a valid summary
+    """
+    if not structured:
+        return parse_labeled_response(text)
+
+    try:
+        return validate_summary(extract_json_object(text))
+    except ResponseParseError as json_error:
+        try:
+            return parse_labeled_response(text)
+        except ResponseParseError:
+            raise json_error
@@ -0,0 +1,182 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from loguru import logger
+import argparse
+import socket
+import threading
+import time
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import settings
+from src.database.database import get_db_session
+from src.database import crud
+from src.llm.llm_service import LLMService
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting calls per minute"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """Block until the next call is allowed"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class SummaryWorker:
+    """Drains the AI summary queue in the background"""
+
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        concurrency: Optional[int] = None,
+        rate_limit_per_minute: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.llm_service = llm_service or LLMService()
+        self.concurrency = max(concurrency or settings.summary_worker_concurrency, 1)
+        self.rate_limiter = RateLimiter(
+            rate_limit_per_minute if rate_limit_per_minute is not None else settings.summary_worker_rate_limit
+        )
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+
+    def process_batch(self) -> int:
+        """Lease one batch of jobs and generate their summaries. Returns number of leased jobs."""
+        with get_db_session() as db:
+            jobs = crud.lease_summary_jobs(
+                db,
+                worker_id=self.worker_id,
+                limit=self.concurrency * 2,
+                lease_seconds=settings.summary_queue_lease_seconds
+            )
+            work = []
+            for job in jobs:
+                natjecaj = crud.get_natjecaj_by_id(db, job.natjecaj_id)
+                if natjecaj is None:
+                    crud.fail_summary_job(db, job.id, "Natječaj not found", max_attempts=0)
+                    continue
+                work.append((job.id, natjecaj.id, self._natjecaj_data(natjecaj)))
+
+        if not jobs:
+            return 0
+
+        if self.llm_service.enabled:
+            results = self._generate_concurrently(work)
+        else:
+            # Extractive summaries are CPU-only and fast - no need for threads or rate limiting
+            summaries = self.llm_service.batch_generate_summaries([data for _, _, data in work])
+            results = [(job_id, natjecaj_id, item['summary'], None)
+                       for (job_id, natjecaj_id, _), item in zip(work, summaries)]
+
+        # DB writes happen on this thread only
+        with get_db_session() as db:
+            for job_id, natjecaj_id, summary, error in results:
+                if summary:
+                    crud.upsert_ai_sazetek(db, natjecaj_id=natjecaj_id, **summary)
+
+                if error:
+                    crud.fail_summary_job(db, job_id, error, max_attempts=settings.summary_queue_max_attempts)
+                else:
+                    crud.ack_summary_job(db, job_id)
+
+        return len(jobs)
+
+    def drain(self) -> int:
+        """Process jobs until the queue is empty. Returns number of processed jobs."""
+        total = 0
+        while not self._stop.is_set():
+            processed = self.process_batch()
+            if not processed:
+                break
+            total += processed
+        return total
+
+    def run_forever(self, poll_interval: float = 30.0):
+        """Keep draining the queue, polling for new jobs every poll_interval seconds"""
+        logger.info(f"Summary worker {self.worker_id} started (concurrency={self.concurrency})")
+        while not self._stop.is_set():
+            try:
+                processed = self.drain()
+                if processed:
+                    logger.info(f"Generated {processed} summaries")
+            except Exception as e:
+                logger.exception(f"Summary worker error: {e}")
+            self._stop.wait(poll_interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def _generate_concurrently(self, work: List) -> List:
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {
+                pool.submit(self._generate_one, data): (job_id, natjecaj_id)
+                for job_id, natjecaj_id, data in work
+            }
+            for future in as_completed(futures):
+                job_id, natjecaj_id = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    results.append((job_id, natjecaj_id, None, str(e)))
+                    continue
+
+                if summary and not summary.get('ai_generated'):
+                    # LLM call failed and generate_summary fell back - keep the
+                    # first-pass summary but retry the job later
+                    results.append((job_id, natjecaj_id, summary, "LLM generation failed, fallback stored"))
+                else:
+                    results.append((job_id, natjecaj_id, summary, None))
+        return results
+
+    def _generate_one(self, natjecaj_data: Dict) -> Optional[Dict]:
+        self.rate_limiter.acquire()
+        return self.llm_service.generate_summary(natjecaj_data)
+
+    @staticmethod
+    def _natjecaj_data(natjecaj) -> Dict:
+        return {
+            'id': natjecaj.id,
+            'naziv': natjecaj.naziv,
+            'opis': natjecaj.opis,
+            'kategorija': natjecaj.kategorija,
+            'podrucje_istrazivanja': natjecaj.podrucje_istrazivanja,
+            'iznos_financiranja': natjecaj.iznos_financiranja,
+            'rok_prijave': natjecaj.rok_prijave
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI summary queue worker")
+    parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None, help="LLM requests per minute")
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    args = parser.parse_args()
+
+    from src.database.database import init_db
+    from src.utils.tracing import configure_logging
+    configure_logging()
+    init_db()
+
+    worker = SummaryWorker(concurrency=args.concurrency, rate_limit_per_minute=args.rate_limit)
+    if args.once:
+        count = worker.drain()
+        print(f"  Processed {count} summary jobs")
+    else:
+        worker.run_forever(poll_interval=args.poll_interval)
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup
+from loguru import logger
 import requests
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional
 from datetime import datetime
+from urllib.parse import urlparse
+import threading
 import time
 import sys
 import os
@@ -10,6 +13,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from config.settings import settings
+from src.scrapers.pipeline import ScrapePipeline
+from src.utils.metrics import SCRAPER_DOWNLOADED_BYTES, SCRAPER_FETCH_DURATION, SCRAPER_FETCH_ERRORS
+from src.utils.tracing import span
 
 
 class BaseScraper(ABC):
@@ -22,17 +28,86 @@ class BaseScraper(ABC):
             'User-Agent': settings.user_agent
         }
         self.session = requests.Session()
+        # Set by ScraperManager to receive the number of items found so far
+        self.progress_callback: Optional[Callable[[int], None]] = None
+        # Per-source settings from the scraper registry (see configure)
+        self.concurrency = 1
+        self.rate_limit: Optional[float] = 5.0
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # Failed requests and pages the crawl had to skip or cut in the current
+        # run - an incomplete crawl may have missed natjecaji, so ScraperManager
+        # does not close the ones it did not see (see crawl_complete)
+        self.fetch_errors = 0
+        self.incomplete_reasons: List[str] = []
+    
+    def configure(self, concurrency: int = 1, rate_limit: Optional[float] = None):
+        """Apply per-source settings: max parallel requests and requests per second"""
+        self.concurrency = max(int(concurrency), 1)
+        self.rate_limit = rate_limit if rate_limit and rate_limit > 0 else None
+    
+    def throttle(self):
+        """Block until the next request is allowed by the source's rate limit (thread-safe)"""
+        if not self.rate_limit:
+            return
+        with self._throttle_lock:
+            now = time.monotonic()
+            delay = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1.0 / self.rate_limit
+        if delay > 0:
+            time.sleep(delay)
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Rate-limited HTTP request with the scraper's headers.
+        
+        Records latency, downloaded bytes and failures per host; raises
+        requests.RequestException like session.request/raise_for_status.
+        """
+        kwargs.setdefault("headers", self.headers)
+        host = urlparse(url).hostname or ""
+        self.throttle()
+        with span("scrape.fetch", source=self.source_name, url=url) as fetch_span:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                SCRAPER_FETCH_ERRORS.inc(host)
+                self.fetch_errors += 1
+                raise
+            SCRAPER_FETCH_DURATION.observe(time.perf_counter() - start, host)
+            SCRAPER_DOWNLOADED_BYTES.inc(host, amount=len(response.content))
+            fetch_span.set(status=response.status_code, bytes=len(response.content))
+            if not response.ok:
+                SCRAPER_FETCH_ERRORS.inc(host)
+                self.fetch_errors += 1
+            response.raise_for_status()
+            return response
     
     def fetch_page(self, url: str, timeout: int = 30) -> Optional[str]:
         """Fetch HTML content from URL"""
         try:
-            response = self.session.get(url, headers=self.headers, timeout=timeout)
-            response.raise_for_status()
+            response = self.request("GET", url, timeout=timeout)
             return response.text
         except requests.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            self.log(f"Error fetching {url}: {e}", level="WARNING")
             return None
     
+    def start_crawl(self):
+        """Reset the completeness state before a new run"""
+        self.fetch_errors = 0
+        self.incomplete_reasons = []
+    
+    def mark_incomplete(self, reason: str):
+        """Record that this run skipped or cut part of the listing (failed page, invalid data, page limit)"""
+        self.incomplete_reasons.append(reason)
+        self.log(f"Incomplete crawl: {reason}", level="WARNING")
+    
+    @property
+    def crawl_complete(self) -> bool:
+        """Whether the whole listing was read - no failed requests and nothing marked incomplete"""
+        return not self.fetch_errors and not self.incomplete_reasons
+    
     def parse_html(self, html: str) -> BeautifulSoup:
         """Parse HTML content with BeautifulSoup"""
         return BeautifulSoup(html, 'html.parser')
@@ -45,6 +120,40 @@ class BaseScraper(ABC):
         """
         pass
     
+    # Streaming stages - see ScrapePipeline
+    
+    def iter_pages(self) -> Iterator:
+        """Fetch stage: yield raw pages (HTML, JSON...) as they are downloaded"""
+        raise NotImplementedError
+    
+    def parse_page(self, page) -> List[Dict]:
+        """Parse stage: natjecaji found on one page yielded by iter_pages"""
+        raise NotImplementedError
+    
+    @property
+    def supports_pages(self) -> bool:
+        return type(self).iter_pages is not BaseScraper.iter_pages
+    
+    def iter_natjecaji(self) -> Iterator[Dict]:
+        """Yield natjecaji one by one as they are scraped (unnormalized, may repeat)"""
+        if self.supports_pages:
+            for page in self.iter_pages():
+                yield from self.parse_page(page)
+        else:
+            yield from self.scrape()
+    
+    def stream(self, queue_size: int = 64, parse_workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of scrape(): normalized, deduplicated natjecaji are
+        yielded while later pages are still being fetched and parsed.
+        
+        parse_workers > 0 parses pages in worker processes; parse_page then
+        runs on a fresh instance of the scraper class in each worker.
+        """
+        if parse_workers is None:
+            parse_workers = settings.scrape_parse_workers
+        return iter(ScrapePipeline(self, queue_size=queue_size, parse_workers=parse_workers))
+    
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         if not text:
@@ -71,7 +180,14 @@ class BaseScraper(ABC):
         """Wait between requests to be polite"""
         time.sleep(seconds)
     
-    def log(self, message: str):
-        """Simple logging"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{self.source_name}] {message}")
+    def report_progress(self, items_found: int):
+        """Report number of natjecaji found so far (no-op outside a managed run)"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(items_found)
+            except Exception:
+                pass
+    
+    def log(self, message: str, level: str = "INFO"):
+        """Log a message tagged with the scraper's source (and the current trace)"""
+        logger.bind(source=self.source_name).log(level, message)
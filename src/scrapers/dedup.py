@@ -0,0 +1,275 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+# Call codes such as "IP-2026-02", "UIP-2020-02" or "HORIZON-CL4-2024-DIGITAL-EMERGING-01-11",
+# matched whole - never a prefix of a longer identifier
+CALL_CODE_RE = re.compile(
+    r"(?<![\w-])[A-Z][A-Z0-9]{1,}(?:-[A-Z0-9]{2,})*-\d{4}(?:-[A-Z0-9]+)*\b(?!-[A-Z0-9])"
+)
+NON_WORD_RE = re.compile(r"[^a-z0-9 ]+")
+
+TITLE_STOPWORDS = {
+    "i", "u", "za", "na", "o", "od", "do", "s", "sa", "te", "the", "of", "and", "for", "in", "to",
+    "natjecaj", "poziv", "javni", "call",
+}
+
+_MAX_HASH = np.iinfo(np.uint64).max
+
+
+def extract_call_codes(title: str) -> Set[str]:
+    return {code.upper() for code in CALL_CODE_RE.findall(title or "")}
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip diacritics and call codes, drop punctuation and filler words"""
+    if not title:
+        return ""
+    text = CALL_CODE_RE.sub(" ", title)
+    text = text.replace("đ", "d").replace("Đ", "D")
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    text = NON_WORD_RE.sub(" ", text)
+    return " ".join(word for word in text.split() if word not in TITLE_STOPWORDS)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character n-grams of the normalized title (word boundaries kept as spaces)"""
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+        self.sources: Dict[int, Set[int]] = {}
+
+    def find(self, item: int) -> int:
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int, sources: Optional[Dict[int, Optional[int]]] = None) -> bool:
+        """
+        Merge the groups of a and b. With sources (id -> izdavatelj_id), groups
+        that already hold a record of the same source are not merged.
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if sources is not None:
+            sources_a = self.sources.get(root_a) or {sources[root_a]} - {None}
+            sources_b = self.sources.get(root_b) or {sources[root_b]} - {None}
+            if sources_a & sources_b:
+                return False
+            self.sources[min(root_a, root_b)] = sources_a | sources_b
+            self.sources.pop(max(root_a, root_b), None)
+        # Smaller id becomes the root so the canonical record is stable
+        self.parent[max(root_a, root_b)] = min(root_a, root_b)
+        return True
+
+
+class DedupEngine:
+    """
+    Near-duplicate detection for natjecaj titles with MinHash + LSH.
+
+    Titles are normalized and split into character trigrams; each record gets
+    a MinHash signature, and records sharing a band of the signature become
+    candidate pairs. Only candidates are compared exactly, so the cost grows
+    with the number of records and candidates instead of n².
+
+    Records with the same call code are linked at the lower call_code_threshold.
+    Pairs are merged best-first, and with cross_source_only a group never takes
+    two records of the same source - a record from another source can not
+    chain unrelated records of one source together.
+
+    The default 20 bands x 6 rows make a pair with similarity 0.8 a candidate
+    with probability > 0.99 (0.6: ~0.6) while unrelated titles (~0.1) almost
+    never collide.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 120,
+        bands: int = 20,
+        threshold: float = 0.6,
+        call_code_threshold: float = 0.3,
+        shingle_size: int = 3,
+        max_bucket_size: int = 200,
+        cross_source_only: bool = True,
+        seed: int = 42
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.call_code_threshold = call_code_threshold
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max_bucket_size
+        self.cross_source_only = cross_source_only
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: h(x) = (a*x + b mod 2^64) >> 32 with odd a
+        self._a = rng.integers(0, _MAX_HASH, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, _MAX_HASH, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        """MinHash signature (num_perm values) of a shingle set"""
+        if not shingle_set:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set)
+        )
+        return self._permute(hashes).min(axis=0)
+
+    def signatures(self, shingle_sets: List[Set[str]], chunk_size: int = 1000) -> np.ndarray:
+        """
+        MinHash signatures for many shingle sets at once, shape (n, num_perm).
+
+        Shingle hashes of a chunk are permuted in one vectorized operation and
+        reduced per record with np.minimum.reduceat.
+        """
+        result = np.full((len(shingle_sets), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        hash_cache: Dict[str, int] = {}
+
+        for start in range(0, len(shingle_sets), chunk_size):
+            chunk = shingle_sets[start:start + chunk_size]
+            rows = [i for i, shingle_set in enumerate(chunk) if shingle_set]
+            if not rows:
+                continue
+
+            values: List[int] = []
+            offsets: List[int] = []
+            for i in rows:
+                offsets.append(len(values))
+                for shingle in chunk[i]:
+                    value = hash_cache.get(shingle)
+                    if value is None:
+                        value = hash_cache[shingle] = zlib.crc32(shingle.encode("utf-8"))
+                    values.append(value)
+
+            hashes = np.array(values, dtype=np.uint64)
+            result[[start + i for i in rows]] = np.minimum.reduceat(self._permute(hashes), offsets, axis=0)
+
+        return result
+
+    def _permute(self, hashes: np.ndarray) -> np.ndarray:
+        """Apply all num_perm hash functions, shape (len(hashes), num_perm)"""
+        with np.errstate(over="ignore"):
+            return (hashes[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+
+    def find_duplicates(self, records: Iterable[Dict]) -> List[Dict]:
+        """
+        Find near-duplicate records.
+
+        Args:
+            records: dicts with 'id', 'naziv' and optionally 'izdavatelj_id'
+
+        Returns:
+            Links {'natjecaj_id', 'canonical_id', 'similarity', 'method'} for
+            every record that duplicates an older (lower id) canonical record
+        """
+        records = [record for record in records if record.get("naziv")]
+        by_id = {record["id"]: record for record in records}
+        shingle_sets: Dict[int, Set[str]] = {}
+        candidates: Dict[Tuple[int, int], str] = {}
+
+        code_buckets: Dict[str, List[int]] = defaultdict(list)
+
+        for record in records:
+            record_id = record["id"]
+            for code in extract_call_codes(record["naziv"]):
+                code_buckets[code].append(record_id)
+            shingle_sets[record_id] = shingles(normalize_title(record["naziv"]), self.shingle_size)
+
+        for ids in code_buckets.values():
+            self._add_candidates(ids, candidates, "call_code")
+
+        ids = np.array([record["id"] for record in records if shingle_sets[record["id"]]], dtype=np.int64)
+        signatures = self.signatures([shingle_sets[record_id] for record_id in ids.tolist()])
+        for bucket in self._band_buckets(ids, signatures):
+            self._add_candidates(bucket, candidates, "minhash")
+
+        pairs = []
+        for (a, b), method in candidates.items():
+            if self.cross_source_only and self._same_source(by_id[a], by_id[b]):
+                continue
+            similarity = jaccard(shingle_sets[a], shingle_sets[b])
+            if similarity < (self.call_code_threshold if method == "call_code" else self.threshold):
+                continue
+            pairs.append((similarity, a, b, method))
+
+        union_find = _UnionFind()
+        sources = {record_id: record.get("izdavatelj_id") for record_id, record in by_id.items()}
+        similarities: Dict[int, Tuple[float, str]] = {}
+        for similarity, a, b, method in sorted(pairs, key=lambda pair: (-pair[0], pair[1], pair[2])):
+            if not union_find.union(a, b, sources if self.cross_source_only else None):
+                continue
+            for record_id in (a, b):
+                if similarity > similarities.get(record_id, (-1.0, ""))[0]:
+                    similarities[record_id] = (similarity, method)
+
+        links = []
+        for record_id in sorted(union_find.parent):
+            canonical_id = union_find.find(record_id)
+            if canonical_id == record_id:
+                continue
+            similarity, method = similarities.get(record_id, (0.0, "minhash"))
+            links.append({
+                "natjecaj_id": record_id,
+                "canonical_id": canonical_id,
+                "similarity": round(similarity, 3),
+                "method": method,
+            })
+        return links
+
+    def _band_buckets(self, ids: np.ndarray, signatures: np.ndarray) -> Iterable[List[int]]:
+        """Groups of ids sharing all values of at least one band (groups of 2+ only)"""
+        mix = self._a[:self.rows]
+        for band in range(self.bands):
+            band_values = signatures[:, band * self.rows:(band + 1) * self.rows]
+            # One 64-bit key per band; rare key collisions are filtered by the exact comparison
+            with np.errstate(over="ignore"):
+                keys = (band_values * mix).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind="stable")
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(keys[order])) + 1))
+            lengths = np.diff(np.append(starts, len(order)))
+            shared = lengths > 1
+            for start, length in zip(starts[shared].tolist(), lengths[shared].tolist()):
+                yield ids[order[start:start + length]].tolist()
+
+    def _add_candidates(self, ids: List[int], candidates: Dict[Tuple[int, int], str], method: str):
+        if len(ids) < 2 or len(ids) > self.max_bucket_size:
+            # Oversized buckets come from very generic titles - comparing them all would be quadratic
+            return
+        ids = sorted(set(ids))
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                if candidates.get((a, b)) != "call_code":
+                    candidates[(a, b)] = method
+
+    @staticmethod
+    def _same_source(a: Dict, b: Dict) -> bool:
+        source_a, source_b = a.get("izdavatelj_id"), b.get("izdavatelj_id")
+        return source_a is not None and source_a == source_b
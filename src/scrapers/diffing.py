@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import json
+
+AMOUNT_FIELDS = ("iznos_financiranja", "min_iznos", "max_iznos")
+CLOSED_STATUSES = ("closed", "expired")
+# Statuses of natjecaji still listed by their source
+OPEN_STATUSES = ("active", "forthcoming")
+
+
+def normalize_value(value: Any) -> Any:
+    """Normalize a field value so equal content compares (and hashes) equal"""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value or None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None, microsecond=0)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def content_hash(data: Dict[str, Any], fields: Optional[List[str]] = None) -> str:
+    """Stable hash of the normalized scraped fields"""
+    fields = sorted(fields if fields is not None else data.keys())
+    payload = {field: _json_value(normalize_value(data.get(field))) for field in fields}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def stored_values(natjecaj, fields: List[str]) -> Dict[str, Any]:
+    return {field: getattr(natjecaj, field, None) for field in fields}
+
+
+def diff_natjecaj(natjecaj, scraped: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Field-level diff of a scraped dict against the stored row.
+
+    Only fields the scraper provides are compared; a matching content hash
+    short-circuits the per-field comparison.
+    """
+    fields = list(scraped.keys())
+    current = stored_values(natjecaj, fields)
+    if content_hash(current, fields) == content_hash(scraped, fields):
+        return {}
+
+    return {
+        field: (current[field], scraped[field])
+        for field in fields
+        if normalize_value(current[field]) != normalize_value(scraped[field])
+    }
+
+
+def classify_changes(changes: Dict[str, Tuple[Any, Any]]) -> List[Tuple[str, Dict[str, Tuple[Any, Any]]]]:
+    """Split a diff into change events: (event_type, changed fields)"""
+    events = []
+    remaining = dict(changes)
+
+    if "status" in remaining:
+        old, new = remaining.pop("status")
+        if new in CLOSED_STATUSES and old not in CLOSED_STATUSES:
+            events.append(("closed", {"status": (old, new)}))
+        elif old in CLOSED_STATUSES and new not in CLOSED_STATUSES:
+            events.append(("reopened", {"status": (old, new)}))
+        else:
+            remaining["status"] = (old, new)
+
+    if "rok_prijave" in remaining:
+        events.append(("deadline_changed", {"rok_prijave": remaining.pop("rok_prijave")}))
+
+    amounts = {field: remaining.pop(field) for field in AMOUNT_FIELDS if field in remaining}
+    if amounts:
+        events.append(("amount_changed", amounts))
+
+    if remaining:
+        events.append(("updated", remaining))
+
+    return events
+
+
+def changes_to_json(changes: Dict[str, Tuple[Any, Any]]) -> str:
+    return json.dumps(
+        {field: {"old": _json_value(old), "new": _json_value(new)} for field, (old, new) in changes.items()},
+        ensure_ascii=False
+    )
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Set
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 import re
 import sys
@@ -8,6 +8,7 @@ from urllib.parse import urljoin
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.scrapers.base_scraper import BaseScraper
+from src.utils.hr_dates import parse_hr_date
 
 
 class HAMAGBICROScraper(BaseScraper):
@@ -23,24 +24,40 @@ class HAMAGBICROScraper(BaseScraper):
     
     def scrape(self) -> List[Dict]:
         """Scrape natječaji from HAMAG-BICRO website."""
+        natjecaji = list(self.stream())
+        self.log(f"Scraping completed. Found {len(natjecaji)} natjecaji.")
+        return natjecaji
+
+    def iter_pages(self) -> Iterator[Tuple[str, object]]:
+        """Yield ("wp", posts) pages from the WP API, or ("html", body) listing pages as fallback."""
         self.log("Starting scrape...")
-        natjecaji = self._scrape_via_wp_api()
-        if natjecaji:
-            self.log(f"Scraping completed via WP API. Found {len(natjecaji)} natjecaji.")
-            return natjecaji
+        found_posts = False
+        for posts in self._iter_wp_api_pages():
+            found_posts = found_posts or bool(posts)
+            yield "wp", posts
+        if found_posts:
+            return
 
         self.log("WP API scrape returned no data, falling back to HTML parsing.")
-        natjecaji = self._scrape_via_html()
-        self.log(f"Scraping completed via HTML fallback. Found {len(natjecaji)} natjecaji.")
-        return natjecaji
+        for html in self._iter_html_pages():
+            yield "html", html
+
+    def parse_page(self, page: Tuple[str, object]) -> List[Dict]:
+        kind, body = page
+        if kind == "wp":
+            natjecaji = [self._parse_wp_post(post) for post in body]
+        else:
+            cards = self.parse_html(body).select("div.post-wrapper article.news-v1")
+            natjecaji = [self._parse_html_card(card) for card in cards]
+        return [natjecaj for natjecaj in natjecaji if natjecaj]
 
     def _fetch_json(self, url: str, timeout: int = 30) -> Optional[dict]:
         try:
-            response = self.session.get(url, headers=self.headers, timeout=timeout)
-            response.raise_for_status()
+            response = self.request("GET", url, timeout=timeout)
             return response.json(), response.headers
         except Exception as e:
-            self.log(f"Error fetching JSON from {url}: {e}")
+            # Also a 200 response with invalid JSON - either way the page is missing
+            self.mark_incomplete(f"could not fetch JSON from {url}: {e}")
             return None
 
     def _get_category_id(self, category_slug: str) -> Optional[int]:
@@ -54,14 +71,11 @@ class HAMAGBICROScraper(BaseScraper):
             return None
         return categories[0].get("id")
 
-    def _scrape_via_wp_api(self) -> List[Dict]:
-        natjecaji: List[Dict] = []
-        seen_urls: Set[str] = set()
-
+    def _iter_wp_api_pages(self) -> Iterator[List[dict]]:
         category_id = self._get_category_id("natjecaji")
         if not category_id:
             self.log("Could not resolve 'natjecaji' category id from WP API.")
-            return natjecaji
+            return
 
         page = 1
         total_pages = 1
@@ -76,29 +90,16 @@ class HAMAGBICROScraper(BaseScraper):
                 break
 
             posts, headers = result
+            if not isinstance(posts, list):
+                self.mark_incomplete(f"unexpected WP API response for page {page}")
+                break
             try:
                 total_pages = int(headers.get("X-WP-TotalPages", "1"))
             except ValueError:
                 total_pages = 1
 
-            for post in posts:
-                natjecaj = self._parse_wp_post(post)
-                if not natjecaj:
-                    continue
-
-                post_url = natjecaj.get("url")
-                if post_url and post_url in seen_urls:
-                    continue
-
-                if post_url:
-                    seen_urls.add(post_url)
-
-                natjecaji.append(natjecaj)
-
+            yield posts
             page += 1
-            self.wait(0.2)
-
-        return natjecaji
 
     def _parse_wp_post(self, post: dict) -> Optional[Dict]:
         title_html = post.get("title", {}).get("rendered", "")
@@ -139,42 +140,21 @@ class HAMAGBICROScraper(BaseScraper):
 
         return natjecaj
 
-    def _scrape_via_html(self) -> List[Dict]:
-        natjecaji: List[Dict] = []
-        seen_urls: Set[str] = set()
-
+    def _iter_html_pages(self) -> Iterator[str]:
         max_pages = self._discover_max_pages(self.listing_url)
 
         for page in range(1, max_pages + 1):
             page_url = self.listing_url if page == 1 else f"{self.listing_url}page/{page}/"
             html = self.fetch_page(page_url)
-            if not html:
-                continue
-
-            soup = self.parse_html(html)
-            cards = soup.select("div.post-wrapper article.news-v1")
-
-            for card in cards:
-                natjecaj = self._parse_html_card(card)
-                if not natjecaj:
-                    continue
-
-                post_url = natjecaj.get("url")
-                if post_url and post_url in seen_urls:
-                    continue
-
-                if post_url:
-                    seen_urls.add(post_url)
-
-                natjecaji.append(natjecaj)
-
-            self.wait(0.2)
-
-        return natjecaji
+            if html:
+                yield html
+            else:
+                self.mark_incomplete(f"listing page {page} could not be fetched")
 
     def _discover_max_pages(self, first_page_url: str) -> int:
         html = self.fetch_page(first_page_url)
         if not html:
+            self.mark_incomplete("listing pagination could not be read")
             return 1
 
         soup = self.parse_html(html)
@@ -201,7 +181,7 @@ class HAMAGBICROScraper(BaseScraper):
 
         date_text_elem = card.select_one(".ffb-date-5-1")
         date_text = self.clean_text(date_text_elem.get_text()) if date_text_elem else ""
-        datum_objave = self._parse_hr_date(date_text)
+        datum_objave = parse_hr_date(date_text)
 
         return {
             "naziv": title,
@@ -241,42 +221,6 @@ class HAMAGBICROScraper(BaseScraper):
         except ValueError:
             return None
 
-    def _parse_hr_date(self, date_str: str) -> Optional[datetime]:
-        if not date_str:
-            return None
-
-        month_map = {
-            "siječnja": 1,
-            "veljače": 2,
-            "ožujka": 3,
-            "travnja": 4,
-            "svibnja": 5,
-            "lipnja": 6,
-            "srpnja": 7,
-            "kolovoza": 8,
-            "rujna": 9,
-            "listopada": 10,
-            "studenoga": 11,
-            "prosinca": 12,
-        }
-
-        match = re.search(r"(\d{1,2})\.\s*([a-zčćđšž]+)\s*(\d{4})\.", date_str.lower())
-        if not match:
-            return None
-
-        day = int(match.group(1))
-        month_name = match.group(2)
-        year = int(match.group(3))
-        month = month_map.get(month_name)
-
-        if not month:
-            return None
-
-        try:
-            return datetime(year, month, day)
-        except ValueError:
-            return None
-
 
 # Test scraper
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+import json
+import math
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.scrapers.base_scraper import BaseScraper
+from src.utils.tracing import in_current_context
+
+# Search API behind the EU Funding & Tenders portal (public "SEDIA" key)
+SEARCH_API_URL = "https://api.tech.ec.europa.eu/search-api/prod/rest/search"
+SEARCH_API_KEY = "SEDIA"
+TOPIC_URL = "https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/opportunities/topic-details/{}"
+
+HORIZON_EUROPE_PROGRAMME = "43108390"
+STATUS_FORTHCOMING = "31094501"
+STATUS_OPEN = "31094502"
+STATUS_CLOSED = "31094503"
+
+STATUS_MAP = {
+    STATUS_OPEN: "active",
+    STATUS_FORTHCOMING: "forthcoming",
+    STATUS_CLOSED: "closed",
+}
+
+# Topic identifier prefixes -> podrucje_istrazivanja
+PODRUCJE_PREFIXES = [
+    ("HORIZON-HLTH", "Medicina"),
+    ("HORIZON-CL1", "Medicina"),
+    ("HORIZON-CL2", "Društvene znanosti"),
+    ("HORIZON-CL4", "ICT"),
+    ("HORIZON-EIC", "ICT"),
+]
+
+
+class HorizonEuropeScraper(BaseScraper):
+    """
+    Scraper for Horizon Europe calls on the EU Funding & Tenders portal.
+
+    Uses the portal's JSON search API instead of the JavaScript front end:
+    the first page gives the total, the remaining pages are fetched
+    concurrently (up to `concurrency` at a time, within the rate limit)
+    and streamed to the parse stage as they arrive.
+    """
+
+    def __init__(self, search_url: str = SEARCH_API_URL, page_size: int = 100, max_pages: int = 100):
+        super().__init__(
+            source_name="Horizon Europe",
+            base_url="https://ec.europa.eu/info/funding-tenders/opportunities/portal"
+        )
+        self.search_url = search_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+    def scrape(self) -> List[Dict]:
+        """Scrape all open and forthcoming Horizon Europe topics."""
+        natjecaji = list(self.stream())
+        self.log(f"Scraping completed. Found {len(natjecaji)} natjecaji.")
+        return natjecaji
+
+    def iter_pages(self) -> Iterator[Dict]:
+        """Yield search result pages; pages after the first are fetched concurrently."""
+        self.log("Starting scrape via search API...")
+        first_page = self._fetch_search_page(1)
+        if first_page is None:
+            self.log("Search API returned no data")
+            return
+
+        total = int(first_page.get("totalResults") or 0)
+        page_count = max(math.ceil(total / self.page_size), 1)
+        if page_count > self.max_pages:
+            self.mark_incomplete(f"{total} topics in {page_count} pages, only the first {self.max_pages} are fetched")
+            page_count = self.max_pages
+        self.log(f"{total} topics in {page_count} pages")
+        yield first_page
+
+        remaining = iter(range(2, page_count + 1))
+        # Only a small window of pages is in flight so memory stays bounded
+        # when the consumer is slower than the API
+        window = self.concurrency * 2
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="horizon") as pool:
+            # Fetch spans in the pool threads belong to the current scrape trace
+            fetch_page = in_current_context(self._fetch_search_page)
+            pending = {pool.submit(fetch_page, page) for page in islice(remaining, window)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    next_page = next(remaining, None)
+                    if next_page is not None:
+                        pending.add(pool.submit(fetch_page, next_page))
+                    data = future.result()
+                    if data is not None:
+                        yield data
+
+    def parse_page(self, page: Dict) -> List[Dict]:
+        natjecaji = [self._parse_result(result) for result in page.get("results") or []]
+        return [natjecaj for natjecaj in natjecaji if natjecaj]
+
+    def _search_query(self) -> Dict:
+        return {
+            "bool": {
+                "must": [
+                    {"terms": {"type": ["1", "2", "8"]}},
+                    {"terms": {"status": [STATUS_FORTHCOMING, STATUS_OPEN]}},
+                    {"term": {"frameworkProgramme": HORIZON_EUROPE_PROGRAMME}},
+                ]
+            }
+        }
+
+    def _fetch_search_page(self, page: int, timeout: int = 60) -> Optional[Dict]:
+        params = {
+            "apiKey": SEARCH_API_KEY,
+            "text": "***",
+            "pageSize": self.page_size,
+            "pageNumber": page,
+        }
+        # The API expects the query as multipart form fields with JSON content
+        files = {
+            "query": (None, json.dumps(self._search_query()), "application/json"),
+            "languages": (None, json.dumps(["en"]), "application/json"),
+            "sort": (None, json.dumps({"field": "deadlineDate", "order": "ASC"}), "application/json"),
+        }
+        try:
+            response = self.request("POST", self.search_url, params=params, files=files, timeout=timeout)
+            return response.json()
+        except Exception as e:
+            self.mark_incomplete(f"search page {page} failed: {e}")
+            return None
+
+    def _parse_result(self, result: Dict) -> Optional[Dict]:
+        try:
+            metadata = result.get("metadata") or {}
+            identifier = self._first(metadata, "identifier") or result.get("reference")
+            title = self.clean_text(self._first(metadata, "title") or result.get("title") or "")
+            if not identifier or not title:
+                return None
+
+            description = self._first(metadata, "descriptionByte") or self._first(metadata, "description") or result.get("summary")
+            opis = self.clean_text(self.parse_html(description).get_text(" ")) if description else ""
+
+            deadlines = [self._parse_api_date(value) for value in metadata.get("deadlineDate") or []]
+            deadlines = [deadline for deadline in deadlines if deadline]
+            budget = self._parse_budget(self._first(metadata, "budgetOverview"), identifier)
+            status = STATUS_MAP.get(self._first(metadata, "status"), "active")
+
+            return {
+                "naziv": f"{title} ({identifier})"[:500],
+                "url": TOPIC_URL.format(identifier.lower()),
+                "opis": opis[:2500],
+                "kategorija": "Znanstveno istraživanje",
+                "podrucje_istrazivanja": self._resolve_podrucje(identifier),
+                "iznos_financiranja": budget["total"],
+                "min_iznos": budget["min"],
+                "max_iznos": budget["max"],
+                "datum_objave": self._parse_api_date(self._first(metadata, "startDate")),
+                # Multi-stage topics list one deadline per stage - the first one matters
+                "rok_prijave": min(deadlines) if deadlines else None,
+                "status": status,
+            }
+        except Exception as e:
+            self.log(f"Error parsing search result: {e}")
+            return None
+
+    def _parse_budget(self, overview: Optional[str], identifier: str) -> Dict[str, Optional[float]]:
+        """
+        Topic budget from the budgetOverview JSON string.
+
+        Sums the yearly budgets of the actions belonging to the topic and
+        takes the smallest/largest expected EU contribution per project.
+        """
+        budget = {"total": None, "min": None, "max": None}
+        if not overview:
+            return budget
+        try:
+            action_map = json.loads(overview).get("budgetTopicActionMap") or {}
+        except (TypeError, ValueError):
+            return budget
+
+        actions = [action for actions in action_map.values() for action in actions or []]
+        own_actions = [action for action in actions if str(action.get("action", "")).startswith(identifier)]
+        actions = own_actions or actions
+
+        total = 0.0
+        minimums: List[float] = []
+        maximums: List[float] = []
+        for action in actions:
+            for amount in (action.get("budgetYearMap") or {}).values():
+                total += self._to_float(amount) or 0.0
+            minimum = self._to_float(action.get("minContribution"))
+            maximum = self._to_float(action.get("maxContribution"))
+            if minimum:
+                minimums.append(minimum)
+            if maximum:
+                maximums.append(maximum)
+
+        budget["total"] = total or None
+        budget["min"] = min(minimums) if minimums else None
+        budget["max"] = max(maximums) if maximums else None
+        return budget
+
+    def _resolve_podrucje(self, identifier: str) -> str:
+        for prefix, podrucje in PODRUCJE_PREFIXES:
+            if identifier.startswith(prefix):
+                return podrucje
+        return "Multidisciplinarno"
+
+    @staticmethod
+    def _first(metadata: Dict, key: str) -> Optional[str]:
+        values = metadata.get(key)
+        if isinstance(values, list):
+            return values[0] if values else None
+        return values
+
+    @staticmethod
+    def _to_float(value) -> Optional[float]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse_api_date(value: Optional[str]) -> Optional[datetime]:
+        """Parse "2025-09-16T17:00:00.000+0000" or "2025-09-16" (times are UTC)"""
+        if not value:
+            return None
+        for fmt, length in (("%Y-%m-%dT%H:%M:%S", 19), ("%Y-%m-%d", 10)):
+            try:
+                return datetime.strptime(value[:length], fmt)
+            except ValueError:
+                continue
+        return None
+
+
+if __name__ == "__main__":
+    scraper = HorizonEuropeScraper()
+    results = scraper.scrape()
+    print(f"\nFound {len(results)} natjecaji")
+    for i, natjecaj in enumerate(results[:10], 1):
+        print(f"{i}. {natjecaj['naziv']} - rok: {natjecaj['rok_prijave']}")
@@ -1,5 +1,4 @@
-from typing import List, Dict, Optional, Set
-from datetime import datetime
+from typing import Iterator, List, Dict, Optional
 import re
 import sys
 import os
@@ -9,18 +8,28 @@ from urllib.parse import urljoin
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.scrapers.base_scraper import BaseScraper
-
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
+from src.utils.hr_dates import find_deadline, find_publish_date
+
+# Selenium is heavy - it is imported on the first scrape, not with this module
+webdriver = Options = By = WebDriverWait = EC = None
+TimeoutException = NoSuchElementException = None
+
+
+def _load_selenium() -> bool:
+    """Import Selenium into module globals. Returns False if it is not installed."""
+    global webdriver, Options, By, WebDriverWait, EC, TimeoutException, NoSuchElementException
+    if webdriver is not None:
+        return True
+    try:
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+        from selenium import webdriver
+    except ImportError:
+        return False
+    return True
 
 
 class HRZZScraper(BaseScraper):
@@ -35,19 +44,22 @@ class HRZZScraper(BaseScraper):
     
     def scrape(self) -> List[Dict]:
         """Scrape otvoreni natječaji from HRZZ website using Selenium for accordion clicking."""
+        natjecaji = list(self.stream())
+        self.log(f"Scraping completed. Found {len(natjecaji)} natjecaji.")
+        return natjecaji
+    
+    def iter_natjecaji(self) -> Iterator[Dict]:
+        """Yield natječaji one by one while the accordion items are expanded."""
         self.log("Starting scrape with Selenium accordion expansion...")
         
-        if not SELENIUM_AVAILABLE:
+        if not _load_selenium():
             self.log("ERROR: Selenium not available. Install with: pip install selenium")
-            return []
-        
-        natjecaji: List[Dict] = []
-        seen_keys: Set[str] = set()
+            return
         
         driver = self._create_driver()
         if not driver:
-            self.log("Failed to create Selenium driver")
-            return natjecaji
+            self.mark_incomplete("failed to create Selenium driver")
+            return
         
         try:
             self.log(f"Loading page: {self.open_calls_url}")
@@ -86,25 +98,19 @@ class HRZZScraper(BaseScraper):
                     natjecaj_data = self._parse_accordion_item(driver, toggler, title_text)
                     
                     if natjecaj_data:
-                        dedupe_key = (natjecaj_data.get("url") or "") + "|" + natjecaj_data.get("naziv", "")
-                        if dedupe_key not in seen_keys:
-                            seen_keys.add(dedupe_key)
-                            natjecaji.append(natjecaj_data)
-                            self.log(f"[{idx+1}/{len(togglers)}] Found: {natjecaj_data['naziv']}")
+                        self.log(f"[{idx+1}/{len(togglers)}] Found: {natjecaj_data['naziv']}")
+                        yield natjecaj_data
                     
                 except Exception as e:
-                    self.log(f"Error processing accordion item {idx+1}: {e}")
+                    self.mark_incomplete(f"accordion item {idx+1} could not be read: {e}")
                     continue
             
         except TimeoutException:
-            self.log("Timeout waiting for accordion elements to load")
+            self.mark_incomplete("timeout waiting for accordion elements to load")
         except Exception as e:
-            self.log(f"Error during scraping: {e}")
+            self.mark_incomplete(f"error during scraping: {e}")
         finally:
             driver.quit()
-        
-        self.log(f"Scraping completed. Found {len(natjecaji)} natjecaji.")
-        return natjecaji
     
     def _create_driver(self):
         """Create headless Chrome driver."""
@@ -153,8 +159,8 @@ class HRZZScraper(BaseScraper):
                 "opis": opis,
                 "kategorija": "Znanstveno istraživanje",
                 "podrucje_istrazivanja": "Multidisciplinarno",
-                "datum_objave": self._extract_publish_date(raw_text),
-                "rok_prijave": self._extract_deadline(raw_text),
+                "datum_objave": find_publish_date(raw_text),
+                "rok_prijave": find_deadline(raw_text),
                 "status": "active",
                 "izvor": self.source_name,
             }
@@ -194,56 +200,6 @@ class HRZZScraper(BaseScraper):
             return fallback[0]
         return self.open_calls_url
 
-    def _extract_publish_date(self, text: str) -> Optional[datetime]:
-        match = re.search(r"datum\s+raspisivanja[^:]*:\s*([^\.]+\.)", text, flags=re.IGNORECASE)
-        if not match:
-            return None
-        return self._parse_hr_date(match.group(1))
-
-    def _extract_deadline(self, text: str) -> Optional[datetime]:
-        match = re.search(r"rok\s+za\s+prijavu[^:]*:\s*([^\.]+\.)", text, flags=re.IGNORECASE)
-        if not match:
-            return None
-        return self._parse_hr_date(match.group(1))
-
-    def _parse_hr_date(self, date_text: str) -> Optional[datetime]:
-        months = {
-            "siječnja": 1,
-            "veljače": 2,
-            "ožujka": 3,
-            "travnja": 4,
-            "svibnja": 5,
-            "lipnja": 6,
-            "srpnja": 7,
-            "kolovoza": 8,
-            "rujna": 9,
-            "listopada": 10,
-            "studenoga": 11,
-            "studenog": 11,
-            "prosinca": 12,
-        }
-
-        normalized = self.clean_text(date_text.lower())
-        match = re.search(r"(\d{1,2})\.\s*([a-zčćđšž]+)\s*(\d{4})\.", normalized)
-        if not match:
-            return None
-
-        day = int(match.group(1))
-        month_name = match.group(2)
-        year = int(match.group(3))
-        month = months.get(month_name)
-        if not month:
-            return None
-
-        time_match = re.search(r"(\d{1,2})[:\.](\d{2})", normalized)
-        hour = int(time_match.group(1)) if time_match else 0
-        minute = int(time_match.group(2)) if time_match else 0
-
-        try:
-            return datetime(year, month, day, hour, minute)
-        except ValueError:
-            return None
-
 
 if __name__ == "__main__":
     scraper = HRZZScraper()
@@ -0,0 +1,351 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from loguru import logger
+import importlib
+import inspect
+import multiprocessing
+import queue
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.metrics import SCRAPER_PARSE_DURATION
+from src.utils.tracing import in_current_context, record_span, span
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    """Carries a stage exception downstream to the consumer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def normalize_natjecaj(data: Dict) -> Optional[Dict]:
+    """Trim strings, turn empty strings into None and drop records without naziv"""
+    natjecaj = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            value = value.strip() or None
+        natjecaj[key] = value
+    if natjecaj.get("naziv"):
+        natjecaj["naziv"] = " ".join(natjecaj["naziv"].split())[:500]
+    else:
+        return None
+    return natjecaj
+
+
+def dedup_filter() -> Callable[[Dict], List[Dict]]:
+    """Stage dropping records already seen in this run (same URL and naziv)"""
+    seen = set()
+
+    def stage(natjecaj: Dict) -> List[Dict]:
+        key = (natjecaj.get("url"), natjecaj["naziv"])
+        if key in seen:
+            return []
+        seen.add(key)
+        return [natjecaj]
+
+    return stage
+
+
+def create_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for the parse stage.
+
+    Workers are started by a forkserver (spawn where that is unavailable),
+    not forked: the API and scheduler processes run threads, and a forked
+    child would inherit their held locks. Worker processes start on the
+    first submitted page.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+class ScrapePipeline:
+    """
+    Streaming scrape: fetch -> parse -> normalize -> dedup, one thread per stage.
+
+    Stages are connected by bounded queues, so a slow consumer (the database
+    writer) applies back-pressure all the way to the fetcher and memory stays
+    constant regardless of the size of the source. Scrapers that implement
+    iter_pages/parse_page get separate fetch and parse stages; others are
+    streamed through iter_natjecaji (or scrape() for plain scrapers).
+
+    With parse_workers > 0 the parse stage of page-based scrapers runs in a
+    process pool, so CPU-bound HTML parsing and field extraction use several
+    cores while the fetch thread keeps downloading. Pass `pool` (see
+    create_parse_pool) to reuse worker processes across runs - the pipeline
+    then leaves it running; otherwise it creates and shuts down its own.
+
+    An exception in any stage is re-raised to the consumer; when the consumer
+    stops early the stages are stopped and the scraper's generator is closed.
+    """
+
+    def __init__(self, scraper, queue_size: int = 64, parse_workers: int = 0,
+                 pool: Optional[ProcessPoolExecutor] = None):
+        self.scraper = scraper
+        self.queue_size = queue_size
+        self.parse_workers = parse_workers
+        self.pool = pool
+
+    def __iter__(self) -> Iterator[Dict]:
+        for item in self._run(idle_timeout=None):
+            yield item
+
+    def batches(self, batch_size: int = 100, max_delay: Optional[float] = None) -> Iterator[List[Dict]]:
+        """
+        Group the stream into batches for the writer.
+
+        A batch is emitted when it is full or, with max_delay, when its first
+        record has waited that many seconds - slow sources still save partial
+        results regularly.
+        """
+        batch: List[Dict] = []
+        first_at = 0.0
+        idle_timeout = _POLL_SECONDS if max_delay else None
+        for item in self._run(idle_timeout=idle_timeout):
+            if item is not None:
+                if not batch:
+                    first_at = time.monotonic()
+                batch.append(item)
+            if batch and (len(batch) >= batch_size or (max_delay and time.monotonic() - first_at >= max_delay)):
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _plan(self, pool: Optional[ProcessPoolExecutor]):
+        """Source iterable and the stages after it"""
+        scraper = self.scraper
+        tail = [_single(normalize_natjecaj), dedup_filter()]
+        if callable(getattr(scraper, "iter_pages", None)) and getattr(scraper, "supports_pages", False):
+            if pool is not None:
+                return scraper.iter_pages, [_ProcessStage(pool, scraper, self.parse_workers * 2)] + tail
+            return scraper.iter_pages, [_timed_parse(scraper)] + tail
+        if callable(getattr(scraper, "iter_natjecaji", None)):
+            return scraper.iter_natjecaji, tail
+        return scraper.scrape, tail
+
+    def _run(self, idle_timeout: Optional[float]) -> Iterator[Any]:
+        pool = own_pool = None
+        if (self.parse_workers > 0 and getattr(self.scraper, "supports_pages", False)
+                and _ProcessStage.supports(self.scraper)):
+            pool = self.pool
+            if pool is None:
+                pool = own_pool = create_parse_pool(self.parse_workers)
+        source, stages = self._plan(pool)
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(stages) + 1)]
+        name = getattr(self.scraper, "source_name", type(self.scraper).__name__)
+
+        # Stage threads run in the caller's trace context, so fetch/parse spans
+        # are children of the current scrape span
+        threads = [threading.Thread(
+            target=in_current_context(_produce),
+            args=(source, queues[0], stop),
+            name=f"{name}-fetch",
+            daemon=True
+        )]
+        for index, stage in enumerate(stages):
+            runner = _transform_parallel if isinstance(stage, _ProcessStage) else _transform
+            threads.append(threading.Thread(
+                target=in_current_context(runner),
+                args=(stage, queues[index], queues[index + 1], stop),
+                name=f"{name}-stage{index + 1}",
+                daemon=True
+            ))
+        for thread in threads:
+            thread.start()
+
+        output = queues[-1]
+        try:
+            while True:
+                try:
+                    item = output.get(timeout=idle_timeout)
+                except queue.Empty:
+                    yield None
+                    continue
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=1.0)
+            if own_pool is not None:
+                own_pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Scraper instances created inside parse worker processes, by "module:Class"
+_worker_scrapers: Dict[str, Any] = {}
+
+
+def _parse_in_worker(scraper_path: str, page: Any) -> Tuple[float, List[Dict]]:
+    """Runs in a worker process: parse one page with a (cached) scraper instance"""
+    scraper = _worker_scrapers.get(scraper_path)
+    if scraper is None:
+        module_name, _, class_name = scraper_path.partition(":")
+        scraper = getattr(importlib.import_module(module_name), class_name)()
+        _worker_scrapers[scraper_path] = scraper
+    start = time.perf_counter()
+    natjecaji = scraper.parse_page(page)
+    # Metrics live in the parent process - the duration is sent back with the result
+    return time.perf_counter() - start, natjecaji
+
+
+class _ProcessStage:
+    """
+    Parse stage running scraper.parse_page in a process pool.
+
+    Only the raw page and the scraper's import path cross the process
+    boundary - the scraper itself (session, locks, callbacks) is not pickled.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, scraper, window: int):
+        self.pool = pool
+        self.scraper_path = f"{type(scraper).__module__}:{type(scraper).__name__}"
+        self.source_name = getattr(scraper, "source_name", type(scraper).__name__)
+        self.window = max(window, 1)
+
+    def submit(self, page: Any):
+        return self.pool.submit(_parse_in_worker, self.scraper_path, page)
+
+    @staticmethod
+    def supports(scraper) -> bool:
+        """
+        Whether a worker process can rebuild the scraper: an importable class
+        whose constructor needs no arguments. Others are parsed in-thread.
+        """
+        cls = type(scraper)
+        module = sys.modules.get(cls.__module__)
+        reason = None
+        if cls.__module__ == "__main__" or "<locals>" in cls.__qualname__ or getattr(module, cls.__name__, None) is not cls:
+            reason = "its class cannot be imported by name"
+        else:
+            try:
+                parameters = list(inspect.signature(cls).parameters.values())
+            except (TypeError, ValueError):
+                parameters = []
+            required = [
+                parameter.name for parameter in parameters
+                if parameter.default is inspect.Parameter.empty
+                and parameter.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            ]
+            if required:
+                reason = f"its constructor requires {', '.join(required)}"
+        if reason:
+            source_name = getattr(scraper, "source_name", cls.__name__)
+            logger.bind(source=source_name).warning(f"{source_name}: parsing in-thread, not in worker processes - {reason}")
+            return False
+        return True
+
+
+def _timed_parse(scraper) -> Callable[[Any], List[Dict]]:
+    source_name = getattr(scraper, "source_name", type(scraper).__name__)
+
+    def stage(page: Any) -> List[Dict]:
+        with span("scrape.parse", source=source_name) as parse_span:
+            start = time.perf_counter()
+            natjecaji = scraper.parse_page(page)
+            SCRAPER_PARSE_DURATION.observe(time.perf_counter() - start, source_name)
+            parse_span.set(natjecaji=len(natjecaji))
+        return natjecaji
+    return stage
+
+
+def _single(function: Callable[[Dict], Optional[Dict]]) -> Callable[[Dict], List[Dict]]:
+    def stage(item: Dict) -> List[Dict]:
+        result = function(item)
+        return [result] if result is not None else []
+    return stage
+
+
+def _put(target: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(source: Callable[[], Iterable], target: queue.Queue, stop: threading.Event):
+    iterator = None
+    try:
+        iterator = iter(source())
+        for item in iterator:
+            if not _put(target, item, stop):
+                break
+        _put(target, _DONE, stop)
+    except BaseException as e:
+        _put(target, _Failure(e), stop)
+    finally:
+        # Runs the scraper's cleanup (e.g. closing a browser) on its own thread
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+
+
+def _transform(stage: Callable[[Any], Iterable], source: queue.Queue, target: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            item = source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if item is _DONE or isinstance(item, _Failure):
+            _put(target, item, stop)
+            return
+        try:
+            for result in stage(item):
+                if not _put(target, result, stop):
+                    return
+        except Exception as e:
+            _put(target, _Failure(e), stop)
+            return
+
+
+def _transform_parallel(stage: _ProcessStage, source: queue.Queue, target: queue.Queue, stop: threading.Event):
+    """Keep up to stage.window pages in the pool and forward results as they complete"""
+    pending = set()
+    end = None
+    try:
+        while not stop.is_set():
+            while end is None and len(pending) < stage.window:
+                try:
+                    item = source.get_nowait() if pending else source.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    break
+                if item is _DONE or isinstance(item, _Failure):
+                    end = item
+                    break
+                pending.add(stage.submit(item))
+
+            if pending:
+                done, pending = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        elapsed, results = future.result()
+                    except Exception as e:
+                        _put(target, _Failure(e), stop)
+                        return
+                    SCRAPER_PARSE_DURATION.observe(elapsed, stage.source_name)
+                    record_span("scrape.parse", elapsed, source=stage.source_name, natjecaji=len(results), process=True)
+                    for result in results:
+                        if not _put(target, result, stop):
+                            return
+            elif end is not None:
+                _put(target, end, stop)
+                return
+    finally:
+        # The pool may be shared with later runs - drop this run's queued pages
+        for future in pending:
+            future.cancel()
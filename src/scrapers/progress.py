@@ -0,0 +1,301 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from loguru import logger
+import json
+import socket
+import threading
+import time
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.settings import settings
+from src.database.database import get_db_session
+from src.database import crud
+
+RUN_LOCK_NAME = "scrape-run"
+
+
+class ScrapeRunAborted(RuntimeError):
+    """The run must stop - e.g. another worker took over its lock"""
+
+
+class ScrapeProgress:
+    """
+    Thread-safe progress of the current (or last) scraping run.
+
+    Every change bumps `version`; the SSE stream polls snapshot() and sends
+    an event whenever the version differs from the last one sent.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self.run_id: Optional[str] = None
+        self.state = "idle"
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.sources: Dict[str, Dict] = {}
+        self.statistics: Optional[Dict] = None
+        self._started_monotonic: Optional[float] = None
+        self._finished_monotonic: Optional[float] = None
+
+    def is_running(self) -> bool:
+        return self.state == "running"
+
+    def check_active(self):
+        """Raise ScrapeRunAborted if the current run must stop; called between sources and batches"""
+
+    def start_run(self, source_names: List[str]) -> str:
+        """Reset progress for a new run. Raises RuntimeError if a run is in progress."""
+        with self._lock:
+            if self.state == "running":
+                raise RuntimeError("Scraping is already running")
+            self.run_id = uuid.uuid4().hex[:12]
+            self.state = "running"
+            self.started_at = datetime.utcnow()
+            self.finished_at = None
+            self.statistics = None
+            self._started_monotonic = time.monotonic()
+            self._finished_monotonic = None
+            self.sources = {
+                name: {
+                    'status': 'pending',
+                    'items_found': 0,
+                    'added': 0,
+                    'updated': 0,
+                    'error': None,
+                    'elapsed': None,
+                    '_started': None
+                }
+                for name in source_names
+            }
+            self._changed()
+            run_id = self.run_id
+        self._store()
+        return run_id
+
+    def source_started(self, name: str):
+        with self._lock:
+            source = self.sources.setdefault(name, {'items_found': 0, 'added': 0, 'updated': 0, 'error': None})
+            source['status'] = 'running'
+            source['_started'] = time.monotonic()
+            self._changed()
+        self._store()
+
+    def items_found(self, name: str, count: int):
+        with self._lock:
+            if name in self.sources and self.sources[name]['items_found'] != count:
+                self.sources[name]['items_found'] = count
+                self._changed()
+        self._store()
+
+    def source_finished(self, name: str, found: int, added: int, updated: int):
+        with self._lock:
+            source = self.sources[name]
+            source.update(status='success', items_found=found, added=added, updated=updated)
+            source['elapsed'] = self._source_elapsed(source)
+            self._changed()
+        self._store()
+
+    def source_failed(self, name: str, error: str):
+        with self._lock:
+            source = self.sources[name]
+            source.update(status='failed', error=error)
+            source['elapsed'] = self._source_elapsed(source)
+            self._changed()
+        self._store()
+
+    def finish_run(self, statistics: Optional[Dict] = None, error: Optional[str] = None):
+        with self._lock:
+            self.state = "failed" if error else "finished"
+            self.finished_at = datetime.utcnow()
+            self._finished_monotonic = time.monotonic()
+            self.statistics = statistics if statistics is not None else {'error': error}
+            self._changed()
+        self._store()
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of the current progress"""
+        with self._lock:
+            sources = []
+            for name, source in self.sources.items():
+                item = {key: value for key, value in source.items() if not key.startswith('_')}
+                if source['status'] == 'running':
+                    item['elapsed'] = self._source_elapsed(source)
+                sources.append({'name': name, **item})
+
+            return {
+                'run_id': self.run_id,
+                'state': self.state,
+                'version': self.version,
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+                'elapsed': self._run_elapsed(),
+                'items_found': sum(source['items_found'] for source in self.sources.values()),
+                'sources': sources,
+                'statistics': self.statistics
+            }
+
+    def _changed(self):
+        """Called with the lock held after every change"""
+        self.version += 1
+
+    def _store(self):
+        """Called after a change once the lock is released (persistence hook)"""
+
+    def _run_elapsed(self) -> Optional[float]:
+        if self._started_monotonic is None:
+            return None
+        end = self._finished_monotonic or time.monotonic()
+        return round(end - self._started_monotonic, 1)
+
+    @staticmethod
+    def _source_elapsed(source: Dict) -> Optional[float]:
+        if not source.get('_started'):
+            return None
+        return round(time.monotonic() - source['_started'], 1)
+
+
+class SharedScrapeProgress(ScrapeProgress):
+    """
+    ScrapeProgress shared between API worker processes through the database.
+
+    Starting a run takes the "scrape-run" lock row, so only one worker runs
+    scrapers at a time. The worker executing the run writes its snapshot to
+    scrape_runs on every status change (counters at most every
+    `persist_interval` seconds), after releasing the progress lock so readers
+    never wait on the database; the other workers answer progress requests
+    and SSE streams from that row.
+
+    While a run is in progress a heartbeat thread renews the lock every
+    `heartbeat_interval` seconds (a third of SCRAPE_RUN_LOCK_SECONDS), however
+    long a source stays silent. If the running worker dies, its lock expires
+    and the run is reported as failed; if a renewal finds the lock taken by
+    another worker, check_active() stops this run.
+    """
+
+    def __init__(self, persist_interval: float = 1.0, heartbeat_interval: Optional[float] = None):
+        super().__init__()
+        self.holder = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.persist_interval = persist_interval
+        self.heartbeat_interval = heartbeat_interval or settings.scrape_run_lock_seconds / 3
+        self.lock_lost = False
+        self._heartbeat_stop: Optional[threading.Event] = None
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._persisted_at = 0.0
+        self._persisted_signature = None
+        # Snapshot taken under the lock, written by _store() after it is released
+        self._unsaved: Optional[Dict] = None
+        self._store_lock = threading.Lock()
+        self._stored_version = -1
+
+    def _running_here(self) -> bool:
+        return self.state == "running"
+
+    def is_running(self) -> bool:
+        if self._running_here():
+            return True
+        shared = self._shared_snapshot()
+        return shared is not None and shared["state"] == "running"
+
+    def check_active(self):
+        if self.lock_lost:
+            raise ScrapeRunAborted("Scrape run lock was taken over by another worker")
+
+    def start_run(self, source_names: List[str]) -> str:
+        with get_db_session() as db:
+            if not crud.acquire_scheduler_lock(db, RUN_LOCK_NAME, self.holder, settings.scrape_run_lock_seconds):
+                raise RuntimeError("Scraping is already running")
+        run_id = super().start_run(source_names)
+        self.lock_lost = False
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat,
+            args=(self._heartbeat_stop,),
+            name=f"scrape-lock-{run_id}",
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+        return run_id
+
+    def _heartbeat(self, stop: threading.Event):
+        """Renew the run lock until the run finishes"""
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                with get_db_session() as db:
+                    renewed = crud.acquire_scheduler_lock(db, RUN_LOCK_NAME, self.holder, settings.scrape_run_lock_seconds)
+            except Exception as e:
+                # The lock outlives a few missed renewals
+                logger.warning(f"Could not renew the scrape run lock: {e}")
+                continue
+            if not renewed:
+                logger.error("Scrape run lock was taken over by another worker, stopping the run")
+                self.lock_lost = True
+                return
+
+    def finish_run(self, statistics: Optional[Dict] = None, error: Optional[str] = None):
+        if self._heartbeat_stop is not None:
+            self._heartbeat_stop.set()
+        # A renewal in flight must not take the lock again after it is released
+        if self._heartbeat_thread is not None and self._heartbeat_thread is not threading.current_thread():
+            self._heartbeat_thread.join()
+        self._heartbeat_thread = None
+        super().finish_run(statistics, error)
+        try:
+            with get_db_session() as db:
+                crud.release_scheduler_lock(db, RUN_LOCK_NAME, self.holder)
+        except Exception as e:
+            logger.warning(f"Could not release the scrape run lock: {e}")
+
+    def snapshot(self) -> Dict:
+        if self._running_here():
+            return super().snapshot()
+        shared = self._shared_snapshot()
+        if shared is None or shared["run_id"] == self.run_id:
+            return super().snapshot()
+        return shared
+
+    def _changed(self):
+        super()._changed()
+        if self.run_id is None:
+            return
+        # Status changes are written at once, counter updates are throttled
+        signature = (self.state, tuple(source.get("status") for source in self.sources.values()))
+        now = time.monotonic()
+        if signature == self._persisted_signature and now - self._persisted_at < self.persist_interval:
+            return
+        self._persisted_signature = signature
+        self._persisted_at = now
+        self._unsaved = super().snapshot()
+
+    def _store(self):
+        with self._lock:
+            snapshot, self._unsaved = self._unsaved, None
+        if snapshot is None:
+            return
+        # Writers race once the lock is released - never overwrite a newer snapshot
+        with self._store_lock:
+            if snapshot["version"] <= self._stored_version:
+                return
+            try:
+                with get_db_session() as db:
+                    crud.save_scrape_run(db, snapshot, json.dumps(snapshot))
+                self._stored_version = snapshot["version"]
+            except Exception as e:
+                logger.warning(f"Could not store scrape progress: {e}")
+
+    @staticmethod
+    def _shared_snapshot() -> Optional[Dict]:
+        with get_db_session() as db:
+            run = crud.get_latest_scrape_run(db)
+            if run is None:
+                return None
+            snapshot = json.loads(run.snapshot)
+            if run.state == "running":
+                lock = crud.get_scheduler_lock(db, RUN_LOCK_NAME)
+                if lock is None or lock.expires_at is None or lock.expires_at < datetime.utcnow():
+                    snapshot.update(state="failed", statistics={"error": "Scraping worker stopped before the run finished"})
+            return snapshot
@@ -0,0 +1,160 @@
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+from loguru import logger
+import importlib
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import DATA_SOURCES, settings
+
+# Third-party packages can register scrapers under this entry point group,
+# e.g. `fidit-scraper-foo = "my_package.scraper:FooScraper"`
+ENTRY_POINT_GROUP = "fidit.scrapers"
+
+DEFAULT_CONCURRENCY = 1
+DEFAULT_RATE_LIMIT = 1.0  # requests per second
+
+
+class ScraperSpec:
+    """
+    Declarative description of one data source.
+
+    Only holds the "module:Class" path of the scraper - the module is imported
+    and the scraper created the first time the source is actually used.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        scraper: str,
+        tip: str = "national",
+        url: Optional[str] = None,
+        source_type: str = "html",
+        enabled: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+        schedule_hours: Optional[float] = None
+    ):
+        self.name = name
+        self.scraper = scraper
+        self.tip = tip
+        self.url = url
+        self.source_type = source_type
+        self.enabled = enabled
+        self.concurrency = max(int(concurrency), 1)
+        self.rate_limit = rate_limit
+        self.schedule_hours = schedule_hours or settings.scraping_interval_hours
+
+    def load_class(self):
+        module_name, _, class_name = self.scraper.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create(self):
+        scraper = self.load_class()()
+        scraper.configure(concurrency=self.concurrency, rate_limit=self.rate_limit)
+        return scraper
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "tip": self.tip,
+            "url": self.url,
+            "type": self.source_type,
+            "enabled": self.enabled,
+            "concurrency": self.concurrency,
+            "rate_limit": self.rate_limit,
+            "schedule_hours": self.schedule_hours,
+        }
+
+
+def specs_from_config(data_sources: Mapping[str, List[Dict]]) -> List[ScraperSpec]:
+    """Build specs from DATA_SOURCES; sources without a scraper are skipped"""
+    specs = []
+    for tip, sources in data_sources.items():
+        for source in sources:
+            if not source.get("scraper"):
+                logger.warning(f"No scraper registered for source '{source['name']}', skipping")
+                continue
+            specs.append(ScraperSpec(
+                name=source["name"],
+                scraper=source["scraper"],
+                tip=tip,
+                url=source.get("url"),
+                source_type=source.get("type", "html"),
+                enabled=source.get("enabled", True),
+                concurrency=source.get("concurrency", DEFAULT_CONCURRENCY),
+                rate_limit=source.get("rate_limit", DEFAULT_RATE_LIMIT),
+                schedule_hours=source.get("schedule_hours")
+            ))
+    return specs
+
+
+def specs_from_entry_points(group: str = ENTRY_POINT_GROUP) -> List[ScraperSpec]:
+    """Scrapers registered by installed packages (name = source name, value = module:Class)"""
+    try:
+        from importlib.metadata import entry_points
+        discovered = entry_points(group=group)
+    except Exception as e:
+        logger.warning(f"Error reading scraper entry points: {e}")
+        return []
+    return [
+        ScraperSpec(name=entry_point.name, scraper=entry_point.value, tip="international")
+        for entry_point in discovered
+    ]
+
+
+class ScraperRegistry(Mapping):
+    """
+    Enabled scrapers by source name, created lazily on first access.
+
+    Iterating the registry only yields names, so listing sources (progress,
+    API) never imports a scraper module. `on_create` is called with every
+    newly created scraper (the manager wires its progress callback there).
+    """
+
+    def __init__(
+        self,
+        specs: Optional[List[ScraperSpec]] = None,
+        on_create: Optional[Callable[[str, object], None]] = None
+    ):
+        if specs is None:
+            specs = specs_from_config(DATA_SOURCES)
+            known = {spec.name for spec in specs}
+            specs += [spec for spec in specs_from_entry_points() if spec.name not in known]
+        self.specs: Dict[str, ScraperSpec] = {spec.name: spec for spec in specs}
+        self.on_create = on_create
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def enabled_specs(self) -> List[ScraperSpec]:
+        return [spec for spec in self.specs.values() if spec.enabled]
+
+    def __getitem__(self, name: str):
+        spec = self.specs.get(name)
+        if spec is None or not spec.enabled:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._instances:
+                scraper = spec.create()
+                if self.on_create:
+                    self.on_create(name, scraper)
+                self._instances[name] = scraper
+            return self._instances[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([spec.name for spec in self.enabled_specs()])
+
+    def __len__(self) -> int:
+        return len(self.enabled_specs())
+
+    def __contains__(self, name) -> bool:
+        spec = self.specs.get(name)
+        return spec is not None and spec.enabled
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def get_spec(self, name: str) -> Optional[ScraperSpec]:
+        return self.specs.get(name)
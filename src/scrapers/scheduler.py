@@ -0,0 +1,215 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from loguru import logger
+import argparse
+import random
+import socket
+import threading
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import settings
+from src.database.database import get_db_session
+from src.database import crud
+
+LOCK_NAME = "scrape-scheduler"
+RECENT_RUNS = 3
+
+
+def adaptive_interval_hours(
+    base_hours: float,
+    recent_changes: List[int],
+    nearest_deadline: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+    min_hours: Optional[float] = None,
+    max_hours: Optional[float] = None,
+    deadline_window_days: Optional[int] = None
+) -> float:
+    """
+    Scrape interval of a source adapted to how lively it is.
+
+    - a recent run found new or changed natjecaji: half the base interval
+    - the last RECENT_RUNS runs found nothing: double it
+    - a deadline within the deadline window: a quarter of the base interval
+
+    The result is clamped to [min_hours, max_hours].
+    """
+    now = now or datetime.utcnow()
+    min_hours = settings.scheduler_min_interval_hours if min_hours is None else min_hours
+    max_hours = settings.scheduler_max_interval_hours if max_hours is None else max_hours
+    window = settings.scheduler_deadline_window_days if deadline_window_days is None else deadline_window_days
+
+    factor = 1.0
+    if any(recent_changes):
+        factor = 0.5
+    elif len(recent_changes) >= RECENT_RUNS:
+        factor = 2.0
+
+    if nearest_deadline and nearest_deadline - now <= timedelta(days=window):
+        factor = min(factor, 0.25)
+
+    return min(max(base_hours * factor, min_hours), max_hours)
+
+
+class ScrapeScheduler:
+    """
+    Runs scrapers on a per-source, adaptive schedule.
+
+    Every replica runs the loop, but only the one holding the scheduler lock
+    row starts scrapes; the lock expires if its holder stops renewing it, so
+    another replica takes over. Schedule inputs (last run, recent changes,
+    deadlines) come from the database, so a new leader picks up where the
+    previous one stopped.
+    """
+
+    def __init__(
+        self,
+        manager,
+        poll_seconds: Optional[float] = None,
+        jitter: Optional[float] = None,
+        holder_id: Optional[str] = None,
+        lock_name: str = LOCK_NAME,
+        rng: Optional[random.Random] = None
+    ):
+        self.manager = manager
+        self.poll_seconds = poll_seconds or settings.scheduler_poll_seconds
+        self.jitter = settings.scheduler_jitter if jitter is None else jitter
+        self.holder_id = holder_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lock_name = lock_name
+        self.lock_ttl = self.poll_seconds * 3
+        self.is_leader = False
+        self._rng = rng or random.Random()
+        # source -> (last run the entry was computed for, next run, interval hours)
+        self._next_runs: Dict[str, Tuple[Optional[datetime], datetime, float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self, now: Optional[datetime] = None) -> List[str]:
+        """One scheduling step. Returns the sources a run was started for."""
+        now = now or datetime.utcnow()
+        with get_db_session() as db:
+            self.is_leader = crud.acquire_scheduler_lock(db, self.lock_name, self.holder_id, self.lock_ttl)
+        if not self.is_leader:
+            return []
+
+        if self.manager.progress.is_running():
+            # Previous run is still going - due sources wait for the next tick
+            return []
+
+        due = [name for name, next_run in self.next_runs(now).items() if next_run <= now]
+        if not due:
+            return []
+
+        try:
+            self.manager.start_background_run(sources=due)
+        except RuntimeError:
+            return []
+        logger.bind(sources=due).info(f"Scheduled scraping started for: {', '.join(due)}")
+        return due
+
+    def next_runs(self, now: Optional[datetime] = None) -> Dict[str, datetime]:
+        """Next planned run of every enabled source"""
+        now = now or datetime.utcnow()
+        result = {}
+        with get_db_session() as db:
+            for name in self.manager.scrapers:
+                logs = crud.get_recent_scraping_logs(db, limit=RECENT_RUNS, izvor=name)
+                last_run = logs[0].created_at if logs else None
+                cached = self._next_runs.get(name)
+                if cached and cached[0] == last_run:
+                    result[name] = cached[1]
+                    continue
+
+                if last_run is None:
+                    # Never scraped - run on the first tick
+                    self._next_runs[name] = (None, now, 0.0)
+                    result[name] = now
+                    continue
+
+                interval = adaptive_interval_hours(
+                    self._base_hours(name),
+                    [(log.natjecaji_dodani or 0) + (log.natjecaji_azurirani or 0) for log in logs if log.status == "success"],
+                    crud.get_nearest_deadline(db, name, now),
+                    now
+                )
+                # Jitter spreads sources (and replicas restarting together) apart
+                interval *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+                next_run = last_run + timedelta(hours=interval)
+                self._next_runs[name] = (last_run, next_run, interval)
+                result[name] = next_run
+        return result
+
+    def status(self) -> Dict:
+        next_runs = self.next_runs()
+        return {
+            "enabled": self._thread is not None and self._thread.is_alive(),
+            "leader": self.is_leader,
+            "holder_id": self.holder_id,
+            "running": self.manager.progress.is_running(),
+            "sources": [
+                {
+                    "name": name,
+                    "next_run": next_run.isoformat(),
+                    "interval_hours": round(self._next_runs[name][2], 2),
+                }
+                for name, next_run in next_runs.items()
+            ]
+        }
+
+    def run_forever(self):
+        logger.info(f"Scrape scheduler {self.holder_id} started (poll every {self.poll_seconds:.0f}s)")
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.exception(f"Scrape scheduler error: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        """Run the scheduler loop in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="scrape-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the loop and hand the lock over right away"""
+        self._stop.set()
+        if self.is_leader:
+            try:
+                with get_db_session() as db:
+                    crud.release_scheduler_lock(db, self.lock_name, self.holder_id)
+            except Exception as e:
+                logger.warning(f"Error releasing scheduler lock: {e}")
+            self.is_leader = False
+
+    def _base_hours(self, name: str) -> float:
+        spec = self.manager.registry.get_spec(name) if hasattr(self.manager, "registry") else None
+        return spec.schedule_hours if spec else settings.scraping_interval_hours
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape scheduler")
+    parser.add_argument("--poll-interval", type=float, default=None)
+    args = parser.parse_args()
+
+    from src.database.database import init_db
+    from src.scrapers.progress import SharedScrapeProgress
+    from src.scrapers.scraper_manager import ScraperManager
+    from src.utils.tracing import configure_logging
+    configure_logging()
+    init_db()
+
+    # Shared progress: runs take the scrape-run lock and show up in the API
+    manager = ScraperManager(progress=SharedScrapeProgress())
+    scheduler = ScrapeScheduler(manager, poll_seconds=args.poll_interval)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        manager.close()
@@ -1,88 +1,176 @@
-from typing import List, Dict
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
+from loguru import logger
+import threading
 import time
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.scrapers.hamag_scraper import HAMAGBICROScraper
-from src.scrapers.hrzz_scraper import HRZZScraper
+from src.scrapers.registry import ScraperRegistry
+from src.scrapers.progress import ScrapeProgress, ScrapeRunAborted
+from src.scrapers.pipeline import ScrapePipeline, create_parse_pool
+from src.scrapers.diffing import OPEN_STATUSES, classify_changes, changes_to_json, content_hash, diff_natjecaj
 from src.database.database import get_db_session
 from src.database.crud import (
     get_or_create_izdavatelj,
-    create_natjecaj,
+    get_izdavatelj_by_name,
     create_scraping_log,
+    create_change_events,
+    enqueue_summaries,
+    get_dedup_records,
+    replace_duplicate_links,
     get_all_natjecaji
 )
+from config.settings import settings
 from src.database.models import Natjecaj
+from src.utils.metrics import SCRAPER_NATJECAJI, SCRAPER_UPSERT_DURATION
+from src.utils.tracing import span
+
+# Columns a scraper may fill in
+NATJECAJ_FIELDS = set(Natjecaj.__table__.columns.keys()) - {'id', 'izdavatelj_id', 'created_at', 'updated_at'}
+# Keeps IN (...) lookups below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
 
 
 class ScraperManager:
     """Manages all scrapers and coordinates scraping operations"""
     
-    def __init__(self):
-        self.scrapers = {
-            'HAMAG-BICRO': HAMAGBICROScraper(),
-            'HRZZ': HRZZScraper(),
-        }
+    def __init__(self, registry: ScraperRegistry = None, progress: ScrapeProgress = None):
+        # The API passes a SharedScrapeProgress so every worker sees the same run
+        self.progress = progress or ScrapeProgress()
+        self.batch_size = settings.scrape_batch_size
+        # Scrapers are created on first use, only for enabled sources
+        self.registry = registry or ScraperRegistry()
+        self.registry.on_create = self._attach_progress
+        self.scrapers = self.registry
+        # Parse worker processes are shared by all runs of this manager
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+    
+    def _get_parse_pool(self):
+        if settings.scrape_parse_workers <= 0:
+            return None
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = create_parse_pool(settings.scrape_parse_workers)
+            return self._parse_pool
+    
+    def close(self):
+        """Shut down the parse worker processes (a later run starts new ones)"""
+        with self._parse_pool_lock:
+            pool, self._parse_pool = self._parse_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _attach_progress(self, source_name: str, scraper):
+        scraper.progress_callback = (
+            lambda count, name=source_name: self.progress.items_found(name, count)
+        )
+    
+    def start_background_run(self, sources: Optional[List[str]] = None) -> str:
+        """
+        Run all scrapers (or only `sources`) in a background thread.
+        
+        Returns the run id; follow it through self.progress.
+        Raises RuntimeError if a run is already in progress.
+        """
+        sources = self._resolve_sources(sources)
+        run_id = self.progress.start_run(sources)
+        thread = threading.Thread(
+            target=self.run_all_scrapers,
+            kwargs={'progress_started': True, 'sources': sources},
+            name=f"scrape-{run_id}",
+            daemon=True
+        )
+        thread.start()
+        return run_id
+    
+    def run_all_scrapers(self, progress_started: bool = False, sources: Optional[List[str]] = None) -> Dict:
+        """Run all scrapers (or only `sources`) and save results to database"""
+        sources = self._resolve_sources(sources)
+        if not progress_started:
+            self.progress.start_run(sources)
+        
+        try:
+            # The progress run id is the trace id of the whole run
+            with span("scrape.run", trace_id=self.progress.run_id, sources=sources):
+                overall_stats = self._run_all_scrapers(sources)
+        except Exception as e:
+            self.progress.finish_run(error=str(e))
+            raise
+        
+        self.progress.finish_run(overall_stats)
+        return overall_stats
+    
+    def _resolve_sources(self, sources: Optional[List[str]]) -> List[str]:
+        if sources is None:
+            return list(self.scrapers)
+        return [name for name in sources if name in self.scrapers]
     
-    def run_all_scrapers(self) -> Dict:
-        """Run all scrapers and save results to database"""
-        print("\n" + "="*60)
-        print(" STARTING SCRAPING PROCESS")
-        print("="*60 + "\n")
+    def _run_all_scrapers(self, sources: List[str]) -> Dict:
+        logger.bind(sources=sources).info(f"Scraping started for {len(sources)} sources")
         
         overall_stats = {
             'total_scraped': 0,
             'total_saved': 0,
             'total_updated': 0,
+            'total_unchanged': 0,
+            'total_closed': 0,
             'errors': 0,
             'sources': []
         }
         
-        for source_name, scraper in self.scrapers.items():
-            print(f"\n Processing source: {source_name}")
-            print("-" * 60)
-            
+        for source_name in sources:
+            self.progress.check_active()
             start_time = time.time()
+            self.progress.source_started(source_name)
             
             try:
-                # Scrape data
-                natjecaji = scraper.scrape()
-                
-                # Save to database
-                stats = self.save_to_database(source_name, natjecaji)
+                # Scrape data and save each batch as it arrives
+                with span("scrape.source", source=source_name) as source_span:
+                    found, stats = self.scrape_and_save(source_name, self.scrapers[source_name])
+                    source_span.set(found=found, **stats)
                 
                 execution_time = time.time() - start_time
                 
                 # Update overall stats
-                overall_stats['total_scraped'] += len(natjecaji)
+                overall_stats['total_scraped'] += found
                 overall_stats['total_saved'] += stats['added']
                 overall_stats['total_updated'] += stats['updated']
+                overall_stats['total_unchanged'] += stats['unchanged']
+                overall_stats['total_closed'] += stats['closed']
                 
                 # Log scraping activity
                 self.log_scraping_activity(
                     source_name,
                     status="success",
-                    natjecaji_pronadeni=len(natjecaji),
+                    natjecaji_pronadeni=found,
                     natjecaji_dodani=stats['added'],
                     natjecaji_azurirani=stats['updated'],
                     execution_time=execution_time
                 )
                 
+                self.progress.source_finished(source_name, found, stats['added'], stats['updated'])
                 overall_stats['sources'].append({
                     'name': source_name,
                     'status': 'success',
-                    'count': len(natjecaji),
+                    'count': found,
                     'time': execution_time
                 })
                 
-                print(f"  {source_name}: {len(natjecaji)} natjecaji scraped in {execution_time:.2f}s")
+                logger.bind(source=source_name, found=found, seconds=round(execution_time, 2), **stats).info(
+                    f"{source_name}: {found} natjecaji scraped in {execution_time:.2f}s"
+                )
                 
+            except ScrapeRunAborted:
+                raise
             except Exception as e:
-                print(f" Error scraping {source_name}: {e}")
+                logger.bind(source=source_name).exception(f"Error scraping {source_name}: {e}")
                 overall_stats['errors'] += 1
+                self.progress.source_failed(source_name, str(e))
                 
                 self.log_scraping_activity(
                     source_name,
@@ -97,65 +185,256 @@ class ScraperManager:
                     'error': str(e)
                 })
         
-        print("\n" + "="*60)
-        print(" SCRAPING SUMMARY")
-        print("="*60)
-        print(f"Total scraped: {overall_stats['total_scraped']}")
-        print(f"Total saved: {overall_stats['total_saved']}")
-        print(f"Total updated: {overall_stats['total_updated']}")
-        print(f"Errors: {overall_stats['errors']}")
-        print("="*60 + "\n")
+        logger.bind(**{key: value for key, value in overall_stats.items() if key != 'sources'}).info(
+            f"Scraping finished: {overall_stats['total_scraped']} scraped, {overall_stats['total_saved']} saved, "
+            f"{overall_stats['total_updated']} updated, {overall_stats['total_unchanged']} unchanged, "
+            f"{overall_stats['total_closed']} closed, {overall_stats['errors']} errors"
+        )
+        
+        if settings.dedup_enabled:
+            try:
+                overall_stats['duplicates'] = self.run_dedup()
+            except Exception as e:
+                logger.exception(f"Error running deduplication: {e}")
         
         return overall_stats
     
-    def save_to_database(self, source_name: str, natjecaji: List[Dict]) -> Dict:
-        """Save scraped natjecaji to database"""
-        stats = {'added': 0, 'updated': 0, 'skipped': 0}
+    def run_dedup(self) -> int:
+        """Find near-duplicate natjecaji across sources and link them to a canonical record"""
+        # numpy is only needed here - not imported with the API process
+        from src.scrapers.dedup import DedupEngine
+
+        start_time = time.time()
+        with get_db_session() as db:
+            records = get_dedup_records(db)
+            links = DedupEngine(threshold=settings.dedup_threshold).find_duplicates(records)
+            replace_duplicate_links(db, links)
+        logger.info(f"Linked {len(links)} duplicates across {len(records)} natjecaji in {time.time() - start_time:.2f}s")
+        return len(links)
+    
+    def scrape_and_save(self, source_name: str, scraper, collected: Optional[List[Dict]] = None) -> Tuple[int, Dict]:
+        """
+        Stream one source through the scrape pipeline and save it in batches.
+        
+        Every batch is committed as soon as it is written, so a slow source
+        shows partial results and a crash late in the run keeps what was
+        already saved. Returns the number of natjecaji found and the summed
+        save stats.
+        
+        After a complete run (something found and the scraper reports a full
+        crawl, see BaseScraper.crawl_complete) open natjecaji of the source
+        that were not seen are closed - sources list only open calls, so a
+        closed call simply drops off the listing.
+        """
+        pipeline = ScrapePipeline(
+            scraper,
+            queue_size=settings.scrape_queue_size,
+            parse_workers=settings.scrape_parse_workers,
+            pool=self._get_parse_pool()
+        )
+        found = 0
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'closed': 0}
+        seen_ids = set()
+        if hasattr(scraper, 'start_crawl'):
+            scraper.start_crawl()
+        try:
+            for batch in pipeline.batches(self.batch_size, settings.scrape_batch_max_delay):
+                found += len(batch)
+                if collected is not None:
+                    collected.extend(batch)
+                with SCRAPER_UPSERT_DURATION.time(source_name), span("scrape.write", source=source_name, batch=len(batch)) as write_span:
+                    batch_stats = self.save_to_database(source_name, batch, seen_ids=seen_ids)
+                    write_span.set(**batch_stats)
+                for key, value in batch_stats.items():
+                    stats[key] += value
+                    SCRAPER_NATJECAJI.inc(source_name, key, amount=value)
+                if hasattr(scraper, 'report_progress'):
+                    scraper.report_progress(found)
+                self.progress.check_active()
+        except BrokenProcessPool:
+            # A crashed worker breaks the pool for good - the next source gets a new one
+            self.close()
+            raise
+        
+        if not settings.scrape_close_missing:
+            return found, stats
+        # Scrapers that do not report completeness are never treated as complete
+        if found and getattr(scraper, 'crawl_complete', False):
+            stats['closed'] = self.close_missing(source_name, seen_ids)
+            SCRAPER_NATJECAJI.inc(source_name, 'closed', amount=stats['closed'])
+        else:
+            logger.bind(
+                source=source_name,
+                found=found,
+                fetch_errors=getattr(scraper, 'fetch_errors', None),
+                incomplete=getattr(scraper, 'incomplete_reasons', None)
+            ).warning(f"{source_name}: incomplete scrape, not closing natjecaji missing from it")
+        return found, stats
+    
+    def close_missing(self, source_name: str, seen_ids: Set[int]) -> int:
+        """Close open natjecaji of a source not in `seen_ids`, with a closed change event each"""
+        with get_db_session() as db:
+            izdavatelj = get_izdavatelj_by_name(db, source_name)
+            if izdavatelj is None:
+                return 0
+            missing = [
+                natjecaj for natjecaj in db.query(Natjecaj).filter(
+                    Natjecaj.izdavatelj_id == izdavatelj.id,
+                    Natjecaj.status.in_(OPEN_STATUSES)
+                )
+                if natjecaj.id not in seen_ids
+            ]
+            if not missing:
+                return 0
+            
+            now = datetime.utcnow()
+            events = []
+            for natjecaj in missing:
+                events.append({
+                    'natjecaj_id': natjecaj.id,
+                    'izvor': source_name,
+                    'event_type': 'closed',
+                    'changes': changes_to_json({'status': (natjecaj.status, 'closed')}),
+                    'content_hash': None
+                })
+                natjecaj.status = 'closed'
+                natjecaj.updated_at = now
+            create_change_events(db, events)
+        
+        logger.bind(source=source_name, closed=len(missing)).info(
+            f"{source_name}: closed {len(missing)} natjecaji no longer listed"
+        )
+        return len(missing)
+    
+    def save_to_database(self, source_name: str, natjecaji: List[Dict], seen_ids: Optional[Set[int]] = None) -> Dict:
+        """
+        Save a batch of scraped natjecaji to database.
+        
+        Existing rows for the whole batch are loaded with one query per key
+        (URL, then naziv for the same izdavatelj) and new rows are flushed
+        together. Existing rows are diffed field by field against the scraped
+        data and only written when something changed; every change is recorded
+        as a change event. Ids of all matched and new rows are added to
+        `seen_ids`.
+        """
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+        summary_ids = []
+        events = []
         
         with get_db_session() as db:
             # Get or create izdavatelj
+            spec = self.registry.get_spec(source_name)
             izdavatelj = get_or_create_izdavatelj(
                 db,
                 naziv=source_name,
-                tip="national" if source_name in ['HAMAG-BICRO', 'HRZZ'] else "international"
+                tip=spec.tip if spec else "national"
             )
             
+            batch = []
             for natjecaj_data in natjecaji:
+                # Scrapers may add extra keys (e.g. "izvor") that are not columns
+                data = {key: value for key, value in natjecaj_data.items() if key in NATJECAJ_FIELDS}
+                if not data.get('naziv'):
+                    stats['skipped'] += 1
+                    continue
+                batch.append(data)
+            
+            by_url, by_naziv = self._load_existing(db, izdavatelj.id, batch)
+            pending = []
+            
+            for natjecaj_data in batch:
                 try:
-                    # Check if natjecaj already exists (by URL, then naziv for same izdavatelj)
-                    existing = None
-                    if natjecaj_data.get('url'):
-                        existing = db.query(Natjecaj).filter(
-                            Natjecaj.url == natjecaj_data.get('url')
-                        ).first()
-
-                    if not existing:
-                        existing = db.query(Natjecaj).filter(
-                            Natjecaj.izdavatelj_id == izdavatelj.id,
-                            Natjecaj.naziv == natjecaj_data.get('naziv')
-                        ).first()
+                    existing = by_url.get(natjecaj_data.get('url')) or by_naziv.get(natjecaj_data['naziv'])
                     
                     if existing:
-                        # Update existing
-                        for key, value in natjecaj_data.items():
+                        changes = diff_natjecaj(existing, natjecaj_data)
+                        if not changes:
+                            stats['unchanged'] += 1
+                            if seen_ids is not None:
+                                seen_ids.add(existing.id)
+                            continue
+                        
+                        # Update only the fields that changed
+                        for key, (_, value) in changes.items():
                             setattr(existing, key, value)
                         existing.updated_at = datetime.utcnow()
                         stats['updated'] += 1
+                        saved = existing
+                        event_changes = classify_changes(changes)
                     else:
                         # Create new
-                        create_natjecaj(
-                            db,
-                            izdavatelj_id=izdavatelj.id,
-                            **natjecaj_data
-                        )
+                        saved = Natjecaj(izdavatelj_id=izdavatelj.id, **natjecaj_data)
+                        db.add(saved)
                         stats['added'] += 1
+                        event_changes = [(
+                            'created',
+                            {key: (None, value) for key, value in natjecaj_data.items()}
+                        )]
+                        # Repeated entries within the batch update the new row
+                        if saved.url:
+                            by_url[saved.url] = saved
+                        by_naziv[saved.naziv] = saved
+                    
+                    pending.append((saved, event_changes, content_hash(natjecaj_data)))
                         
                 except Exception as e:
-                    print(f" Error saving natjecaj: {e}")
+                    logger.bind(source=source_name).warning(f"Error saving natjecaj: {e}")
                     stats['skipped'] += 1
+            
+            # Assign ids to the new rows in one flush
+            db.flush()
+            
+            for saved, event_changes, data_hash in pending:
+                if seen_ids is not None:
+                    seen_ids.add(saved.id)
+                for event_type, fields in event_changes:
+                    events.append({
+                        'natjecaj_id': saved.id,
+                        'izvor': source_name,
+                        'event_type': event_type,
+                        'changes': changes_to_json(fields),
+                        'content_hash': data_hash
+                    })
+                if saved.status == "active" and saved.id not in summary_ids:
+                    summary_ids.append(saved.id)
+            
+            if events:
+                create_change_events(db, events)
+            
+            # Queue new and changed active natjecaji for AI summary pre-generation
+            if settings.summary_queue_enabled and summary_ids:
+                try:
+                    queued = enqueue_summaries(db, summary_ids)
+                    logger.bind(source=source_name).info(f"Queued {queued} natjecaji for AI summary generation")
+                except Exception as e:
+                    logger.bind(source=source_name).warning(f"Error queueing summaries: {e}")
         
         return stats
     
+    @staticmethod
+    def _load_existing(db, izdavatelj_id: int, batch: List[Dict]):
+        """Existing natjecaji matching the batch, by URL and by naziv (same izdavatelj)"""
+        by_url: Dict[str, Natjecaj] = {}
+        by_naziv: Dict[str, Natjecaj] = {}
+        urls = list({data['url'] for data in batch if data.get('url')})
+        nazivi = list({data['naziv'] for data in batch})
+        
+        for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+            chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+            for natjecaj in db.query(Natjecaj).filter(Natjecaj.url.in_(chunk)).order_by(Natjecaj.id):
+                by_url.setdefault(natjecaj.url, natjecaj)
+        
+        for start in range(0, len(nazivi), LOOKUP_CHUNK_SIZE):
+            chunk = nazivi[start:start + LOOKUP_CHUNK_SIZE]
+            query = db.query(Natjecaj).filter(
+                Natjecaj.izdavatelj_id == izdavatelj_id,
+                Natjecaj.naziv.in_(chunk)
+            ).order_by(Natjecaj.id)
+            for natjecaj in query:
+                by_naziv.setdefault(natjecaj.naziv, natjecaj)
+        
+        return by_url, by_naziv
+    
     def log_scraping_activity(self, izvor: str, status: str, **kwargs):
         """Log scraping activity to database"""
         try:
@@ -167,7 +446,7 @@ class ScraperManager:
                     **kwargs
                 )
         except Exception as e:
-            print(f"  Error logging activity: {e}")
+            logger.bind(source=izvor).warning(f"Error logging activity: {e}")
     
     def get_scraper_by_name(self, name: str):
         """Get specific scraper by name"""
@@ -179,20 +458,33 @@ class ScraperManager:
         if not scraper:
             raise ValueError(f"Scraper '{source_name}' not found")
         
-        print(f"\n Running {source_name} scraper...")
-        natjecaji = scraper.scrape()
-        
-        stats = self.save_to_database(source_name, natjecaji)
-        print(f" Saved {stats['added']} new, updated {stats['updated']} existing")
+        logger.bind(source=source_name).info(f"Running {source_name} scraper")
+        natjecaji: List[Dict] = []
+        with span("scrape.source", source=source_name):
+            _, stats = self.scrape_and_save(source_name, scraper, collected=natjecaji)
+        logger.bind(source=source_name, **stats).info(
+            f"Saved {stats['added']} new, updated {stats['updated']} existing, {stats['unchanged']} unchanged"
+        )
         
         return natjecaji
 
 
 if __name__ == "__main__":
+    from src.utils.tracing import configure_logging
+    configure_logging()
+    
     # Initialize database
     from src.database.database import init_db
     init_db()
     
-    # Run scrapers
-    manager = ScraperManager()
-    results = manager.run_all_scrapers()
+    # Run scrapers - with shared progress, so the run takes the scrape-run lock
+    # and cannot overlap a run started through the API
+    from src.scrapers.progress import SharedScrapeProgress
+    manager = ScraperManager(progress=SharedScrapeProgress())
+    if manager.progress.is_running():
+        logger.warning("Scraping is already running (started through the API or the scheduler)")
+        sys.exit(1)
+    try:
+        results = manager.run_all_scrapers()
+    finally:
+        manager.close()
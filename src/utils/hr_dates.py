@@ -0,0 +1,174 @@
+"""
+Parsing of Croatian dates as they appear on funding agency pages.
+
+Handles "15. studenoga 2024.", "15.11.2024.", ranges ("od 1. do 15. ožujka
+2025.", "1. 3. – 15. 4. 2025.", "15. prosinca - 15. siječnja 2025.") and
+times after a date ("u 12:00", "do 16. sati", "12.00 h"). Patterns are compiled once and parse results are
+memoized, since the same date strings repeat across listing pages and runs.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Pattern, Tuple
+import re
+
+# Genitive (as used in dates), nominative and diacritic-less spellings
+MONTHS = {
+    "siječnja": 1, "siječanj": 1, "sijecnja": 1, "sijecanj": 1,
+    "veljače": 2, "veljača": 2, "veljace": 2, "veljaca": 2,
+    "ožujka": 3, "ožujak": 3, "ozujka": 3, "ozujak": 3,
+    "travnja": 4, "travanj": 4,
+    "svibnja": 5, "svibanj": 5,
+    "lipnja": 6, "lipanj": 6,
+    "srpnja": 7, "srpanj": 7,
+    "kolovoza": 8, "kolovoz": 8,
+    "rujna": 9, "rujan": 9,
+    "listopada": 10, "listopad": 10,
+    "studenoga": 11, "studenog": 11, "studeni": 11,
+    "prosinca": 12, "prosinac": 12,
+}
+
+# Day, then a numeric ("11.") or named ("studenoga") month, then the year
+_DATE = r"(\d{1,2})\.\s*(?:(\d{1,2})\.|([a-zčćđšž]+))\s*(\d{4})\.?"
+DATE_RE = re.compile(_DATE)
+# A range written around a full date: "1. ožujka 2024. - <date>" or "od 1. (ožujka) do <date>"
+RANGE_END_RE = re.compile(r"\s*(?:-|–|—|\bdo\b)\s*" + _DATE)
+RANGE_START_RE = re.compile(r"(\d{1,2})\.\s*(?:(\d{1,2})\.|([a-zčćđšž]+))?\s*(?:-|–|—|\bdo\b)\s*$")
+_RANGE_START_WINDOW = 30
+# "12:00", "u/do 12.00", "12.00 h" or "16 sati"/"16. sati"/"16 h" - a bare "10.50"
+# is more often an amount than a time, so dotted times need "u"/"do" or "h"/"sati"
+TIME_RE = re.compile(
+    r"\b(\d{1,2}):(\d{2})\b"
+    r"|\b(?:u|do)\s+(\d{1,2})\.(\d{2})\b(?!\s*(?:eur|€|kn)\b)"
+    r"|\b(\d{1,2})(?:\.(\d{2}))?\.?\s*(?:sati|h)\b"
+)
+_TIME_WINDOW = 40
+
+# Labels are matched against the lowercased text (faster than re.IGNORECASE)
+DEADLINE_LABEL_RE = re.compile(r"rok\s+(?:za\s+)?(?:prijav|podnošenj)\w*[^:\n]{0,60}:")
+PUBLISH_LABEL_RE = re.compile(r"datum\s+(?:raspisivanja|objave)[^:\n]{0,60}:")
+_LABEL_WINDOW = 120
+
+
+def _month(numeric: Optional[str], name: Optional[str]) -> Optional[int]:
+    if numeric:
+        return int(numeric)
+    return MONTHS.get(name) if name else None
+
+
+def _build(year: int, month: Optional[int], day: int, hour: int = 0, minute: int = 0) -> Optional[datetime]:
+    if not month:
+        return None
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None
+
+
+def _time_after(text: str, position: int) -> Tuple[int, int]:
+    """Time written right after a date (up to the next date), or midnight"""
+    window = text[position:position + _TIME_WINDOW]
+    next_date = DATE_RE.search(window)
+    if next_date:
+        window = window[:next_date.start()]
+    match = TIME_RE.search(window)
+    if match:
+        groups = match.groups()
+        # One (hour, minute) group pair per alternative of TIME_RE
+        hour, minute = next((int(h), int(m or 0)) for h, m in zip(groups[::2], groups[1::2]) if h)
+        if hour < 24 and minute < 60:
+            return hour, minute
+    return 0, 0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+@lru_cache(maxsize=4096)
+def parse_hr_date(text: Optional[str]) -> Optional[datetime]:
+    """First complete date in the text, including the time written after it"""
+    if not text:
+        return None
+    normalized = _normalize(text)
+    match = DATE_RE.search(normalized)
+    if not match:
+        return None
+    day, numeric_month, month_name, year = match.groups()
+    hour, minute = _time_after(normalized, match.end())
+    return _build(int(year), _month(numeric_month, month_name), int(day), hour, minute)
+
+
+@lru_cache(maxsize=4096)
+def parse_hr_date_range(text: Optional[str]) -> Optional[Tuple[datetime, datetime]]:
+    """
+    (start, end) of a date range; a single date gives (date, date).
+
+    Month and year missing from the start ("1. - 15. ožujka 2025.") are
+    taken from the end; a start that would then fall after the end is in
+    the previous year ("15. prosinca - 15. siječnja 2025."). Times apply to
+    the end date only.
+    """
+    if not text:
+        return None
+    normalized = _normalize(text)
+    first = DATE_RE.search(normalized)
+    if not first:
+        return None
+    day, numeric_month, month_name, year = first.groups()
+
+    following = RANGE_END_RE.match(normalized, first.end())
+    if following:
+        start = _build(int(year), _month(numeric_month, month_name), int(day))
+        end_match = following
+        day, numeric_month, month_name, year = following.groups()
+    else:
+        start = None
+        end_match = first
+
+    hour, minute = _time_after(normalized, end_match.end())
+    end = _build(int(year), _month(numeric_month, month_name), int(day), hour, minute)
+    if end is None:
+        return None
+
+    if not following:
+        preceding = RANGE_START_RE.search(normalized, max(first.start() - _RANGE_START_WINDOW, 0), first.start())
+        if not preceding:
+            return end, end
+        start_day, start_numeric, start_name = preceding.groups()
+        start_month = _month(start_numeric, start_name)
+        start = _build(end.year, start_month or end.month, int(start_day))
+        # Only a start with its own month can belong to the previous year
+        if start_month and start is not None and start > end:
+            start = _build(end.year - 1, start_month, int(start_day))
+
+    if start is None or start > end:
+        return None
+    return start, end
+
+
+def find_labeled_date(text: Optional[str], label_re: Pattern, end: bool = False) -> Optional[datetime]:
+    """
+    Date following a label such as "Rok za prijavu:".
+
+    Only a short window after the label is parsed; with end=True the end of
+    a range is returned (for deadlines).
+    """
+    if not text:
+        return None
+    lowered = text.lower()
+    match = label_re.search(lowered)
+    if not match:
+        return None
+    fragment = lowered[match.end():match.end() + _LABEL_WINDOW]
+    dates = parse_hr_date_range(fragment)
+    if not dates:
+        return None
+    return dates[1] if end else dates[0]
+
+
+def find_deadline(text: Optional[str]) -> Optional[datetime]:
+    return find_labeled_date(text, DEADLINE_LABEL_RE, end=True)
+
+
+def find_publish_date(text: Optional[str]) -> Optional[datetime]:
+    return find_labeled_date(text, PUBLISH_LABEL_RE)
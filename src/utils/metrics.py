@@ -0,0 +1,268 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+A small counter/histogram registry, so the API can serve /metrics without
+prometheus_client or an external collector. Recording a value is a bucket
+bisect and a few additions under a per-metric lock; rendering happens only
+when /metrics is scraped. export_metrics() / render_metrics(exports) let
+several processes (API workers) be rendered as one, with values summed.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import threading
+import time
+
+# Seconds - from fast DB queries up to slow LLM calls and downloads
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: Dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def render(self, values: Dict[Tuple, object] = None) -> List[str]:
+        """Exposition lines for this process's values, or for the given (merged) values"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        if values is None:
+            values = self.export()
+        for labels, value in sorted(values.items()):
+            lines.extend(self._render_sample(labels, value))
+        return lines
+
+    def export(self) -> Dict[Tuple, object]:
+        with self._lock:
+            return self._snapshot()
+
+    def merge(self, exported: Iterable[Iterable]) -> Dict[Tuple, object]:
+        """Sum (labels, value) pairs exported by several processes"""
+        values: Dict[Tuple, object] = {}
+        for labels, value in exported:
+            labels = tuple(labels)
+            values[labels] = self._add(values.get(labels), value)
+        return values
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _snapshot(self) -> Dict[Tuple, object]:
+        return dict(self._values)
+
+    def _render_sample(self, labels: Tuple, value) -> Iterator[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _add(total, value):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic total; label values are passed positionally"""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _render_sample(self, labels: Tuple, value: float) -> Iterator[str]:
+        yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    @staticmethod
+    def _add(total, value):
+        return (total or 0.0) + value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. durations in seconds)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(labels)
+        return state[2] if state else 0
+
+    def _snapshot(self) -> Dict[Tuple, object]:
+        return {labels: [list(state[0]), state[1], state[2]] for labels, state in self._values.items()}
+
+    def _render_sample(self, labels: Tuple, state) -> Iterator[str]:
+        bucket_counts, total, count = state
+        names = self.labelnames + ("le",)
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+        yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+        yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+    @staticmethod
+    def _add(total, state):
+        if total is None:
+            return [list(state[0]), state[1], state[2]]
+        return [[a + b for a, b in zip(total[0], state[0])], total[1] + state[1], total[2] + state[2]]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _registry_lock:
+        # Modules re-imported under another name reuse the existing metric
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def export_metrics() -> Dict[str, list]:
+    """This process's metric values, JSON-serializable: {name: [[labels, value], ...]}"""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {metric.name: [[list(labels), value] for labels, value in metric.export().items()] for metric in metrics}
+
+
+def render_metrics(exports: Optional[Sequence[Dict[str, list]]] = None) -> str:
+    """
+    All registered metrics in the Prometheus text exposition format.
+
+    With `exports` (export_metrics() of several processes) every series is
+    the sum over those processes instead of this process's own value.
+    """
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        if exports is None:
+            lines.extend(metric.render())
+        else:
+            lines.extend(metric.render(metric.merge(
+                pair for export in exports for pair in export.get(metric.name, ())
+            )))
+    return "\n".join(lines) + "\n"
+
+
+# ==================== APPLICATION METRICS ====================
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds", "API request latency by route template", ("method", "route", "status")
+)
+DB_QUERY_DURATION = histogram(
+    "db_query_duration_seconds", "Database statement duration (count = number of statements)", ("operation",)
+)
+SCRAPER_FETCH_DURATION = histogram(
+    "scraper_fetch_duration_seconds", "Scraper HTTP request latency including download", ("host",)
+)
+SCRAPER_FETCH_ERRORS = counter(
+    "scraper_fetch_errors_total", "Scraper HTTP requests that failed", ("host",)
+)
+SCRAPER_DOWNLOADED_BYTES = counter(
+    "scraper_downloaded_bytes_total", "Response bytes downloaded by scrapers", ("host",)
+)
+SCRAPER_PARSE_DURATION = histogram(
+    "scraper_parse_duration_seconds", "Time to parse one scraped page", ("source",)
+)
+SCRAPER_UPSERT_DURATION = histogram(
+    "scraper_upsert_batch_duration_seconds", "Time to save one batch of scraped natjecaji", ("source",)
+)
+SCRAPER_NATJECAJI = counter(
+    "scraper_natjecaji_total", "Scraped natjecaji by save result (added, updated, unchanged, skipped)", ("source", "result")
+)
+LLM_CALL_DURATION = histogram(
+    "llm_call_duration_seconds", "LLM summary call latency including retries", ("model", "status")
+)
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def instrument_engine(engine):
+    """Record the duration of every statement executed through a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        operation = statement.lstrip()[:6].upper()
+        DB_QUERY_DURATION.observe(
+            time.perf_counter() - starts.pop(),
+            operation if operation in _SQL_OPERATIONS else "OTHER"
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute
+        connection = context.connection
+        if connection is not None and connection.info.get("metrics_query_start"):
+            connection.info["metrics_query_start"].pop()
@@ -0,0 +1,391 @@
+"""
+Synthetic data generator for benchmarks and load tests.
+
+Produces realistic natjecaji - Croatian titles and descriptions per source,
+deadlines relative to a fixed reference date, log-normal (heavily skewed)
+amounts rounded like real calls, and a share of calls republished by a
+second source under a slightly different title - deterministically for a
+given seed. Rows are written in bulk: COPY on PostgreSQL, executemany
+elsewhere, so millions of rows take minutes rather than hours.
+
+    python src/utils/synthetic_data.py --count 1000000 --seed 42 --reset
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence
+import argparse
+import csv
+import io
+import math
+import random
+import time
+import sys
+import os
+
+from loguru import logger
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.database.models import Base, Izdavatelj, Natjecaj
+
+# Fixed so the same seed gives the same rows on any day
+REFERENCE_DATE = datetime(2025, 6, 1)
+
+IZDAVATELJI = [
+    {"naziv": "HAMAG-BICRO", "url": "https://www.hamagbicro.hr", "tip": "national",
+     "opis": "Hrvatska agencija za malo gospodarstvo, inovacije i investicije"},
+    {"naziv": "HRZZ", "url": "https://hrzz.hr", "tip": "national",
+     "opis": "Hrvatska zaklada za znanost"},
+    {"naziv": "Horizon Europe", "url": "https://ec.europa.eu/info/funding-tenders/", "tip": "international",
+     "opis": "EU Framework Programme for Research and Innovation"},
+    {"naziv": "ERC", "url": "https://erc.europa.eu/", "tip": "international",
+     "opis": "European Research Council"},
+    {"naziv": "Strukturni fondovi", "url": "https://strukturnifondovi.hr", "tip": "national",
+     "opis": "Portal europskih strukturnih i investicijskih fondova u Hrvatskoj"},
+    {"naziv": "Ministarstvo znanosti, obrazovanja i mladih", "url": "https://mzom.gov.hr", "tip": "national",
+     "opis": "Natječaji ministarstva nadležnog za znanost i obrazovanje"},
+]
+
+TEME = [
+    ("digitalizaciju malih i srednjih poduzeća", "ICT"),
+    ("umjetnu inteligenciju u zdravstvu", "Medicina"),
+    ("zelenu tranziciju i obnovljive izvore energije", "Energetika"),
+    ("kružno gospodarstvo", "Okoliš"),
+    ("kibernetičku sigurnost", "ICT"),
+    ("biomedicinska istraživanja", "Medicina"),
+    ("održivi turizam", "Društvene znanosti"),
+    ("pametnu poljoprivredu", "Biotehničke znanosti"),
+    ("kvantne tehnologije", "Prirodne znanosti"),
+    ("mobilnost istraživača", "Multidisciplinarno"),
+    ("energetsku učinkovitost zgrada", "Energetika"),
+    ("kulturnu baštinu", "Humanističke znanosti"),
+    ("razvoj novih materijala", "Tehničke znanosti"),
+    ("istraživanje mora i obale", "Prirodne znanosti"),
+    ("društvene inovacije", "Društvene znanosti"),
+    ("startupove u ranoj fazi", "Multidisciplinarno"),
+    ("komercijalizaciju rezultata istraživanja", "Multidisciplinarno"),
+    ("mikroelektroniku i poluvodiče", "Tehničke znanosti"),
+]
+
+# Narrows a theme to one concrete call; theme x focus keeps unrelated titles apart
+FOKUSI = [
+    "u ruralnim područjima", "za žene poduzetnice", "u Jadranskoj Hrvatskoj", "u Panonskoj Hrvatskoj",
+    "kroz javno-privatna partnerstva", "za izvozno orijentirana poduzeća", "u prerađivačkoj industriji",
+    "na otocima", "u gradu Zagrebu", "kroz međunarodnu suradnju", "za mlade do 30 godina",
+    "u potpomognutim područjima", "kroz transfer tehnologije", "u obrazovnim ustanovama",
+    "za pilot-projekte", "kroz digitalne platforme", "u zdravstvenim ustanovama", "za klastere",
+    "u prometu i logistici", "u prehrambenoj industriji", "kroz otvorenu znanost", "za socijalna poduzeća",
+    "u kreativnim industrijama", "kroz suradnju sa sveučilištima",
+]
+
+KORISNICI = [
+    "mikro, mala i srednja poduzeća", "znanstvene organizacije", "mlade istraživače",
+    "visoka učilišta", "jedinice lokalne samouprave", "konzorcije poduzeća i istraživačkih organizacija",
+    "udruge i zaklade", "poduzetnike početnike",
+]
+
+# Per-source title templates, category, call code prefixes and amount distribution
+# (median of the log-normal, spread, rounding step)
+PROFILI = {
+    "HAMAG-BICRO": {
+        "naslovi": ["Potpora za {tema}", "Zajam za {tema}", "Inovacijski vaučeri za {tema}",
+                    "Financijski instrument za {tema}", "Proof of Concept - {tema}"],
+        "kategorije": ["Potpora poduzetništvu", "Inovacije"],
+        "kodovi": [],
+        "iznos": (60000, 1.0, 1000),
+        "url": "https://www.hamagbicro.hr/natjecaj/{slug}-{n}",
+    },
+    "HRZZ": {
+        "naslovi": ["Istraživački projekti - {tema}", "Uspostavni istraživački projekti: {tema}",
+                    "Projekt razvoja karijera mladih istraživača - {tema}", "Program suradnje za {tema}"],
+        "kategorije": ["Znanstveno istraživanje"],
+        "kodovi": ["IP", "UIP", "DOK", "PZS"],
+        "iznos": (180000, 0.6, 5000),
+        "url": "https://hrzz.hr/natjecaj/{slug}-{n}",
+    },
+    "Horizon Europe": {
+        "naslovi": ["Horizon Europe - {tema}", "EIC Pathfinder: {tema}", "EIC Accelerator - {tema}",
+                    "Cluster 4 poziv za {tema}", "MSCA Doctoral Networks - {tema}"],
+        "kategorije": ["Inovacije", "Znanstveno istraživanje"],
+        "kodovi": ["HORIZON-CL4", "HORIZON-CL5", "HORIZON-EIC", "HORIZON-MSCA"],
+        "iznos": (2500000, 1.2, 50000),
+        "url": "https://ec.europa.eu/info/funding-tenders/opportunities/portal/topic-details/{slug}-{n}",
+    },
+    "ERC": {
+        "naslovi": ["ERC Starting Grant - {tema}", "ERC Consolidator Grant - {tema}",
+                    "ERC Advanced Grant - {tema}", "ERC Proof of Concept - {tema}"],
+        "kategorije": ["Znanstveno istraživanje"],
+        "kodovi": ["ERC-STG", "ERC-COG", "ERC-ADG", "ERC-POC"],
+        "iznos": (1500000, 0.4, 50000),
+        "url": "https://erc.europa.eu/funding/{slug}-{n}",
+    },
+    "Strukturni fondovi": {
+        "naslovi": ["Javni poziv za {tema}", "Ulaganja u {tema}", "Povećanje kapaciteta za {tema}",
+                    "Otvoreni poziv: {tema}"],
+        "kategorije": ["Potpora poduzetništvu", "Inovacije", "Infrastruktura"],
+        "kodovi": ["NPOO", "PKK"],
+        "iznos": (400000, 1.4, 10000),
+        "url": "https://strukturnifondovi.hr/natjecaji/{slug}-{n}",
+    },
+    "Ministarstvo znanosti, obrazovanja i mladih": {
+        "naslovi": ["Natječaj za {tema}", "Program potpore za {tema}", "Stipendije za {tema}"],
+        "kategorije": ["Znanstveno istraživanje", "Obrazovanje"],
+        "kodovi": [],
+        "iznos": (30000, 0.9, 500),
+        "url": "https://mzom.gov.hr/natjecaji/{slug}-{n}",
+    },
+}
+
+OPIS_RECENICE = [
+    "Cilj poziva je potaknuti {tema} kroz sufinanciranje projekata koje provode {korisnici}.",
+    "Prihvatljivi prijavitelji su {korisnici} registrirani u Republici Hrvatskoj ili državi članici EU.",
+    "Intenzitet potpore iznosi do {intenzitet} % prihvatljivih troškova projekta.",
+    "Projekt može trajati najviše {trajanje} mjeseci od dana potpisivanja ugovora.",
+    "Prijave se podnose isključivo elektroničkim putem, a nepotpune prijave neće se razmatrati.",
+    "Prihvatljivi troškovi uključuju troškove osoblja, opreme, usluga vanjskih stručnjaka i diseminacije rezultata.",
+    "Prednost imaju projekti s jasnim doprinosom za {tema} i mjerljivim rezultatima.",
+    "Sredstva se dodjeljuju u obliku bespovratne potpore, a isplata je moguća u obliku predujma.",
+    "Informativna radionica za potencijalne prijavitelje održat će se nakon objave poziva.",
+]
+
+DIACRITICS = str.maketrans("čćđšžČĆĐŠŽ", "ccdszCCDSZ")
+
+NATJECAJ_COLUMNS = [
+    "naziv", "izdavatelj_id", "url", "kategorija", "podrucje_istrazivanja", "iznos_financiranja", "valuta",
+    "min_iznos", "max_iznos", "datum_objave", "rok_prijave", "opis", "uvjeti", "status",
+    "scraped_at", "created_at", "updated_at",
+]
+
+
+@lru_cache(maxsize=4096)
+def _slug(text: str) -> str:
+    words = text.translate(DIACRITICS).lower().replace(":", " ").replace("-", " ").split()
+    return "-".join(words[:6])
+
+
+def _round_amount(value: float, step: int) -> float:
+    return float(max(step, round(value / step) * step))
+
+
+def _republished_title(naziv: str, rng: random.Random) -> str:
+    """How another portal re-lists the same call: prefixes, case and lost diacritics"""
+    variant = rng.randrange(4)
+    if variant == 0:
+        return f"Javni poziv: {naziv}"
+    if variant == 1:
+        return naziv.translate(DIACRITICS)
+    if variant == 2:
+        return naziv.upper()
+    return f"{naziv} ({REFERENCE_DATE.year})"
+
+
+def generate_izdavatelji() -> List[Dict]:
+    return [dict(izdavatelj) for izdavatelj in IZDAVATELJI]
+
+
+def generate_natjecaji(
+    count: int,
+    seed: int = 0,
+    izdavatelj_ids: Optional[Sequence[int]] = None,
+    duplicate_rate: float = 0.05,
+    reference_date: datetime = REFERENCE_DATE
+) -> Iterator[Dict]:
+    """
+    Yield `count` natjecaj rows (column dicts ready for a bulk insert).
+
+    Args:
+        count: Number of rows
+        seed: Same seed -> same rows
+        izdavatelj_ids: Database ids of IZDAVATELJI, in order (default 1..n)
+        duplicate_rate: Share of rows that republish an earlier call under another source
+        reference_date: "Today" for deadlines and statuses
+    """
+    rng = random.Random(seed)
+    izdavatelj_ids = list(izdavatelj_ids or range(1, len(IZDAVATELJI) + 1))
+    sources = [izdavatelj["naziv"] for izdavatelj in IZDAVATELJI]
+    # Smaller national sources publish fewer calls than the EU portals
+    source_weights = [25, 15, 30, 5, 15, 10]
+    originals: List[Dict] = []
+
+    for n in range(count):
+        if originals and rng.random() < duplicate_rate:
+            original = rng.choice(originals)
+            source_index = rng.choice([i for i in range(len(sources)) if izdavatelj_ids[i] != original["izdavatelj_id"]])
+            row = dict(original)
+            row["naziv"] = _republished_title(original["naziv"], rng)
+            row["izdavatelj_id"] = izdavatelj_ids[source_index]
+            row["url"] = PROFILI[sources[source_index]]["url"].format(slug=_slug(original["naziv"]), n=n)
+            row["scraped_at"] = row["created_at"] = row["updated_at"] = \
+                original["scraped_at"] + timedelta(days=rng.randint(0, 14), minutes=rng.randint(0, 1440))
+            yield row
+            continue
+
+        source_index = rng.choices(range(len(sources)), weights=source_weights)[0]
+        source = sources[source_index]
+        profile = PROFILI[source]
+        tema, podrucje = rng.choice(TEME)
+        korisnici = rng.choice(KORISNICI)
+
+        naziv = rng.choice(profile["naslovi"]).format(tema=f"{tema} {rng.choice(FOKUSI)}")
+        naziv = naziv[0].upper() + naziv[1:]
+        datum_objave = reference_date - timedelta(days=int(rng.triangular(0, 1100, 0)), hours=rng.randint(8, 16))
+        if profile["kodovi"] and rng.random() < 0.6:
+            naziv = f"{naziv} {rng.choice(profile['kodovi'])}-{datum_objave.year}-{rng.randint(1, 12):02d}"
+
+        # Open calls without a deadline are common on the national portals
+        if rng.random() < 0.1:
+            rok_prijave = None
+        else:
+            rok_prijave = (datum_objave + timedelta(days=rng.choice([30, 45, 60, 60, 90, 90, 120, 180]))).replace(
+                hour=rng.choice([12, 16, 23]), minute=59 if rng.random() < 0.5 else 0)
+
+        median, sigma, step = profile["iznos"]
+        iznos = min_iznos = max_iznos = None
+        if rng.random() < 0.92:
+            iznos = _round_amount(rng.lognormvariate(math.log(median), sigma), step)
+            if rng.random() < 0.4:
+                min_iznos = _round_amount(iznos * rng.choice([0.05, 0.1, 0.2]), step)
+                max_iznos = iznos
+
+        if rok_prijave is None:
+            status = "active" if rng.random() < 0.6 else "closed"
+        elif rok_prijave >= reference_date:
+            status = "active"
+        else:
+            status = "expired" if rng.random() < 0.8 else "closed"
+
+        values = {
+            "tema": tema, "korisnici": korisnici,
+            "intenzitet": rng.choice([50, 60, 70, 85, 100]), "trajanje": rng.choice([12, 18, 24, 36, 48]),
+        }
+        opis = " ".join(sentence.format(**values) for sentence in rng.sample(OPIS_RECENICE, rng.randint(3, 7)))
+        scraped_at = datum_objave + timedelta(days=rng.randint(0, 3), minutes=rng.randint(0, 1440))
+
+        row = {
+            "naziv": naziv,
+            "izdavatelj_id": izdavatelj_ids[source_index],
+            "url": profile["url"].format(slug=_slug(naziv), n=n),
+            "kategorija": rng.choice(profile["kategorije"]),
+            "podrucje_istrazivanja": podrucje,
+            "iznos_financiranja": iznos,
+            "valuta": "EUR",
+            "min_iznos": min_iznos,
+            "max_iznos": max_iznos,
+            "datum_objave": datum_objave,
+            "rok_prijave": rok_prijave,
+            "opis": opis,
+            "uvjeti": f"Prihvatljivi prijavitelji: {korisnici}." if rng.random() < 0.5 else None,
+            "status": status,
+            "scraped_at": scraped_at,
+            "created_at": scraped_at,
+            "updated_at": scraped_at,
+        }
+        # Bounded pool of candidates for republication keeps memory flat for millions of rows
+        if len(originals) < 10000:
+            originals.append(row)
+        else:
+            originals[rng.randrange(10000)] = row
+        yield row
+
+
+def _copy_rows(engine, rows: List[Dict]):
+    """PostgreSQL COPY ... FROM STDIN (CSV); empty unquoted fields are NULL"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            value.isoformat(sep=" ") if isinstance(value, datetime) else value
+            for value in (row[column] for column in NATJECAJ_COLUMNS)
+        ])
+    buffer.seek(0)
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {Natjecaj.__tablename__} ({', '.join(NATJECAJ_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def populate_database(
+    count: int,
+    seed: int = 0,
+    engine=None,
+    batch_size: int = 10000,
+    reset: bool = False,
+    duplicate_rate: float = 0.05
+) -> int:
+    """
+    Bulk-load `count` synthetic natjecaji (and the izdavatelji) into the database.
+
+    Args:
+        count: Number of natjecaji
+        seed: Generator seed
+        engine: SQLAlchemy engine (default: the configured database)
+        batch_size: Rows per executemany / COPY batch
+        reset: Drop and recreate all tables first
+        duplicate_rate: Share of cross-source republications
+
+    Returns:
+        Number of natjecaji inserted
+    """
+    if engine is None:
+        from src.database.database import engine
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    izdavatelji = Izdavatelj.__table__
+    with engine.begin() as conn:
+        existing = dict(conn.execute(izdavatelji.select().with_only_columns(izdavatelji.c.naziv, izdavatelji.c.id)).all())
+        missing = [izdavatelj for izdavatelj in generate_izdavatelji() if izdavatelj["naziv"] not in existing]
+        if missing:
+            conn.execute(izdavatelji.insert(), [
+                {**izdavatelj, "created_at": REFERENCE_DATE, "updated_at": REFERENCE_DATE} for izdavatelj in missing
+            ])
+            existing = dict(conn.execute(izdavatelji.select().with_only_columns(izdavatelji.c.naziv, izdavatelji.c.id)).all())
+    izdavatelj_ids = [existing[izdavatelj["naziv"]] for izdavatelj in IZDAVATELJI]
+
+    use_copy = engine.dialect.name == "postgresql"
+    start = time.perf_counter()
+    inserted = 0
+    batch = []
+    rows = generate_natjecaji(count, seed=seed, izdavatelj_ids=izdavatelj_ids, duplicate_rate=duplicate_rate)
+    for row in rows:
+        batch.append(row)
+        if len(batch) < batch_size and inserted + len(batch) < count:
+            continue
+        if use_copy:
+            _copy_rows(engine, batch)
+        else:
+            with engine.begin() as conn:
+                conn.execute(Natjecaj.__table__.insert(), batch)
+        inserted += len(batch)
+        batch = []
+        if inserted % (batch_size * 10) == 0 or inserted == count:
+            elapsed = time.perf_counter() - start
+            logger.info(f"Inserted {inserted:,}/{count:,} natjecaji ({inserted / elapsed:,.0f} rows/s)")
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate the database with synthetic natjecaji")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    from src.utils.tracing import configure_logging
+    configure_logging()
+    populate_database(args.count, seed=args.seed, batch_size=args.batch_size, reset=args.reset,
+                      duplicate_rate=args.duplicate_rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Structured logging and lightweight tracing spans.
+
+Logs go through loguru; with LOG_FORMAT=json every record is one JSON
+object carrying the current trace_id/span_id, so scrape runs and API
+requests can be followed across modules and threads.
+
+A span times one operation (scrape run -> source -> page fetch / parse /
+DB write, or request -> crud call -> SQL). Every span duration goes to the
+trace_span_duration_seconds metric; span log records are only written for
+sampled traces (TRACE_SAMPLE_RATE) and for spans slower than TRACE_SLOW_MS.
+crud and SQL spans are only created inside an existing trace.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+import json
+import random
+import time
+import traceback
+import uuid
+import sys
+import os
+
+from loguru import logger
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import settings
+from src.utils.metrics import histogram
+
+SPAN_DURATION = histogram("trace_span_duration_seconds", "Duration of traced operations", ("span",))
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("fidit_current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Add attributes known only after the span started (status, counts...)"""
+        self.attributes.update(attributes)
+
+
+class _DisabledSpan:
+    """Stand-in yielded by span() when tracing is disabled"""
+
+    __slots__ = ()
+    name = trace_id = span_id = parent_id = None
+    sampled = False
+
+    def set(self, **attributes):
+        pass
+
+
+_DISABLED_SPAN = _DisabledSpan()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _new_span(name: str, trace_id: Optional[str], attributes: Dict) -> Span:
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes)
+    sampled = random.random() < settings.trace_sample_rate
+    return Span(name, trace_id or uuid.uuid4().hex[:16], None, sampled, attributes)
+
+
+def _finish(span: Span, duration: float):
+    SPAN_DURATION.observe(duration, span.name)
+    if span.sampled or duration * 1000 >= settings.trace_slow_ms:
+        logger.bind(
+            span=span.name,
+            trace_id=span.trace_id,
+            span_id=span.span_id,
+            parent_id=span.parent_id,
+            duration_ms=round(duration * 1000, 3),
+            **span.attributes
+        ).info(f"span {span.name}")
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Span]:
+    """
+    Time the enclosed block as a span.
+
+    Nested spans (also in threads started via in_current_context) become
+    children of the enclosing one; a span without a parent starts a new
+    trace, with `trace_id` if given (e.g. the scrape run id). With
+    TRACING_ENABLED off nothing is created or timed.
+    """
+    if not settings.tracing_enabled:
+        yield _DISABLED_SPAN
+        return
+
+    current = _new_span(name, trace_id, attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(current, time.perf_counter() - start)
+
+
+def record_span(name: str, duration: float, **attributes):
+    """Child span for work timed elsewhere (SQL events, worker processes); no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None or not settings.tracing_enabled:
+        return
+    _finish(Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes), duration)
+
+
+def in_current_context(function: Callable) -> Callable:
+    """Bind a callable to the current trace context, for running it on other threads"""
+    context = copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time - each call gets a copy
+        return context.copy().run(function, *args, **kwargs)
+    return run
+
+
+def traced(name: str) -> Callable:
+    """Decorator: run the function as a child span when called within a trace"""
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_functions(namespace: Dict, prefix: str):
+    """Wrap every public function defined in a module (pass globals()) with traced"""
+    for attribute, value in list(namespace.items()):
+        if (callable(value) and not attribute.startswith("_") and not isinstance(value, type)
+                and getattr(value, "__module__", None) == namespace["__name__"]):
+            namespace[attribute] = traced(f"{prefix}.{attribute}")(value)
+
+
+def trace_engine(engine):
+    """Record every SQL statement executed within a trace as a db.query span"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_span.get() is not None:
+            conn.info.setdefault("trace_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("trace_query_start")
+        if starts and _current_span.get() is not None:
+            record_span("db.query", time.perf_counter() - starts.pop(), statement=statement[:200])
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        connection = context.connection
+        if connection is not None and connection.info.get("trace_query_start"):
+            connection.info["trace_query_start"].pop()
+
+
+# ==================== LOGGING ====================
+
+def _add_trace_context(record):
+    current = _current_span.get()
+    if current is not None:
+        record["extra"].setdefault("trace_id", current.trace_id)
+        record["extra"].setdefault("span_id", current.span_id)
+
+
+def _json_sink(message):
+    record = message.record
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+    }
+    entry.update(record["extra"])
+    if record["exception"] is not None:
+        exception = record["exception"]
+        entry["exception"] = f"{exception.type.__name__}: {exception.value}"
+        entry["traceback"] = "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+    # sys.stderr is looked up per record so redirected streams (tests, daemons) work
+    sys.stderr.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+
+def _text_sink(message):
+    sys.stderr.write(str(message))
+
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Replace loguru's default handler according to settings.
+
+    LOG_FORMAT=json writes one JSON object per record, "text" a readable
+    line; LOG_ASYNC moves formatting and writing to a background thread.
+    """
+    logger.remove()
+    logger.configure(patcher=_add_trace_context)
+    if settings.log_format == "json":
+        logger.add(_json_sink, level=level or settings.log_level, enqueue=settings.log_async, format="{message}")
+    else:
+        logger.add(
+            _text_sink,
+            level=level or settings.log_level,
+            enqueue=settings.log_async,
+            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <7} | {name} | {message} {extra}"
+        )
@@ -0,0 +1,11 @@
+import tempfile
+import os
+
+# Tests write natjecaji, queue jobs, locks and cache rows - keep them out of the
+# development database (./data/fidit.db). Set TEST_DATABASE_URL to test against
+# another database, e.g. PostgreSQL.
+_test_data_dir = tempfile.TemporaryDirectory(prefix="fidit-tests-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL",
+    f"sqlite:///{os.path.join(_test_data_dir.name, 'fidit_test.db')}"
+)
@@ -76,6 +76,16 @@ def test_search_natjecaji():
     assert isinstance(response.json(), list)
 
 
+def test_search_natjecaji_paginated():
+    """Test search pagination returns one page and the total count"""
+    all_results = client.get("/api/search").json()
+    response = client.get("/api/search?skip=0&limit=2")
+    assert response.status_code == 200
+    assert len(response.json()) <= 2
+    assert int(response.headers["X-Total-Count"]) == len(all_results)
+    assert [n["id"] for n in response.json()] == [n["id"] for n in all_results[:2]]
+
+
 def test_get_expiring_soon():
     """Test expiring soon endpoint"""
     response = client.get("/api/natjecaji/expiring/soon?days=30")
@@ -96,4 +106,60 @@ def test_get_izdavatelji():
     assert isinstance(response.json(), list)
 
 
+def test_get_llm_metrics():
+    """Test LLM telemetry metrics endpoint"""
+    response = client.get("/api/llm/metrics?days=7")
+    assert response.status_code == 200
+    data = response.json()
+    assert "latency_ms" in data
+    assert set(data["latency_ms"]) >= {"p50", "p95", "p99"}
+    assert isinstance(data["daily"], list)
+
+
+def test_dataset_snapshot_etag():
+    """Test dataset snapshot and conditional revalidation"""
+    response = client.get("/api/dataset")
+    assert response.status_code == 200
+    data = response.json()
+    etag = response.headers["ETag"]
+    assert etag == f'"{data["version"]}"'
+    assert data["full"] is True
+    assert len(data["rows"]) == len(data["ids"])
+    assert all(len(row) == len(data["columns"]) for row in data["rows"])
+
+    not_modified = client.get("/api/dataset", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+
+def test_dataset_delta_etag_and_version_changes():
+    """Test deltas carry their own ETag and a renamed izdavatelj changes the version"""
+    from src.database import crud
+    from src.database.database import get_db_session
+    from src.database.models import Izdavatelj, Natjecaj
+
+    with get_db_session() as db:
+        izdavatelj_id = crud.get_or_create_izdavatelj(db, naziv="TEST-ETAG").id
+        crud.create_natjecaj(db, naziv="Test ETag natječaj", izdavatelj_id=izdavatelj_id)
+    try:
+        full = client.get("/api/dataset")
+        data = full.json()
+        delta = client.get("/api/dataset", params={"since": data["watermark"]})
+        delta_etag = delta.headers["ETag"]
+        assert delta.json()["full"] is False and delta_etag != full.headers["ETag"]
+
+        # The client builds the delta ETag from its version and watermark
+        assert delta_etag == f'"{data["version"]}-{data["watermark"]}"'
+        not_modified = client.get("/api/dataset", params={"since": data["watermark"]}, headers={"If-None-Match": delta_etag})
+        assert not_modified.status_code == 304
+        assert client.get("/api/dataset", headers={"If-None-Match": delta_etag}).status_code == 200
+
+        with get_db_session() as db:
+            db.get(Izdavatelj, izdavatelj_id).naziv = "TEST-ETAG-RENAMED"
+        assert client.get("/api/dataset", headers={"If-None-Match": full.headers["ETag"]}).status_code == 200
+    finally:
+        with get_db_session() as db:
+            db.query(Natjecaj).filter(Natjecaj.izdavatelj_id == izdavatelj_id).delete()
+            db.query(Izdavatelj).filter(Izdavatelj.id == izdavatelj_id).delete()
+
+
 # Run tests with: pytest tests/test_api.py -v
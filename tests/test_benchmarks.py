@@ -0,0 +1,31 @@
+from pathlib import Path
+import subprocess
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+RUNNER = Path(__file__).resolve().parent.parent / "benchmarks" / "run_benchmarks.py"
+
+
+def test_benchmark_runner_writes_comparable_results(tmp_path):
+    """Smoke test: a tiny seeded database, one round per benchmark, JSON output and comparison"""
+    output = tmp_path / "results.json"
+    command = [
+        sys.executable, str(RUNNER), "--sizes", "50", "--only", "api.statistics,crud,parser.horizon",
+        "--repeat", "1", "--min-time", "0", "--data-dir", str(tmp_path), "--output", str(output)
+    ]
+    subprocess.run(command, check=True, capture_output=True)
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    results = report["results"]["50"]
+    assert set(results) == {"_seed_seconds", "api.statistics", "crud.search", "parser.horizon_search"}
+    assert results["parser.horizon_search"]["median"] > 0
+    assert (tmp_path / "bench_50.db").exists()
+
+    # Comparing against itself with a generous threshold reports no regression
+    command[command.index(str(output))] = str(tmp_path / "rerun.json")
+    rerun = subprocess.run(command + ["--compare", str(output), "--threshold", "100"], capture_output=True, text=True)
+    assert rerun.returncode == 0
+    assert "parser.horizon_search" in rerun.stdout
@@ -0,0 +1,71 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dashboard import FragmentCache
+from src.api.main import app
+from src.database.database import get_db_session, init_db
+from src.database.models import CacheEntry
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def remove_cached_fragments():
+    """Delete the shared cache entries rendered by these tests"""
+    init_db()
+    with get_db_session() as db:
+        existing = {key for (key,) in db.query(CacheEntry.key)}
+    yield
+    with get_db_session() as db:
+        db.query(CacheEntry).filter(CacheEntry.key.notin_(existing)).delete(synchronize_session=False)
+
+
+def test_dashboard_home_renders_and_revalidates():
+    """Test server-rendered overview page and its ETag"""
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "FIDIT AI Assistant" in response.text
+    assert "{{" not in response.text
+
+    cached = client.get("/dashboard", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_dashboard_search_escapes_query():
+    """Test that the search form echoes the query HTML-escaped"""
+    response = client.get("/dashboard/search", params={"q": "<script>"})
+    assert response.status_code == 200
+    assert "<script>" not in response.text
+    assert "&lt;script&gt;" in response.text
+
+
+def test_dashboard_statistics_and_static():
+    """Test that the statistics page loads chart data from /api/dataset"""
+    response = client.get("/dashboard/statistics")
+    assert response.status_code == 200
+    assert 'data-source="/api/dataset"' in response.text
+
+    assert client.get("/dashboard/static/dashboard.js").status_code == 200
+    assert client.get("/dashboard/static/missing.js").status_code == 404
+
+
+def test_shared_fragment_cache_renders_once_across_workers():
+    """Test a fragment rendered by one worker's cache is reused by another's"""
+    init_db()
+    renders = []
+    key = ("test-shared", os.getpid(), id(renders))
+
+    def render():
+        renders.append(1)
+        return "<p>fragment</p>"
+
+    first, second = FragmentCache(shared=True), FragmentCache(shared=True)
+    assert first.get_or_render(key, render) == "<p>fragment</p>"
+    assert second.get_or_render(key, render) == "<p>fragment</p>"
+    assert len(renders) == 1
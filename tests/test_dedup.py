@@ -0,0 +1,72 @@
+import random
+import string
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from src.scrapers.dedup import DedupEngine, extract_call_codes, normalize_title, shingles
+
+
+def test_normalize_title():
+    """Test diacritics, call codes, punctuation and filler words are normalized"""
+    assert normalize_title("Javni poziv: Istraživački projekti (IP-2026-02) – Đakovo") == "istrazivacki projekti dakovo"
+    assert extract_call_codes("Uspostavni projekti UIP-2026-02 i IP-2026-02") == {"UIP-2026-02", "IP-2026-02"}
+    # Whole identifiers only, never the cluster prefix of a Horizon topic
+    assert extract_call_codes("Topic HORIZON-CL4-2024-DIGITAL-EMERGING-01-11") == {"HORIZON-CL4-2024-DIGITAL-EMERGING-01-11"}
+    assert extract_call_codes("Klaster HORIZON-CL4-2024, rok 2024.") == {"HORIZON-CL4-2024"}
+
+
+def test_links_cross_source_duplicates_to_oldest_record():
+    """Test near-duplicate titles from different sources are linked to the lowest id"""
+    records = [
+        {"id": 1, "naziv": "Inovacije u turizmu 2026", "izdavatelj_id": 1},
+        {"id": 2, "naziv": "Javni poziv - INOVACIJE U TURIZMU 2026.", "izdavatelj_id": 2},
+        {"id": 3, "naziv": "Istraživački projekti", "izdavatelj_id": 1},
+        {"id": 4, "naziv": "Projekti suradnje IP-2026-02", "izdavatelj_id": 2},
+        {"id": 5, "naziv": "HRZZ: projekti znanstvene suradnje (IP-2026-02)", "izdavatelj_id": 3},
+        {"id": 6, "naziv": "Inovacije u turizmu 2026", "izdavatelj_id": 1},
+        {"id": 7, "naziv": "Mobilnost istraživača IP-2026-02", "izdavatelj_id": 3},
+    ]
+    links = {link["natjecaj_id"]: link for link in DedupEngine().find_duplicates(records)}
+
+    assert links[2]["canonical_id"] == 1 and links[2]["method"] == "minhash"
+    assert links[5]["canonical_id"] == 4 and links[5]["method"] == "call_code"
+    # Same source as 1 - a group never holds two records of one source
+    assert 6 not in links
+    # Same call code but an unrelated title
+    assert 3 not in links and 7 not in links
+
+
+def test_one_record_does_not_chain_a_sources_records_together():
+    """Test a post mentioning a Horizon cluster is not linked to the topics of that cluster"""
+    records = [
+        {"id": 1, "naziv": "Quantum sensing HORIZON-CL4-2024-DIGITAL-EMERGING-01-11", "izdavatelj_id": 1},
+        {"id": 2, "naziv": "Robotics for agriculture HORIZON-CL4-2024-DIGITAL-EMERGING-01-12", "izdavatelj_id": 1},
+        {"id": 3, "naziv": "Advanced materials HORIZON-CL4-2024-RESILIENCE-01-33", "izdavatelj_id": 1},
+        {"id": 4, "naziv": "Info dan o pozivima HORIZON-CL4-2024", "izdavatelj_id": 2},
+        {"id": 5, "naziv": "Inovacije u turizmu 2026", "izdavatelj_id": 1},
+        {"id": 6, "naziv": "Inovacije u turizmu 2026.", "izdavatelj_id": 2},
+        {"id": 7, "naziv": "Javni poziv: Inovacije u turizmu 2026", "izdavatelj_id": 1},
+    ]
+    links = {link["natjecaj_id"]: link for link in DedupEngine().find_duplicates(records)}
+
+    assert links == {6: {"natjecaj_id": 6, "canonical_id": 5, "similarity": 1.0, "method": "minhash"}}
+
+
+def test_unrelated_titles_produce_few_candidates():
+    """Test LSH blocking keeps the candidate set far below n^2"""
+    rng = random.Random(1)
+    vocab = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(2000)]
+    records = [{"id": i, "naziv": " ".join(rng.sample(vocab, 7)), "izdavatelj_id": i % 2} for i in range(2000)]
+
+    engine = DedupEngine()
+    candidates = {}
+    signatures = engine.signatures([shingles(normalize_title(r["naziv"])) for r in records])
+    for bucket in engine._band_buckets(np.array([r["id"] for r in records]), signatures):
+        engine._add_candidates(bucket, candidates, "minhash")
+
+    assert len(candidates) < 2000
+    assert engine.find_duplicates(records) == []
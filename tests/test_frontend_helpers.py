@@ -0,0 +1,122 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend"))
+
+import helpers
+
+
+class ProgressStreamStub(BaseHTTPRequestHandler):
+    """Streams the snapshots as chunked server-sent events (like uvicorn), the second one only after a release"""
+
+    protocol_version = "HTTP/1.1"
+    snapshots = []
+    release = threading.Event()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, snapshot in enumerate(self.snapshots):
+            if index == 1:
+                self.release.wait(5)
+            self._chunk(b": keep-alive\n\n")
+            self._chunk(f"id: {snapshot['version']}\nevent: progress\ndata: {json.dumps(snapshot)}\n\n".encode())
+        self._chunk(b"")
+        self.close_connection = True
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def progress_api(monkeypatch):
+    ProgressStreamStub.release = threading.Event()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ProgressStreamStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(helpers, "API_URL", f"http://127.0.0.1:{server.server_address[1]}/api")
+    yield
+    ProgressStreamStub.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_progress_stream_reruns_session_on_each_version(progress_api, monkeypatch):
+    """Test that events are read as they arrive and every new version reruns the session"""
+    ProgressStreamStub.snapshots = [
+        {"version": 1, "state": "running", "items_found": 3},
+        {"version": 2, "state": "finished", "items_found": 7},
+    ]
+    reruns = []
+    first_event = threading.Event()
+
+    def record_rerun(session_id):
+        reruns.append(session_id)
+        first_event.set()
+
+    monkeypatch.setattr(helpers, "request_session_rerun", record_rerun)
+
+    stream = helpers.ScrapeProgressStream("session-1", {"version": 0, "state": "running"}).start()
+    assert first_event.wait(5), "first event was not delivered before the stream continued"
+    assert stream.snapshot["version"] == 1 and stream.is_alive()
+
+    ProgressStreamStub.release.set()
+    stream._thread.join(5)
+    assert stream.snapshot == {"version": 2, "state": "finished", "items_found": 7}
+    assert not stream.is_alive()
+    # One rerun per version, and one when the stream ends
+    assert reruns == ["session-1"] * 3
+
+
+def test_stopped_stream_does_not_rerun(progress_api, monkeypatch):
+    """Test that a stream stopped by the page does not rerun the session any more"""
+    ProgressStreamStub.snapshots = [
+        {"version": 1, "state": "running"},
+        {"version": 2, "state": "running"},
+    ]
+    reruns = []
+    monkeypatch.setattr(helpers, "request_session_rerun", reruns.append)
+
+    stream = helpers.ScrapeProgressStream("session-1").start()
+    stream.stop()
+    ProgressStreamStub.release.set()
+    stream._thread.join(5)
+    assert not stream.is_alive()
+    assert len(reruns) <= 1
+
+
+class SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.mark.parametrize("changed, expected_reruns", [(True, 1), (False, 0)])
+def test_dataset_refresh_reruns_once_without_waiting(monkeypatch, changed, expected_reruns):
+    """Test that a finished revalidation reruns the session once, and only when the data changed"""
+    from concurrent.futures import Future
+
+    pending = Future()
+    store = type("Store", (), {"pending_refresh": lambda self: pending})()
+    reruns = []
+    monkeypatch.setattr(helpers, "get_dataset_store", lambda: store)
+    monkeypatch.setattr(helpers, "request_session_rerun", reruns.append)
+    # Session state does not persist outside `streamlit run`
+    monkeypatch.setattr(helpers.st, "session_state", SessionState())
+
+    helpers.rerun_when_dataset_changes()
+    assert reruns == []
+    pending.set_result(changed)
+    # Reruns register again for the same revalidation
+    helpers.rerun_when_dataset_changes()
+    assert len(reruns) == expected_reruns
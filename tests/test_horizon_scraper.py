@@ -0,0 +1,146 @@
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import threading
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.database.database import init_db, get_db_session
+from src.database import crud
+from src.database.models import ChangeEvent, Natjecaj, SummaryQueueItem
+from src.scrapers.horizon_scraper import HorizonEuropeScraper
+from src.scrapers.registry import ScraperRegistry, ScraperSpec
+from src.scrapers.scraper_manager import ScraperManager
+from src.utils.metrics import SCRAPER_DOWNLOADED_BYTES, SCRAPER_FETCH_DURATION
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "horizon")
+
+
+class SearchApiStub(BaseHTTPRequestHandler):
+    """Serves recorded search API pages by pageNumber (404 for unknown pages)"""
+
+    requests = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        query = parse_qs(urlparse(self.path).query)
+        page = query.get("pageNumber", ["1"])[0]
+        SearchApiStub.requests.append(query)
+
+        path = os.path.join(FIXTURES_DIR, f"search_page_{page}.json")
+        if not os.path.exists(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def search_api():
+    SearchApiStub.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchApiStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+    server.server_close()
+
+
+def make_scraper(url: str) -> HorizonEuropeScraper:
+    scraper = HorizonEuropeScraper(search_url=url, page_size=2)
+    scraper.configure(concurrency=2, rate_limit=None)
+    return scraper
+
+
+def test_parses_recorded_search_pages(search_api):
+    """Test that all pages are fetched and topics parsed into natjecaj fields"""
+    fetches, downloaded = SCRAPER_FETCH_DURATION.count("127.0.0.1"), SCRAPER_DOWNLOADED_BYTES.value("127.0.0.1")
+    natjecaji = {n["url"].rsplit("/", 1)[1]: n for n in make_scraper(search_api).scrape()}
+
+    assert sorted(request["pageNumber"][0] for request in SearchApiStub.requests) == ["1", "2"]
+    assert SCRAPER_FETCH_DURATION.count("127.0.0.1") - fetches == 2
+    assert SCRAPER_DOWNLOADED_BYTES.value("127.0.0.1") > downloaded
+    assert SearchApiStub.requests[0]["pageSize"] == ["2"]
+    # The topic repeated on page 2 is only returned once
+    assert len(natjecaji) == 3
+
+    ai = natjecaji["horizon-cl4-2025-01-digital-emerging-01"]
+    assert ai["naziv"] == "Trustworthy AI services for industry (HORIZON-CL4-2025-01-DIGITAL-EMERGING-01)"
+    assert ai["opis"] == "Expected Outcome: Projects are expected to contribute to trustworthy AI ."
+    assert ai["rok_prijave"] == datetime(2025, 11, 18, 17, 0)
+    assert ai["datum_objave"] == datetime(2025, 5, 15)
+    assert (ai["iznos_financiranja"], ai["min_iznos"], ai["max_iznos"]) == (30000000.0, 5000000.0, 8000000.0)
+    assert ai["podrucje_istrazivanja"] == "ICT" and ai["status"] == "active"
+
+    two_stage = natjecaji["horizon-cl2-2026-01-democracy-03"]
+    assert two_stage["rok_prijave"] == datetime(2026, 2, 10, 17, 0)
+    assert two_stage["iznos_financiranja"] == 9000000.0
+    assert two_stage["status"] == "forthcoming"
+
+    health = natjecaji["horizon-hlth-2025-02-disease-04"]
+    assert health["iznos_financiranja"] is None and health["podrucje_istrazivanja"] == "Medicina"
+
+
+def test_truncated_or_failed_crawl_is_incomplete(search_api):
+    """Test that a crawl cut at max_pages or missing a page is not reported complete"""
+    scraper = make_scraper(search_api)
+    scraper.scrape()
+    assert scraper.crawl_complete
+
+    truncated = HorizonEuropeScraper(search_url=search_api, page_size=2, max_pages=1)
+    assert len(truncated.scrape()) == 2
+    assert not truncated.crawl_complete and "only the first 1 are fetched" in truncated.incomplete_reasons[0]
+
+    # One topic per page: pages 3 and 4 are not recorded (404)
+    failed = HorizonEuropeScraper(search_url=search_api, page_size=1)
+    failed.scrape()
+    assert not failed.crawl_complete
+    assert sorted(reason.split(" failed")[0] for reason in failed.incomplete_reasons) == ["search page 3", "search page 4"]
+
+
+def test_manager_saves_batches_as_they_arrive(search_api, monkeypatch):
+    """Test that the scraped stream is saved batch by batch through the bulk upsert path"""
+    init_db()
+    scraper = make_scraper(search_api)
+    registry = ScraperRegistry([ScraperSpec("TEST-HORIZON", "src.scrapers.horizon_scraper:HorizonEuropeScraper", tip="international")])
+    manager = ScraperManager(registry)
+    manager.batch_size = 2
+
+    saved_batches = []
+    save_to_database = manager.save_to_database
+
+    def record_batches(source_name, natjecaji, **kwargs):
+        saved_batches.append(len(natjecaji))
+        return save_to_database(source_name, natjecaji, **kwargs)
+
+    monkeypatch.setattr(manager, "save_to_database", record_batches)
+
+    try:
+        found, stats = manager.scrape_and_save("TEST-HORIZON", scraper)
+        assert found == 3 and saved_batches == [2, 1]
+        assert stats["added"] == 3
+
+        found, stats = manager.scrape_and_save("TEST-HORIZON", make_scraper(search_api))
+        assert stats["unchanged"] == 3 and stats["added"] == 0
+    finally:
+        with get_db_session() as db:
+            izdavatelj = crud.get_izdavatelj_by_name(db, "TEST-HORIZON")
+            if izdavatelj:
+                for natjecaj in db.query(Natjecaj).filter(Natjecaj.izdavatelj_id == izdavatelj.id).all():
+                    db.query(ChangeEvent).filter(ChangeEvent.natjecaj_id == natjecaj.id).delete()
+                    db.query(SummaryQueueItem).filter(SummaryQueueItem.natjecaj_id == natjecaj.id).delete()
+                    db.delete(natjecaj)
+                db.delete(izdavatelj)
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.utils.hr_dates import MONTHS, find_deadline, find_publish_date, parse_hr_date, parse_hr_date_range
+
+GENITIVE = ["siječnja", "veljače", "ožujka", "travnja", "svibnja", "lipnja",
+            "srpnja", "kolovoza", "rujna", "listopada", "studenoga", "prosinca"]
+
+
+def random_datetime(rng: random.Random, with_time: bool) -> datetime:
+    date = datetime(2015, 1, 1) + timedelta(days=rng.randrange(365 * 15))
+    if with_time:
+        date = date.replace(hour=rng.randrange(24), minute=rng.choice([0, 30, rng.randrange(60)]))
+    return date
+
+
+def format_date(rng: random.Random, date: datetime) -> str:
+    """One of the ways a date is written on the agencies' pages"""
+    month = rng.choice([GENITIVE[date.month - 1], f"{date.month}.", f"{date.month:02d}."])
+    return rng.choice([
+        f"{date.day}. {month} {date.year}.",
+        f"{date.day}.{month}{date.year}.",
+        f"{date.day:02d}. {month.upper()} {date.year}",
+    ])
+
+
+def format_time(rng: random.Random, date: datetime) -> str:
+    options = [f"u {date.hour}:{date.minute:02d}", f"do {date.hour}.{date.minute:02d} sati", f"{date.hour:02d}:{date.minute:02d} h"]
+    if date.minute == 0:
+        options += [f"do {date.hour}. sati", f"do {date.hour} sati"]
+    return rng.choice(options)
+
+
+def test_generated_dates_round_trip():
+    """Test that randomly generated dates in all supported formats parse back to the same value"""
+    rng = random.Random(44)
+    for _ in range(2000):
+        with_time = rng.random() < 0.5
+        date = random_datetime(rng, with_time)
+        text = format_date(rng, date)
+        if with_time:
+            text += " " + format_time(rng, date)
+        prefix = rng.choice(["", "Rok: ", "najkasnije   ", "Objavljeno\n"])
+        assert parse_hr_date(prefix + text + rng.choice(["", " godine", ". Prijave se podnose..."])) == date, text
+
+
+def test_generated_ranges_round_trip():
+    """Test that ranges return (start, end) and a shortened start takes month and year from the end"""
+    rng = random.Random(4)
+    for _ in range(1000):
+        start = random_datetime(rng, with_time=False)
+        end = random_datetime(rng, with_time=False)
+        if end < start:
+            start, end = end, start
+        if rng.random() < 0.5:
+            end = end.replace(hour=rng.randrange(24), minute=rng.randrange(60))
+        if start.year == end.year and start.month == end.month and rng.random() < 0.5:
+            start_text = f"{start.day}."
+        else:
+            start_text = format_date(rng, start)
+        end_text = format_date(rng, end)
+        if end.hour or end.minute:
+            end_text += " " + format_time(rng, end)
+        separator = rng.choice([" - ", "–", " — ", " do "])
+        text = rng.choice(["", "od "]) + start_text + separator + end_text
+        assert parse_hr_date_range(text) == (start, end), text
+
+
+def test_invalid_and_missing_dates():
+    """Test impossible dates, unknown months and text without dates give None"""
+    for text in ["31. veljače 2024.", "15. nečega 2024.", "15. 13. 2024.", "2024.", "do 16. sati", "", None]:
+        assert parse_hr_date(text) is None
+        assert parse_hr_date_range(text) is None
+    assert parse_hr_date("15. studenog 2024. u 25:00") == datetime(2024, 11, 15)
+    assert all(1 <= month <= 12 for month in MONTHS.values())
+
+
+def test_labeled_dates_in_call_text():
+    """Test deadline and publish date extraction from HRZZ-style call descriptions"""
+    text = (
+        "Hrvatska zaklada za znanost raspisuje natječaj za istraživačke projekte. " * 20
+        + "Datum raspisivanja natječaja: 1. listopada 2024. "
+        + "Rok za prijavu projektnih prijedloga: od 2. do 15. studenoga 2024. do 16. sati. "
+        + "Rezultati se očekuju 1. ožujka 2025."
+    )
+    assert find_publish_date(text) == datetime(2024, 10, 1)
+    assert find_deadline(text) == datetime(2024, 11, 15, 16, 0)
+    assert find_deadline("ROK ZA PRIJAVE: 3.3.2025. u 12:00") == datetime(2025, 3, 3, 12, 0)
+    assert find_deadline("Bez roka. 1. ožujka 2025.") is None
+
+
+def test_range_across_year_boundary():
+    """Test that a start without a year later in the year than the end belongs to the previous year"""
+    assert parse_hr_date_range("15. prosinca - 15. siječnja 2025.") == (datetime(2024, 12, 15), datetime(2025, 1, 15))
+    assert find_deadline("Rok za prijavu: od 15. prosinca do 15. siječnja 2025.") == datetime(2025, 1, 15)
+    assert parse_hr_date_range("15. - 10. ožujka 2025.") is None
+
+
+def test_amount_after_date_is_not_a_time():
+    """Test that a dotted number without "u"/"do" or "h"/"sati" is not read as a time"""
+    assert find_deadline("Rok za prijavu: 15.11.2024. Iznos: 10.50 EUR") == datetime(2024, 11, 15)
+    assert find_deadline("Rok za prijavu: 15.11.2024. do 10.50 EUR po satu") == datetime(2024, 11, 15)
+    assert find_deadline("Rok za prijavu: 15.11.2024. u 10.50") == datetime(2024, 11, 15, 10, 50)
+    assert parse_hr_date("15. studenoga 2024. 12.30 h") == datetime(2024, 11, 15, 12, 30)
@@ -0,0 +1,255 @@
+import httpx
+import openai
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.llm.llm_service import LLMService, estimate_cost, is_retryable_error
+from src.llm.prompt_builder import TokenCounter, drop_boilerplate, extract_within_budget
+from src.llm.extractive_summarizer import ExtractiveSummarizer
+from src.llm.response_parser import ResponseParseError, parse_summary_response
+
+
+LONG_OPIS = (
+    "Ovo je uvodna rečenica o programu. " * 80
+    + "Rok za prijavu je 15. ožujka 2026. "
+    + "Iznos potpore je do 50.000 EUR. "
+    + "Prihvatljivi prijavitelji su mala i srednja poduzeća. "
+    + "Pročitajte više na našoj Facebook stranici."
+)
+
+
+def test_extract_keeps_key_sentences():
+    """Test that deadline, amount and eligibility survive truncation"""
+    counter = TokenCounter()
+    extracted, tokens = extract_within_budget(LONG_OPIS, 60, counter)
+
+    assert tokens <= 60
+    assert "15. ožujka 2026" in extracted
+    assert "50.000 EUR" in extracted
+    assert "Prihvatljivi prijavitelji" in extracted
+    assert "Facebook" not in extracted
+
+
+def test_boilerplate_matches_whole_words_and_spares_key_sentences():
+    """Test that only whole boilerplate words are dropped and key sentences are always kept"""
+    sentences = [
+        "Ukupno će se podijeliti 2 milijuna EUR bespovratnih sredstava.",
+        "Program je namijenjen shareholders i pretplatnicima časopisa.",
+        "Podijeli na Facebook.",
+        "Ova stranica koristi kolačiće.",
+        "Prijave se podnose do 15. ožujka, pročitajte više u uputama.",
+    ]
+    assert drop_boilerplate(sentences) == [sentences[0], sentences[1], sentences[4]]
+
+
+def test_extract_short_text_unchanged():
+    """Test that text within budget is not modified"""
+    counter = TokenCounter()
+    text = "Kratki opis natječaja."
+    extracted, tokens = extract_within_budget(text, 100, counter)
+
+    assert extracted == text
+    assert tokens == counter.count(text)
+
+
+def _fake_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def _api_error(error_class, status_code: int):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return error_class("API error", response=httpx.Response(status_code, request=request), body=None)
+
+
+def test_build_prompt_respects_budget():
+    """Test that prompt size is bounded by the input token budget"""
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        raise _api_error(openai.BadRequestError, 400)
+
+    service = LLMService(input_token_budget=80)
+    service.client = _fake_client(create)
+    service.enabled = True
+    service._record_call = lambda data, **kwargs: None
+    service.generate_summary({'naziv': 'Test', 'opis': LONG_OPIS})
+
+    prompt = requests[0]['messages'][-1]['content']
+    assert "NAZIV: Test" in prompt
+    assert service.last_prompt_tokens == service.token_counter.count(prompt)
+    assert service.last_prompt_tokens < service.token_counter.count(LONG_OPIS)
+
+
+def test_extractive_summary_fields():
+    """Test extractive summarizer fills sazetek, keywords and relevance"""
+    summarizer = ExtractiveSummarizer()
+    result = summarizer.summarize({
+        'naziv': 'Umjetna inteligencija u zdravstvu',
+        'opis': (
+            "Natječaj financira primjenu umjetne inteligencije u dijagnostici. "
+            "Rok za prijavu je 15. ožujka 2026. "
+            "Pratite nas na Facebook stranici."
+        ),
+        'kategorija': 'Inovacije',
+        'podrucje_istrazivanja': 'Medicina'
+    })
+
+    assert "Rok za prijavu" in result['sazetek']
+    assert "Facebook" not in result['sazetek']
+    assert "inteligencija" in result['kljucne_rijeci']
+    assert result['preporuka_relevantnosti'] == 'visoka'
+    assert result['ai_generated'] is False
+
+
+def test_batch_idf_does_not_leak_into_shared_summarizer():
+    """Test that summarize_batch leaves the instance IDF used by summarize() untouched"""
+    summarizer = ExtractiveSummarizer()
+    natjecaj = {'naziv': 'Digitalna transformacija', 'opis': 'Potpora za digitalnu opremu i računalne usluge.'}
+    before = summarizer.summarize(natjecaj)
+
+    summarizer.summarize_batch([
+        natjecaj,
+        {'naziv': 'Digitalni alati', 'opis': 'Digitalna oprema za škole.'},
+        {'naziv': 'Digitalno selo', 'opis': 'Digitalna infrastruktura u ruralnim područjima.'},
+    ])
+    assert summarizer.summarize(natjecaj) == before
+
+
+def test_fallback_uses_extractive_summary():
+    """Test that disabled LLM service returns extractive summaries in batch"""
+    service = LLMService()
+    service.enabled = False
+    results = service.batch_generate_summaries([
+        {'id': 1, 'naziv': 'Potpora poduzetnicima', 'opis': 'Potpora za nabavu opreme malim poduzećima.'},
+        {'id': 2, 'naziv': 'Istraživački projekti', 'opis': ''},
+    ])
+
+    assert [r['natjecaj_id'] for r in results] == [1, 2]
+    assert all(r['summary']['model_koristen'] == 'extractive' for r in results)
+    assert "Istraživački projekti" in results[1]['summary']['sazetek']
+
+
+def test_estimate_cost_uses_longest_prefix():
+    """Test that model pricing is matched by the most specific model name"""
+    assert estimate_cost("gpt-4o-mini", 1000, 1000) < estimate_cost("gpt-4o", 1000, 1000)
+    assert estimate_cost("gpt-4", 1000, 0) == 0.03
+    assert estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+
+def _failing_service(error: Exception, recorded: list) -> tuple:
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        raise error
+
+    service = LLMService(max_retries=2)
+    service.client = _fake_client(create)
+    service.enabled = True
+    service.retry_backoff = 0
+    service._record_call = lambda data, **kwargs: recorded.append(kwargs)
+    return service, calls
+
+
+def test_failed_calls_are_retried_and_recorded():
+    """Test that transient API errors are retried and the call is recorded as failed"""
+    recorded = []
+    service, calls = _failing_service(_api_error(openai.RateLimitError, 429), recorded)
+
+    result = service.generate_summary({'naziv': 'Test', 'opis': 'Opis natječaja.'})
+
+    assert len(calls) == 3
+    assert result['ai_generated'] is False
+    assert recorded[0]['status'] == "failed"
+    assert recorded[0]['retries'] == 2
+    assert recorded[0]['fallback'] is True
+
+
+@pytest.mark.parametrize("error", [
+    _api_error(openai.AuthenticationError, 401),
+    _api_error(openai.BadRequestError, 400),
+    _api_error(openai.PermissionDeniedError, 403),
+    ValueError("unexpected response"),
+])
+def test_permanent_errors_fall_back_without_retry(error):
+    """Test that errors which would fail again go straight to the fallback summary"""
+    recorded = []
+    service, calls = _failing_service(error, recorded)
+
+    result = service.generate_summary({'naziv': 'Test', 'opis': 'Opis natječaja.'})
+
+    assert len(calls) == 1
+    assert result['ai_generated'] is False
+    assert recorded[0]['status'] == "failed"
+    assert recorded[0]['retries'] == 0
+
+
+def test_server_errors_are_retryable():
+    """Test the transient error classification"""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    assert is_retryable_error(openai.APITimeoutError(request=request))
+    assert is_retryable_error(openai.APIConnectionError(request=request))
+    assert is_retryable_error(_api_error(openai.InternalServerError, 503))
+    assert not is_retryable_error(_api_error(openai.NotFoundError, 404))
+
+
+def test_parse_structured_response_tolerates_fences_and_truncation():
+    """Test JSON parsing of fenced and cut-off responses"""
+    fenced = '```json\n{"sazetek": "Prva rečenica.\\nDruga rečenica.", "kljucne_rijeci": ["AI", "zdravstvo"], "relevantnost": "Visoka"}\n```'
+    result = parse_summary_response(fenced)
+    assert result == {
+        'sazetek': "Prva rečenica. Druga rečenica.",
+        'kljucne_rijeci': "AI, zdravstvo",
+        'preporuka_relevantnosti': "visoka"
+    }
+
+    truncated = '{"relevantnost": "niska", "kljucne_rijeci": ["a", "b"], "sazetek": "Sažetak koji je prekinut'
+    assert parse_summary_response(truncated)['sazetek'] == "Sažetak koji je prekinut"
+
+
+def test_parse_labeled_response_keeps_multiline_summary():
+    """Test that multi-line SAŽETAK sections are not cut to the first line"""
+    text = "SAŽETAK: Prva linija.\nDruga linija.\nKLJUČNE RIJEČI: a, b\nRELEVANTNOST: niska"
+    result = parse_summary_response(text, structured=False)
+    assert result['sazetek'] == "Prva linija. Druga linija."
+    assert result['preporuka_relevantnosti'] == "niska"
+
+
+def test_parse_invalid_response_raises():
+    """Test that unparseable output raises instead of landing in sazetek"""
+    with pytest.raises(ResponseParseError):
+        parse_summary_response("Ne mogu odgovoriti na ovo pitanje.")
+    with pytest.raises(ResponseParseError):
+        parse_summary_response('{"sazetek": "Ok", "relevantnost": "možda"}')
+
+
+def test_invalid_response_gets_one_repair_retry():
+    """Test that an invalid completion triggers exactly one repair request"""
+    replies = ["Ovo nije JSON.", '{"sazetek": "Popravljeno.", "kljucne_rijeci": ["x"], "relevantnost": "srednja"}']
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        message = SimpleNamespace(content=replies[len(requests) - 1], tool_calls=None)
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    recorded = []
+    service = LLMService()
+    service.client = _fake_client(create)
+    service.enabled = True
+    service._record_call = lambda data, **kwargs: recorded.append(kwargs)
+
+    result = service.generate_summary({'naziv': 'Test', 'opis': 'Opis.'})
+
+    assert len(requests) == 2
+    assert requests[1]['messages'][-2]['content'] == "Ovo nije JSON."
+    assert result['sazetek'] == "Popravljeno."
+    assert result['token_count'] == 30
+    assert recorded[0]['status'] == "success"
+    assert recorded[0]['retries'] == 1
@@ -0,0 +1,109 @@
+from fastapi.testclient import TestClient
+import json
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.api.main import app
+from src.api.metrics import SharedMetrics
+from src.database.database import get_db_session, init_db
+from src.database import crud
+from src.database.models import MetricsSnapshot
+from src.utils.metrics import DEFAULT_BUCKETS, Counter, Histogram, SCRAPER_DOWNLOADED_BYTES, SCRAPER_PARSE_DURATION
+from src.scrapers.pipeline import ScrapePipeline
+from tests.test_scrape_pipeline import SavedPagesScraper
+
+
+def test_histogram_and_counter_exposition():
+    """Test cumulative buckets, sum/count and label escaping in the text format"""
+    histogram = Histogram("test_duration_seconds", "Test durations", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+    counter = Counter("test_bytes_total", "Test bytes", ("host",))
+    counter.inc('ex"ample', amount=10)
+    counter.inc('ex"ample', amount=5)
+
+    lines = histogram.render() + counter.render()
+    assert "# TYPE test_duration_seconds histogram" in lines
+    assert 'test_duration_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_duration_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'test_duration_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_duration_seconds_sum{route="/a"} 3.65' in lines
+    assert 'test_duration_seconds_count{route="/a"} 4' in lines
+    assert 'test_bytes_total{host="ex\\"ample"} 15' in lines
+
+
+def test_metrics_endpoint_reports_routes_and_queries():
+    """Test that API requests are recorded per route template along with DB statements"""
+    init_db()
+    client = TestClient(app)
+    client.get("/api/natjecaji", params={"limit": 5})
+    client.get("/api/natjecaji/999999999")
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/natjecaji",status="200"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/natjecaji/{natjecaj_id}",status="404"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in body
+
+
+def test_parse_time_is_recorded_in_thread_and_in_worker_processes():
+    """Test that page parse durations reach the parent process with a process pool too"""
+    before = SCRAPER_PARSE_DURATION.count("HAMAG-BICRO")
+    list(ScrapePipeline(SavedPagesScraper()))
+    list(ScrapePipeline(SavedPagesScraper(), parse_workers=2))
+    assert SCRAPER_PARSE_DURATION.count("HAMAG-BICRO") - before == 4
+
+
+def test_shared_metrics_sum_every_worker():
+    """Test that any worker reports counters and histograms summed over all workers"""
+    init_db()
+    SCRAPER_DOWNLOADED_BYTES.inc("metrics-test.example", amount=100)
+    SCRAPER_PARSE_DURATION.observe(0.002, "METRICS-TEST")
+    other_worker = {
+        "scraper_downloaded_bytes_total": [[["metrics-test.example"], 50.0]],
+        "scraper_parse_duration_seconds": [[["METRICS-TEST"], [[0] * len(DEFAULT_BUCKETS) + [1], 90.0, 1]]],
+    }
+    shared = SharedMetrics(publish_interval=60, worker_ttl=3600)
+    try:
+        with get_db_session() as db:
+            crud.save_metrics_snapshot(db, "other-worker", json.dumps(other_worker))
+
+        body = shared.render().splitlines()
+        assert 'scraper_downloaded_bytes_total{host="metrics-test.example"} 150' in body
+        assert 'scraper_parse_duration_seconds_bucket{source="METRICS-TEST",le="0.005"} 1' in body
+        assert 'scraper_parse_duration_seconds_bucket{source="METRICS-TEST",le="+Inf"} 2' in body
+        assert 'scraper_parse_duration_seconds_count{source="METRICS-TEST"} 2' in body
+    finally:
+        with get_db_session() as db:
+            db.query(MetricsSnapshot).filter(
+                MetricsSnapshot.worker.in_(["other-worker", shared.worker_id()])
+            ).delete(synchronize_session=False)
+
+
+def test_stale_and_stopped_worker_snapshots_are_deleted():
+    """Test that publishing prunes snapshots older than the TTL and stop() removes the worker's own"""
+    init_db()
+    shared = SharedMetrics(publish_interval=60, worker_ttl=60)
+    with get_db_session() as db:
+        crud.save_metrics_snapshot(db, "restarted-worker", "{}")
+        db.query(MetricsSnapshot).filter(MetricsSnapshot.worker == "restarted-worker").update(
+            {MetricsSnapshot.updated_at: datetime.utcnow() - timedelta(hours=1)}
+        )
+        db.commit()
+
+    shared.start()
+    shared.publish()
+    with get_db_session() as db:
+        workers = {row.worker for row in db.query(MetricsSnapshot.worker)}
+    assert shared.worker_id() in workers and "restarted-worker" not in workers
+
+    shared.stop()
+    with get_db_session() as db:
+        assert db.get(MetricsSnapshot, shared.worker_id()) is None
@@ -0,0 +1,181 @@
+import threading
+import time
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config.settings import settings
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.hamag_scraper import HAMAGBICROScraper
+from src.scrapers.scraper_manager import ScraperManager
+from src.scrapers.pipeline import ScrapePipeline, _ProcessStage, create_parse_pool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "hamag")
+
+
+class PagedScraper(BaseScraper):
+    """Endless paged source counting fetched pages"""
+
+    def __init__(self, fail_on_page=None):
+        super().__init__(source_name="TEST-PAGED", base_url="https://example.com")
+        self.fail_on_page = fail_on_page
+        self.fetched = 0
+        self.closed = threading.Event()
+
+    def scrape(self):
+        return list(self.stream())
+
+    def iter_pages(self):
+        try:
+            page = 0
+            while True:
+                page += 1
+                self.fetched = page
+                yield page
+        finally:
+            self.closed.set()
+
+    def parse_page(self, page):
+        if page == self.fail_on_page:
+            raise ValueError(f"bad page {page}")
+        return [{"naziv": f"  Natječaj   {page} ", "url": f"https://example.com/{page}", "opis": ""}]
+
+
+class SavedPagesScraper(HAMAGBICROScraper):
+    """HAMAG scraper reading saved listing pages instead of the network"""
+
+    def iter_pages(self):
+        for name in sorted(os.listdir(FIXTURES_DIR)):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+                yield "html", f.read()
+
+
+class ConfiguredScraper(SavedPagesScraper):
+    """Scraper whose constructor needs an argument - a worker process cannot rebuild it"""
+
+    def __init__(self, listing_url):
+        super().__init__()
+        self.listing_url = listing_url
+
+
+class WorkerPidScraper(BaseScraper):
+    """Four pages, each parsed into a natjecaj named after the parsing process"""
+
+    def __init__(self):
+        super().__init__(source_name="TEST-PID", base_url="https://example.com")
+
+    def scrape(self):
+        return list(self.stream())
+
+    def iter_pages(self):
+        yield from range(4)
+
+    def parse_page(self, page):
+        return [{"naziv": str(os.getpid()), "url": f"https://example.com/{page}"}]
+
+
+class SlowScraper(BaseScraper):
+    """Item-by-item source with a pause in the middle"""
+
+    def __init__(self):
+        super().__init__(source_name="TEST-SLOW", base_url="https://example.com")
+
+    def scrape(self):
+        return list(self.stream())
+
+    def iter_natjecaji(self):
+        yield {"naziv": "Prvi", "url": "https://example.com/1"}
+        yield {"naziv": "Prvi", "url": "https://example.com/1"}
+        time.sleep(0.6)
+        yield {"naziv": "Drugi", "url": "https://example.com/2"}
+
+
+def test_pipeline_is_bounded_and_normalizes():
+    """Test that fetching stays a bounded distance ahead of a slow consumer"""
+    scraper = PagedScraper()
+    stream = iter(ScrapePipeline(scraper, queue_size=2))
+
+    first = [next(stream) for _ in range(5)]
+    time.sleep(0.3)
+    assert scraper.fetched < 20
+
+    assert first[0] == {"naziv": "Natječaj 1", "url": "https://example.com/1", "opis": None}
+    stream.close()
+    assert scraper.closed.wait(2)
+
+
+def test_pipeline_reraises_stage_errors():
+    """Test that a parse error reaches the consumer after the earlier records"""
+    received = []
+    with pytest.raises(ValueError, match="bad page 3"):
+        for natjecaj in ScrapePipeline(PagedScraper(fail_on_page=3)):
+            received.append(natjecaj["naziv"])
+    assert received == ["Natječaj 1", "Natječaj 2"]
+
+
+def test_batches_flush_partial_results_of_slow_sources():
+    """Test that a batch is written after max_delay even if it is not full and repeats are dropped"""
+    start = time.monotonic()
+    arrivals = []
+    for batch in ScrapePipeline(SlowScraper()).batches(batch_size=100, max_delay=0.1):
+        arrivals.append(([natjecaj["naziv"] for natjecaj in batch], time.monotonic() - start))
+
+    assert [names for names, _ in arrivals] == [["Prvi"], ["Drugi"]]
+    assert arrivals[0][1] < 0.5
+
+
+def test_process_pool_parsing_matches_in_thread_parsing():
+    """Test that parsing saved pages in worker processes gives the same natjecaji"""
+    in_thread = list(ScrapePipeline(SavedPagesScraper()))
+    in_processes = list(ScrapePipeline(SavedPagesScraper(), parse_workers=2))
+
+    assert len(in_thread) == 6
+    assert sorted(in_processes, key=lambda n: n["url"]) == sorted(in_thread, key=lambda n: n["url"])
+    poc = next(n for n in in_processes if "PoC" in n["naziv"])
+    assert poc["datum_objave"] == datetime(2024, 11, 15)
+    assert poc["url"] == "https://hamagbicro.hr/natjecaji/dokazivanje-inovativnog-koncepta-poc-2024/"
+
+
+def test_scraper_needing_arguments_is_parsed_in_thread():
+    """Test that a scraper which cannot be built without arguments falls back to in-thread parsing"""
+    assert _ProcessStage.supports(SavedPagesScraper())
+    scraper = ConfiguredScraper("https://example.com/natjecaji/")
+    assert not _ProcessStage.supports(scraper)
+
+    natjecaji = list(ScrapePipeline(scraper, parse_workers=2))
+    assert len(natjecaji) == 6
+
+
+def test_shared_parse_pool_outlives_the_runs():
+    """Test that runs given a pool parse in its worker processes and leave it running"""
+    pool = create_parse_pool(2)
+    try:
+        first = {n["naziv"] for n in ScrapePipeline(WorkerPidScraper(), parse_workers=2, pool=pool)}
+        second = {n["naziv"] for n in ScrapePipeline(WorkerPidScraper(), parse_workers=2, pool=pool)}
+    finally:
+        pool.shutdown()
+
+    assert str(os.getpid()) not in first
+    # The second run reused the first run's worker processes
+    assert second <= first
+
+
+def test_manager_keeps_one_parse_pool(monkeypatch):
+    """Test that a manager creates its parse pool once and a closed manager starts a new one"""
+    manager = ScraperManager()
+    monkeypatch.setattr(settings, "scrape_parse_workers", 0)
+    assert manager._get_parse_pool() is None
+
+    monkeypatch.setattr(settings, "scrape_parse_workers", 2)
+    pool = manager._get_parse_pool()
+    try:
+        assert manager._get_parse_pool() is pool
+    finally:
+        manager.close()
+    replacement = manager._get_parse_pool()
+    manager.close()
+    assert replacement is not pool
@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta
+import json
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.testclient import TestClient
+
+import pytest
+
+from src.api import main
+from src.database import crud
+from src.database.database import get_db_session, init_db
+from src.database.models import SchedulerLock, ScrapeRun
+from config.settings import settings
+from src.scrapers.progress import RUN_LOCK_NAME, ScrapeProgress, ScrapeRunAborted, SharedScrapeProgress
+from src.scrapers.scraper_manager import ScraperManager
+
+
+class FakeScraper:
+    """Scraper that reports progress without network access"""
+
+    def __init__(self, items, fail=False):
+        self.items = items
+        self.fail = fail
+        self.progress_callback = None
+
+    def scrape(self):
+        for count in range(1, len(self.items) + 1):
+            self.progress_callback(count)
+        if self.fail:
+            raise RuntimeError("site unavailable")
+        return self.items
+
+
+def test_progress_tracks_sources():
+    """Test per-source status, item counts and run state"""
+    progress = ScrapeProgress()
+    progress.start_run(["A", "B"])
+    progress.source_started("A")
+    progress.items_found("A", 3)
+    progress.source_finished("A", found=3, added=2, updated=1)
+    progress.source_failed("B", "timeout")
+    progress.finish_run({"total_scraped": 3})
+
+    snapshot = progress.snapshot()
+    assert snapshot["state"] == "finished"
+    assert snapshot["items_found"] == 3
+    assert [s["status"] for s in snapshot["sources"]] == ["success", "failed"]
+    assert snapshot["sources"][1]["error"] == "timeout"
+
+
+def test_manager_reports_progress(monkeypatch):
+    """Test that a managed run feeds progress from scraper callbacks"""
+    manager = ScraperManager()
+    manager.scrapers = {"OK": FakeScraper([]), "BROKEN": FakeScraper([{}, {}], fail=True)}
+    for name, scraper in manager.scrapers.items():
+        scraper.progress_callback = lambda count, name=name: manager.progress.items_found(name, count)
+    monkeypatch.setattr(manager, "log_scraping_activity", lambda *args, **kwargs: None)
+
+    stats = manager.run_all_scrapers()
+    snapshot = manager.progress.snapshot()
+    assert stats["errors"] == 1
+    assert snapshot["state"] == "finished"
+    assert {s["name"]: s["status"] for s in snapshot["sources"]} == {"OK": "success", "BROKEN": "failed"}
+    assert snapshot["sources"][1]["items_found"] == 2
+
+
+def test_progress_stream_sends_snapshot(monkeypatch):
+    """Test that the SSE stream sends the current snapshot and ends when no run is active"""
+    monkeypatch.setattr(main.services.scraper_manager, "progress", ScrapeProgress())
+    client = TestClient(main.app)
+
+    with client.stream("GET", "/api/scrape/progress/stream") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    data_line = next(line for line in body.splitlines() if line.startswith("data: "))
+    assert json.loads(data_line[len("data: "):])["state"] == "idle"
+    assert client.get("/api/scrape/progress").json()["state"] == "idle"
+
+
+def test_shared_progress_is_visible_to_other_workers():
+    """Test a run started in one worker is seen and not duplicated by another worker"""
+    init_db()
+    running, other = SharedScrapeProgress(), SharedScrapeProgress()
+    run_id = running.start_run(["A", "B"])
+    try:
+        assert other.is_running()
+        with pytest.raises(RuntimeError):
+            other.start_run(["A"])
+
+        running.source_started("A")
+        snapshot = other.snapshot()
+        assert snapshot["run_id"] == run_id and snapshot["sources"][0]["status"] == "running"
+
+        running.source_finished("A", 3, 2, 1)
+        updated = other.snapshot()
+        assert updated["version"] > snapshot["version"]
+        source = updated["sources"][0]
+        assert source["status"] == "success" and source["added"] == 2
+
+        # A worker that stops renewing the run lock leaves a failed run, not a stuck one
+        with get_db_session() as db:
+            db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).update(
+                {"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        assert other.snapshot()["state"] == "failed" and not other.is_running()
+    finally:
+        running.finish_run({"added": 2})
+
+    assert other.snapshot()["state"] == "finished" and not other.is_running()
+    with get_db_session() as db:
+        db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).delete()
+        db.query(ScrapeRun).filter(ScrapeRun.run_id == run_id).delete()
+
+
+def test_run_lock_is_renewed_without_progress_and_loss_stops_the_run(monkeypatch):
+    """Test the heartbeat keeps a silent run alive and a lost lock aborts the run"""
+    init_db()
+    monkeypatch.setattr(settings, "scrape_run_lock_seconds", 0.3)
+    progress, other = SharedScrapeProgress(heartbeat_interval=0.05), SharedScrapeProgress()
+    run_id = progress.start_run(["A"])
+    try:
+        # No progress events for longer than the lock lifetime
+        time.sleep(0.6)
+        assert other.is_running()
+        progress.check_active()
+
+        with get_db_session() as db:
+            db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).update(
+                {"holder": "other-worker", "expires_at": datetime.utcnow() + timedelta(seconds=60)})
+        deadline = time.monotonic() + 5
+        while not progress.lock_lost and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with pytest.raises(ScrapeRunAborted):
+            progress.check_active()
+    finally:
+        progress.finish_run(error="aborted")
+        with get_db_session() as db:
+            db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).delete()
+            db.query(ScrapeRun).filter(ScrapeRun.run_id == run_id).delete()
+
+
+def test_finish_run_stops_heartbeat_before_releasing_lock(monkeypatch):
+    """Test the heartbeat thread has exited before the lock is released, so it cannot retake it"""
+    init_db()
+    progress = SharedScrapeProgress(heartbeat_interval=0.01)
+    run_id = progress.start_run(["A"])
+    heartbeat = progress._heartbeat_thread
+    time.sleep(0.05)
+    progress.finish_run({"added": 0})
+
+    assert not heartbeat.is_alive()
+    time.sleep(0.05)
+    with get_db_session() as db:
+        assert crud.get_scheduler_lock(db, RUN_LOCK_NAME).holder is None
+        db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).delete()
+        db.query(ScrapeRun).filter(ScrapeRun.run_id == run_id).delete()
+
+
+def test_progress_is_stored_outside_the_lock(monkeypatch):
+    """Test that readers are not blocked while a progress snapshot is written to the database"""
+    init_db()
+    progress = SharedScrapeProgress()
+    run_id = progress.start_run(["A"])
+    writing, release = threading.Event(), threading.Event()
+    save_scrape_run = crud.save_scrape_run
+
+    def slow_save(db, snapshot, payload):
+        writing.set()
+        release.wait(5)
+        save_scrape_run(db, snapshot, payload)
+
+    monkeypatch.setattr(crud, "save_scrape_run", slow_save)
+    try:
+        writer = threading.Thread(target=progress.source_started, args=("A",))
+        writer.start()
+        assert writing.wait(5)
+        reader = threading.Thread(target=progress.snapshot)
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive(), "snapshot() waited for the database write"
+        release.set()
+        writer.join(5)
+    finally:
+        release.set()
+        progress.finish_run({"added": 0})
+        with get_db_session() as db:
+            assert crud.get_latest_scrape_run(db).state == "finished"
+            db.query(SchedulerLock).filter(SchedulerLock.name == RUN_LOCK_NAME).delete()
+            db.query(ScrapeRun).filter(ScrapeRun.run_id == run_id).delete()
+
+
+def test_manager_stops_when_run_is_aborted(monkeypatch):
+    """Test that an aborted run skips the remaining sources and is reported as failed"""
+    progress = ScrapeProgress()
+    manager = ScraperManager(progress=progress)
+    manager.scrapers = {"A": FakeScraper([]), "B": FakeScraper([])}
+    monkeypatch.setattr(manager, "log_scraping_activity", lambda *args, **kwargs: None)
+
+    def abort_after_first_source():
+        if progress.sources["A"]["status"] != "pending":
+            raise ScrapeRunAborted("lock lost")
+
+    monkeypatch.setattr(progress, "check_active", abort_after_first_source)
+    with pytest.raises(ScrapeRunAborted):
+        manager.run_all_scrapers()
+
+    snapshot = progress.snapshot()
+    assert snapshot["state"] == "failed"
+    assert {s["name"]: s["status"] for s in snapshot["sources"]} == {"A": "success", "B": "pending"}
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.database.database import init_db, get_db_session
+from src.database import crud
+from src.database.models import ScrapingLog, SchedulerLock
+from src.scrapers.progress import ScrapeProgress
+from src.scrapers.scheduler import ScrapeScheduler, adaptive_interval_hours
+
+
+class FakeManager:
+    """Records started runs instead of scraping"""
+
+    def __init__(self, sources):
+        self.scrapers = {name: None for name in sources}
+        self.progress = ScrapeProgress()
+        self.started = []
+
+    def start_background_run(self, sources=None):
+        self.started.append(sources)
+        return self.progress.start_run(sources)
+
+
+def test_adaptive_interval():
+    """Test that the interval shrinks for active sources and near deadlines and grows for static ones"""
+    now = datetime(2030, 1, 1)
+    bounds = dict(now=now, min_hours=1, max_hours=96, deadline_window_days=3)
+
+    assert adaptive_interval_hours(24, [], **bounds) == 24
+    assert adaptive_interval_hours(24, [0, 5, 0], **bounds) == 12
+    assert adaptive_interval_hours(24, [0, 0, 0], **bounds) == 48
+    assert adaptive_interval_hours(24, [0, 0, 0], nearest_deadline=now + timedelta(days=2), **bounds) == 6
+    assert adaptive_interval_hours(2, [3], nearest_deadline=now + timedelta(hours=5), **bounds) == 1
+    assert adaptive_interval_hours(72, [0, 0, 0], **bounds) == 96
+
+
+def test_scheduler_lock_has_single_holder():
+    """Test that only one replica holds the lock until it expires or is released"""
+    init_db()
+    name = "test-lock"
+    try:
+        with get_db_session() as db:
+            assert crud.acquire_scheduler_lock(db, name, "replica-a", ttl_seconds=60)
+            assert not crud.acquire_scheduler_lock(db, name, "replica-b", ttl_seconds=60)
+            assert crud.acquire_scheduler_lock(db, name, "replica-a", ttl_seconds=60)
+
+            assert crud.release_scheduler_lock(db, name, "replica-a")
+            assert crud.acquire_scheduler_lock(db, name, "replica-b", ttl_seconds=-1)
+            # Expired lock is taken over
+            assert crud.acquire_scheduler_lock(db, name, "replica-a", ttl_seconds=60)
+            assert crud.get_scheduler_lock(db, name).holder == "replica-a"
+    finally:
+        with get_db_session() as db:
+            db.query(SchedulerLock).filter(SchedulerLock.name == name).delete()
+
+
+def test_scheduler_runs_due_sources_on_leader_only():
+    """Test that the leader starts due sources, skips while running and followers do nothing"""
+    init_db()
+    lock_name = "test-scheduler"
+    now = datetime.utcnow()
+    sources = ["TEST-SCHED-NEW", "TEST-SCHED-FRESH"]
+    with get_db_session() as db:
+        db.add(ScrapingLog(izvor="TEST-SCHED-FRESH", status="success", natjecaji_dodani=0, created_at=now))
+
+    leader_manager = FakeManager(sources)
+    leader = ScrapeScheduler(leader_manager, poll_seconds=60, holder_id="leader", lock_name=lock_name, rng=random.Random(1))
+    follower = ScrapeScheduler(FakeManager(sources), poll_seconds=60, holder_id="follower", lock_name=lock_name)
+
+    try:
+        # Never scraped source is due, the one scraped just now is not
+        assert leader.tick(now) == ["TEST-SCHED-NEW"]
+        assert follower.tick(now) == [] and not follower.is_leader
+
+        # Previous run still going
+        assert leader.tick(now + timedelta(days=3)) == []
+        assert leader_manager.started == [["TEST-SCHED-NEW"]]
+
+        leader_manager.progress.finish_run({})
+        next_run = leader.next_runs(now)["TEST-SCHED-FRESH"]
+        assert now + timedelta(hours=21) <= next_run <= now + timedelta(hours=27)
+        assert "TEST-SCHED-FRESH" in leader.tick(next_run)
+    finally:
+        leader.stop()
+        with get_db_session() as db:
+            db.query(ScrapingLog).filter(ScrapingLog.izvor.in_(sources)).delete(synchronize_session=False)
+            db.query(SchedulerLock).filter(SchedulerLock.name == lock_name).delete()
@@ -0,0 +1,169 @@
+import sys
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from src.api.main import app
+from src.database.database import init_db, get_db_session
+from src.database import crud
+from src.database.models import ChangeEvent, Natjecaj, SummaryQueueItem
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.diffing import classify_changes, diff_natjecaj
+from src.scrapers.hamag_scraper import HAMAGBICROScraper
+from src.scrapers.scraper_manager import ScraperManager
+
+
+def remove_source(naziv):
+    """Delete a test izdavatelj with its natjecaji, change events and queued summaries"""
+    with get_db_session() as db:
+        izdavatelj = crud.get_izdavatelj_by_name(db, naziv)
+        if izdavatelj is None:
+            return
+        for natjecaj in db.query(Natjecaj).filter(Natjecaj.izdavatelj_id == izdavatelj.id).all():
+            db.query(ChangeEvent).filter(ChangeEvent.natjecaj_id == natjecaj.id).delete()
+            db.query(SummaryQueueItem).filter(SummaryQueueItem.natjecaj_id == natjecaj.id).delete()
+            db.delete(natjecaj)
+        db.delete(izdavatelj)
+
+
+class ListingScraper(BaseScraper):
+    """Source listing the given open calls, optionally with a failed request or an unusable page"""
+
+    def __init__(self, nazivi, failed_request=False, invalid_page=False):
+        super().__init__(source_name="TEST-LISTING", base_url="https://example.com")
+        self.nazivi = nazivi
+        self.failed_request = failed_request
+        self.invalid_page = invalid_page
+
+    def scrape(self):
+        return list(self.stream())
+
+    def iter_pages(self):
+        if self.failed_request:
+            self.fetch_errors += 1
+        if self.invalid_page:
+            self.mark_incomplete("page 2 is not valid JSON")
+        yield self.nazivi
+
+    def parse_page(self, page):
+        return [{"naziv": naziv, "url": f"https://example.com/listing/{naziv}", "status": "active"} for naziv in page]
+
+
+def test_diff_ignores_whitespace_and_int_float():
+    """Test that equal content normalizes to no changes"""
+    stored = SimpleNamespace(naziv="Poziv  za AI", iznos_financiranja=100000.0, rok_prijave=datetime(2030, 3, 1))
+    scraped = {"naziv": "Poziv za AI ", "iznos_financiranja": 100000, "rok_prijave": datetime(2030, 3, 1)}
+    assert diff_natjecaj(stored, scraped) == {}
+
+    scraped["rok_prijave"] = datetime(2030, 4, 1)
+    assert list(diff_natjecaj(stored, scraped)) == ["rok_prijave"]
+
+
+def test_classify_changes():
+    """Test that diffs are split into typed change events"""
+    events = dict(classify_changes({
+        "status": ("active", "closed"),
+        "rok_prijave": (datetime(2030, 3, 1), datetime(2030, 4, 1)),
+        "iznos_financiranja": (1.0, 2.0),
+        "opis": ("a", "b"),
+    }))
+    assert set(events) == {"closed", "deadline_changed", "amount_changed", "updated"}
+    assert list(events["updated"]) == ["opis"]
+
+
+def test_save_only_writes_real_changes():
+    """Test that re-scraping unchanged data writes nothing and changes emit events"""
+    init_db()
+    url = "https://example.com/test-diffing-natjecaj"
+    data = {
+        "naziv": "Test diffing natječaj",
+        "url": url,
+        "opis": "Opis natječaja",
+        "rok_prijave": datetime(2030, 3, 1),
+        "status": "active",
+    }
+    manager = ScraperManager()
+    client = TestClient(app)
+    with get_db_session() as db:
+        since = db.query(func.max(ChangeEvent.id)).scalar() or 0
+
+    try:
+        assert manager.save_to_database("TEST-DIFF", [dict(data)])["added"] == 1
+        with get_db_session() as db:
+            updated_at = db.query(Natjecaj).filter(Natjecaj.url == url).one().updated_at
+
+        stats = manager.save_to_database("TEST-DIFF", [dict(data)])
+        assert stats["unchanged"] == 1 and stats["updated"] == 0
+        with get_db_session() as db:
+            assert db.query(Natjecaj).filter(Natjecaj.url == url).one().updated_at == updated_at
+
+        data["rok_prijave"] = datetime(2030, 4, 1)
+        assert manager.save_to_database("TEST-DIFF", [dict(data)])["updated"] == 1
+
+        feed = client.get("/api/changes", params={"since": since}).json()
+        assert [event["event_type"] for event in feed["events"]] == ["created", "deadline_changed"]
+        assert feed["events"][1]["changes"]["rok_prijave"]["new"] == "2030-04-01T00:00:00"
+        assert feed["next_since"] == feed["events"][-1]["id"]
+    finally:
+        remove_source("TEST-DIFF")
+
+
+def test_calls_missing_from_complete_scrape_are_closed():
+    """Test that open natjecaji dropped from the listing are closed, unless the scrape was incomplete"""
+    init_db()
+    manager = ScraperManager()
+    client = TestClient(app)
+    with get_db_session() as db:
+        since = db.query(func.max(ChangeEvent.id)).scalar() or 0
+
+    try:
+        assert manager.scrape_and_save("TEST-LISTING", ListingScraper(["A", "B", "C"]))[1]["added"] == 3
+
+        # A failed request may have hidden "C" - nothing is closed
+        _, stats = manager.scrape_and_save("TEST-LISTING", ListingScraper(["A", "B"], failed_request=True))
+        assert stats["closed"] == 0
+        # So may a page the scraper could not use
+        _, stats = manager.scrape_and_save("TEST-LISTING", ListingScraper(["A", "B"], invalid_page=True))
+        assert stats["closed"] == 0
+
+        _, stats = manager.scrape_and_save("TEST-LISTING", ListingScraper(["A", "B"]))
+        assert stats["closed"] == 1 and stats["unchanged"] == 2
+        with get_db_session() as db:
+            assert db.query(Natjecaj).filter(Natjecaj.url == "https://example.com/listing/C").one().status == "closed"
+
+        feed = client.get("/api/changes", params={"since": since, "event_type": "closed"}).json()
+        assert [event["changes"]["status"] for event in feed["events"]] == [{"old": "active", "new": "closed"}]
+
+        # Listed again: reopened
+        _, stats = manager.scrape_and_save("TEST-LISTING", ListingScraper(["A", "B", "C"]))
+        assert stats["updated"] == 1 and stats["closed"] == 0
+    finally:
+        remove_source("TEST-LISTING")
+
+
+def test_invalid_wp_api_page_marks_crawl_incomplete(monkeypatch):
+    """Test that a 200 response with invalid JSON cuts the HAMAG crawl and reports it incomplete"""
+    def invalid_json():
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+    responses = {
+        "&page=1&": SimpleNamespace(json=lambda: [{"title": {"rendered": "Poziv"}}], headers={"X-WP-TotalPages": "3"}),
+        "&page=2&": SimpleNamespace(json=invalid_json, headers={"X-WP-TotalPages": "3"}),
+        "categories?slug": SimpleNamespace(json=lambda: [{"id": 7}], headers={}),
+    }
+    scraper = HAMAGBICROScraper()
+    monkeypatch.setattr(scraper, "request", lambda method, url, **kwargs: next(
+        response for key, response in responses.items() if key in url
+    ))
+
+    assert [kind for kind, _ in scraper.iter_pages()] == ["wp"]
+    assert not scraper.crawl_complete and scraper.fetch_errors == 0
+    assert "page=2" in scraper.incomplete_reasons[0]
+
+    scraper.start_crawl()
+    assert scraper.crawl_complete
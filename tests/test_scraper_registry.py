@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.scrapers.registry import ScraperRegistry, ScraperSpec, specs_from_config
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_specs_from_config_skip_sources_without_scraper():
+    """Test that sources are read from the config with their per-source settings"""
+    specs = specs_from_config({
+        "national": [{"name": "A", "scraper": "pkg.a:A", "rate_limit": 2.0, "schedule_hours": 6}],
+        "international": [{"name": "B", "scraper": None}, {"name": "C", "scraper": "pkg.c:C", "enabled": False}],
+    })
+
+    assert [spec.name for spec in specs] == ["A", "C"]
+    assert specs[0].tip == "national" and specs[0].rate_limit == 2.0 and specs[0].schedule_hours == 6
+    assert specs[1].tip == "international" and not specs[1].enabled
+
+
+def test_registry_creates_enabled_scrapers_lazily():
+    """Test that scrapers are only created on first access and disabled ones never"""
+    created = []
+    registry = ScraperRegistry(
+        [
+            ScraperSpec("HAMAG-BICRO", "src.scrapers.hamag_scraper:HAMAGBICROScraper", concurrency=3, rate_limit=0.5),
+            ScraperSpec("Missing", "no.such.module:Scraper", enabled=False),
+        ],
+        on_create=lambda name, scraper: created.append(name)
+    )
+
+    assert list(registry) == ["HAMAG-BICRO"]
+    assert "Missing" not in registry and registry.get("Missing") is None
+    assert not registry.is_loaded("HAMAG-BICRO")
+
+    scraper = registry["HAMAG-BICRO"]
+    assert registry["HAMAG-BICRO"] is scraper
+    assert created == ["HAMAG-BICRO"]
+    assert scraper.concurrency == 3 and scraper.rate_limit == 0.5
+
+
+def test_manager_import_does_not_load_scrapers():
+    """Test that building the manager imports neither scraper modules nor Selenium"""
+    code = (
+        "import sys\n"
+        "from src.scrapers.scraper_manager import ScraperManager\n"
+        "manager = ScraperManager()\n"
+        "assert 'HRZZ' in manager.scrapers\n"
+        "loaded = [m for m in ('selenium', 'src.scrapers.hrzz_scraper', 'src.scrapers.hamag_scraper') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    env = {**os.environ, "PYTHONPATH": ROOT_DIR, "DATABASE_URL": "sqlite://"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,56 @@
+from pathlib import Path
+import subprocess
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The framework is imported first, so the budget covers the application's own import cost
+FRAMEWORK = "fastapi, sqlalchemy.orm, pydantic_settings, loguru"
+# Wall-clock timings depend on the machine - the budget is only checked when set, e.g. API_IMPORT_BUDGET=0.5
+IMPORT_BUDGET = os.environ.get("API_IMPORT_BUDGET")
+LAZY_MODULES = {"openai", "httpx", "tiktoken", "numpy", "requests", "bs4", "selenium", "lxml"}
+
+
+def _import_times(module: str) -> dict:
+    """Cumulative import time in seconds per module, from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {FRAMEWORK}; import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_api_import_is_lazy():
+    """Test importing the API does not load LLM/scraper libraries"""
+    times = _import_times("src.api.main")
+    assert not LAZY_MODULES.intersection(times), "heavy modules imported at API startup"
+
+
+@pytest.mark.skipif(not IMPORT_BUDGET, reason="set API_IMPORT_BUDGET (seconds) to check the API import time")
+def test_api_import_within_budget():
+    """Test importing the API stays within the API_IMPORT_BUDGET time budget"""
+    times = _import_times("src.api.main")
+    assert times["src.api.main"] < float(IMPORT_BUDGET)
+
+
+def test_services_are_created_on_first_use():
+    """Test the service container builds services once, on first access"""
+    from src.api.services import ServiceContainer
+
+    container = ServiceContainer()
+    assert not container.is_created("scraper_manager")
+    scheduler = container.scrape_scheduler
+    assert container.is_created("scraper_manager")
+    assert scheduler.manager is container.scraper_manager and container.scrape_scheduler is scheduler
+    assert not container.is_created("llm_service")
@@ -0,0 +1,83 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.database.database import init_db, get_db_session
+from src.database import crud
+from src.database.models import AISazetek, SummaryQueueItem
+from src.llm.llm_service import LLMService
+from src.llm.summary_worker import SummaryWorker
+
+
+@pytest.fixture
+def natjecaj_id():
+    """Create a natjecaj and remove it together with its queue item and summary"""
+    init_db()
+    with get_db_session() as db:
+        natjecaj = crud.create_natjecaj(
+            db,
+            naziv="Test natječaj za red čekanja",
+            opis="Natječaj za istraživanje umjetne inteligencije. Rok za prijavu je 1. ožujka 2030.",
+            status="active"
+        )
+        created_id = natjecaj.id
+    yield created_id
+    with get_db_session() as db:
+        db.query(SummaryQueueItem).filter(SummaryQueueItem.natjecaj_id == created_id).delete()
+        db.query(AISazetek).filter(AISazetek.natjecaj_id == created_id).delete()
+        crud.delete_natjecaj(db, created_id)
+
+
+def test_lease_and_ack(natjecaj_id):
+    """Test that a leased job is not handed out twice and ack marks it done"""
+    with get_db_session() as db:
+        crud.enqueue_summaries(db, [natjecaj_id])
+        jobs = crud.lease_summary_jobs(db, worker_id="w1", limit=10)
+        assert [job.natjecaj_id for job in jobs] == [natjecaj_id]
+        assert crud.lease_summary_jobs(db, worker_id="w2", limit=10) == []
+
+        crud.ack_summary_job(db, jobs[0].id)
+        job = db.query(SummaryQueueItem).filter(SummaryQueueItem.natjecaj_id == natjecaj_id).one()
+        assert job.status == "done"
+
+
+def test_expired_lease_is_released(natjecaj_id):
+    """Test that a job whose lease expired can be leased by another worker"""
+    with get_db_session() as db:
+        crud.enqueue_summaries(db, [natjecaj_id])
+        crud.lease_summary_jobs(db, worker_id="w1", limit=10, lease_seconds=-1)
+        jobs = crud.lease_summary_jobs(db, worker_id="w2", limit=10)
+        assert [job.leased_by for job in jobs] == ["w2"]
+        assert jobs[0].attempts == 2
+
+
+def test_fail_retries_until_max_attempts(natjecaj_id):
+    """Test that failed jobs go back to pending until attempts run out"""
+    with get_db_session() as db:
+        crud.enqueue_summaries(db, [natjecaj_id])
+        job = crud.lease_summary_jobs(db, worker_id="w1")[0]
+        crud.fail_summary_job(db, job.id, "timeout", max_attempts=2)
+        assert job.status == "pending"
+
+        job = crud.lease_summary_jobs(db, worker_id="w1")[0]
+        crud.fail_summary_job(db, job.id, "timeout", max_attempts=2)
+        assert job.status == "failed"
+
+
+def test_worker_drains_queue(natjecaj_id):
+    """Test that the worker generates summaries for queued natjecaji"""
+    with get_db_session() as db:
+        crud.enqueue_summaries(db, [natjecaj_id])
+
+    service = LLMService()
+    service.enabled = False
+    worker = SummaryWorker(llm_service=service, concurrency=2, rate_limit_per_minute=0)
+    assert worker.drain() >= 1
+
+    with get_db_session() as db:
+        sazetek = crud.get_ai_sazetek_by_natjecaj(db, natjecaj_id)
+        assert sazetek is not None
+        assert sazetek.model_koristen == "extractive"
+        assert crud.get_summary_queue_statistics(db)["pending"] == 0
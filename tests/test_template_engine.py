@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend"))
+
+from template_engine import CompiledTemplate, TemplateEngine
+
+
+def test_fields_are_escaped_and_none_rendered_as_na():
+    """Test auto-escaping, missing values and raw fields"""
+    template = CompiledTemplate("card.html", '<a href="{{url}}">{{ naziv }}</a> 100% {{opis|raw}} {{rok}}')
+    html = template.render({"url": 'x" onclick="y', "naziv": "<b>AI</b>", "opis": "<i>ok</i>"})
+    assert html == '<a href="x&quot; onclick=&quot;y">&lt;b&gt;AI&lt;/b&gt;</a> 100% <i>ok</i> N/A'
+
+
+def test_engine_renders_repo_templates():
+    """Test that all frontend templates compile and render batches"""
+    templates_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "templates")
+    engine = TemplateEngine(templates_dir)
+    assert "search_result_card.html" in engine.names()
+
+    html = engine.render_many("search_result_card.html", [{"naziv": "Prvi"}, {"naziv": "Drugi"}])
+    assert html.count('class="tender-card"') == 2
+    assert "{{" not in html
+    assert engine.render("missing.html") == ""
+
+
+def test_auto_reload_picks_up_changes(tmp_path):
+    """Test that changed templates are recompiled when auto_reload is on"""
+    path = tmp_path / "t.html"
+    path.write_text("A {{x}}", encoding="utf-8")
+    engine = TemplateEngine(tmp_path, auto_reload=True, reload_interval=0)
+    assert engine.render("t.html", {"x": 1}) == "A 1"
+
+    path.write_text("B {{x}}", encoding="utf-8")
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert engine.render("t.html", {"x": 1}) == "B 1"
@@ -0,0 +1,103 @@
+from fastapi.testclient import TestClient
+from loguru import logger
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config.settings import settings
+from src.api.main import app
+from src.database.database import init_db
+from src.scrapers.pipeline import ScrapePipeline
+from src.utils.tracing import SPAN_DURATION, _json_sink, current_span, span
+from tests.test_scrape_pipeline import SavedPagesScraper
+
+
+@pytest.fixture
+def span_records(monkeypatch):
+    """Sample every trace and collect the span log records"""
+    monkeypatch.setattr(settings, "trace_sample_rate", 1.0)
+    records = []
+    handler_id = logger.add(
+        lambda message: records.append(message.record["extra"]),
+        filter=lambda record: "span" in record["extra"],
+        level="INFO"
+    )
+    yield records
+    logger.remove(handler_id)
+
+
+def test_pipeline_stage_spans_belong_to_the_source_span(span_records):
+    """Test that parse spans from the pipeline threads are children of the caller's span"""
+    with span("scrape.source", trace_id="run-test", source="HAMAG-BICRO") as source_span:
+        assert len(list(ScrapePipeline(SavedPagesScraper()))) == 6
+
+    parse_spans = [record for record in span_records if record["span"] == "scrape.parse"]
+    assert len(parse_spans) == 2
+    assert all(record["trace_id"] == "run-test" for record in parse_spans)
+    assert all(record["parent_id"] == source_span.span_id for record in parse_spans)
+    assert [record["natjecaji"] for record in parse_spans] == [3, 3]
+    source_record = next(record for record in span_records if record["span"] == "scrape.source")
+    assert source_record["parent_id"] is None and source_record["duration_ms"] > 0
+
+
+def test_request_spans_link_crud_calls_and_sql(span_records):
+    """Test request id -> crud call -> SQL span hierarchy for an API request"""
+    init_db()
+    client = TestClient(app)
+    response = client.get("/api/search", params={"q": "inovacije"}, headers={"X-Request-ID": "req-tracing-1"})
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-tracing-1"
+
+    spans = [record for record in span_records if record["trace_id"] == "req-tracing-1"]
+    request_span = next(record for record in spans if record["span"] == "http.request")
+    assert request_span["route"] == "/api/search" and request_span["status"] == 200
+
+    search_span = next(record for record in spans if record["span"] == "crud.search_natjecaji")
+    assert search_span["parent_id"] == request_span["span_id"]
+    queries = [record for record in spans if record["span"] == "db.query" and record["parent_id"] == search_span["span_id"]]
+    assert queries and queries[0]["statement"].lstrip().upper().startswith("SELECT")
+
+    generated = client.get("/health").headers["X-Request-ID"]
+    assert generated and generated != "req-tracing-1"
+
+
+def test_unsampled_spans_are_measured_but_not_logged(span_records, monkeypatch):
+    """Test that with sampling off fast spans only update the duration metric"""
+    monkeypatch.setattr(settings, "trace_sample_rate", 0.0)
+    before = SPAN_DURATION.count("test.unsampled")
+    with span("test.unsampled"):
+        with span("test.unsampled"):
+            pass
+    assert SPAN_DURATION.count("test.unsampled") - before == 2
+    assert not [record for record in span_records if record["span"] == "test.unsampled"]
+
+
+def test_disabled_tracing_creates_no_spans(monkeypatch):
+    """Test that with TRACING_ENABLED off span() neither opens a trace nor records a duration"""
+    monkeypatch.setattr(settings, "tracing_enabled", False)
+    before = SPAN_DURATION.count("test.disabled")
+    with span("test.disabled", source="HAMAG-BICRO") as disabled:
+        disabled.set(found=3)
+        assert current_span() is None
+    assert SPAN_DURATION.count("test.disabled") == before
+
+
+def test_json_log_records_include_the_traceback(capsys):
+    """Test that the JSON sink writes the formatted traceback of a logged exception"""
+    handler_id = logger.add(_json_sink, level="ERROR", format="{message}")
+    try:
+        try:
+            raise ValueError("neispravan odgovor")
+        except ValueError:
+            logger.exception("parse failed")
+    finally:
+        logger.remove(handler_id)
+
+    entry = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert entry["exception"] == "ValueError: neispravan odgovor"
+    assert entry["traceback"].startswith("Traceback (most recent call last)")
+    assert "test_json_log_records_include_the_traceback" in entry["traceback"]